@@ -0,0 +1,270 @@
+# benchmark.py
+"""
+End-to-end benchmark of the update tick on recorded fixtures (see replay.py).
+
+Each fixture is one scenario: record them at the moments you want to compare,
+e.g. day 1 vs day 7 of a week, pre-game vs mid-game, a 4-team vs a 10-team league:
+
+    python replay.py record ../fixtures/day7_midgame
+
+Every scenario runs in its own process, so the cold tick really is cold: fresh
+imports, no league, no caches and an empty projections dir. A second tick in the
+same process is the warm tick. For each tick the results record wall time, HTTP
+requests and their bytes as recorded on the wire (compressed), peak traced memory,
+and calls and total time of calculate_weekly_totals, matchup_comparison and
+add_live_projections_to_matchup. Each scenario is also tagged with its day of
+the week, number of matchups and game phase, read from the replayed data.
+
+    python benchmark.py                          # every fixture under FIXTURES_DIR
+    python benchmark.py ../fixtures/day1_pregame --repeat 3 --latency-ms 50
+    python benchmark.py --compare ../benchmarks/baseline.json
+
+Results go to BENCHMARK_RESULTS_DIR/results_<time>.json and latest.json.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import statistics
+import subprocess
+import threading
+
+# Timed in every tick: (module, attribute) as looked up by their callers
+TIMED_FUNCTIONS = (
+    ('weekly_totals', 'calculate_weekly_totals'),
+    ('weekly_totals', 'add_live_projections_to_matchup'),
+    ('live_projection', 'matchup_comparison'),
+    ('weekly_totals', 'publish_matchups'),
+)
+
+
+# --- Child: one scenario in this process ---
+
+def _install_timers():
+    """Wrap TIMED_FUNCTIONS; returns the shared {name: [calls, total seconds]} counters."""
+    import importlib
+    counters = {}
+    lock = threading.Lock()
+    for module_name, attr in TIMED_FUNCTIONS:
+        module = importlib.import_module(module_name)
+        func = getattr(module, attr)
+        counters.setdefault(attr, [0, 0.0])
+
+        def timed(*args, _func=func, _name=attr, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    counters[_name][0] += 1
+                    counters[_name][1] += elapsed
+
+        setattr(module, attr, timed)
+    return counters
+
+
+def _game_phase(snapshot):
+    statuses = {game.status for game in snapshot.games}
+    if not statuses:
+        return "no games"
+    if 2 in statuses:
+        return "mid-game"
+    if statuses == {1}:
+        return "pre-game"
+    if statuses == {3}:
+        return "final"
+    return "between games"
+
+
+def _measure_tick(store, counters):
+    import tracemalloc
+    from weekly_totals import run_weekly_update
+
+    for counter in counters.values():
+        counter[:] = [0, 0.0]
+    requests_before, bytes_before = store.requests, store.bytes
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    matchups = run_weekly_update()
+    seconds = time.perf_counter() - start
+    return matchups, {
+        'seconds': round(seconds, 4),
+        'http_requests': store.requests - requests_before,
+        'http_bytes': store.bytes - bytes_before,
+        'peak_memory_bytes': tracemalloc.get_traced_memory()[1],
+        'functions': {
+            name: {'calls': calls, 'total_seconds': round(total, 4)}
+            for name, (calls, total) in counters.items()
+        },
+    }
+
+
+def run_scenario(fixture_dir, latency=0.0):
+    """Cold + warm tick of one fixture in this process (must not have imported config yet)."""
+    import tracemalloc
+    import replay
+
+    meta = replay.load_meta(fixture_dir)
+    replay.prepare_environment(tempfile.mkdtemp(prefix="bench_"), os.path.join(fixture_dir, "inputs"),
+                               meta['now'], meta)
+    store = replay.install_replay(fixture_dir, latency)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    counters = _install_timers()
+    import_seconds = time.perf_counter() - start
+
+    # The tick's own output is not part of the result
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        matchups, cold = _measure_tick(store, counters)
+        _, warm = _measure_tick(store, counters)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    from nba_utils import get_current_scoring_period
+    from weekly_totals import get_week_from_scoring_period, get_scoring_periods_in_week
+    from scoreboard_snapshot import get_scoreboard_snapshot
+    period = get_current_scoring_period()
+    week_periods = get_scoring_periods_in_week(get_week_from_scoring_period(period))
+    tracemalloc.stop()
+    replay.uninstall()
+
+    return {
+        'fixture': os.path.basename(os.path.normpath(fixture_dir)),
+        'recorded_now': meta['now'],
+        'tags': {
+            'day_of_week': week_periods.index(period) + 1 if period in week_periods else None,
+            'matchups': len(matchups),
+            'phase': _game_phase(get_scoreboard_snapshot()),
+        },
+        'import_seconds': round(import_seconds, 4),
+        'cold': cold,
+        'warm': warm,
+    }
+
+
+# --- Parent: run every scenario and collect results ---
+
+def _run_in_subprocess(fixture_dir, latency):
+    fd, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--child", os.path.abspath(fixture_dir),
+                        "--latency-ms", str(latency * 1000), "--result-file", result_path],
+                       check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+
+
+def _summarize(runs):
+    """First run's result with wall time, peak memory and function times replaced by the median across repeats."""
+    result = dict(runs[0])
+    for tick in ('cold', 'warm'):
+        result[tick] = dict(runs[0][tick])
+        for key in ('seconds', 'peak_memory_bytes'):
+            result[tick][key] = statistics.median(run[tick][key] for run in runs)
+        result[tick]['functions'] = {
+            name: {
+                'calls': stats['calls'],
+                'total_seconds': statistics.median(run[tick]['functions'][name]['total_seconds'] for run in runs),
+            }
+            for name, stats in runs[0][tick]['functions'].items()
+        }
+    result['runs'] = len(runs)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def find_fixtures(fixtures_dir):
+    if not os.path.isdir(fixtures_dir):
+        return []
+    return sorted(os.path.join(fixtures_dir, name) for name in os.listdir(fixtures_dir)
+                  if os.path.exists(os.path.join(fixtures_dir, name, "meta.json")))
+
+
+def run_benchmarks(fixture_dirs, repeat=1, latency=0.0):
+    scenarios = []
+    for fixture_dir in fixture_dirs:
+        print(f"Benchmarking {fixture_dir}...")
+        scenarios.append(_summarize([_run_in_subprocess(fixture_dir, latency) for _ in range(repeat)]))
+    return {
+        'created_at': time.time(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'latency_ms': latency * 1000,
+        'scenarios': scenarios,
+    }
+
+
+def save_results(results, results_dir):
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(results['created_at']))
+    for name in (f"results_{stamp}.json", "latest.json"):
+        with open(os.path.join(results_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return os.path.join(results_dir, f"results_{stamp}.json")
+
+
+def print_results(results, baseline=None):
+    before = {s['fixture']: s for s in baseline['scenarios']} if baseline else {}
+    for scenario in results['scenarios']:
+        tags = scenario['tags']
+        print(f"\n{scenario['fixture']} (day {tags['day_of_week']}, {tags['matchups']} matchups, {tags['phase']})")
+        for tick in ('cold', 'warm'):
+            numbers = scenario[tick]
+            line = (f"  {tick:>4}: {numbers['seconds']:.3f}s, {numbers['http_requests']} requests, "
+                    f"{numbers['http_bytes'] / 1024:.0f} KiB, peak {numbers['peak_memory_bytes'] / 2**20:.1f} MiB")
+            old = before.get(scenario['fixture'])
+            if old:
+                line += f" ({(numbers['seconds'] / old[tick]['seconds'] - 1) * 100:+.1f}% vs baseline)"
+            print(line)
+            for name, stats in numbers['functions'].items():
+                print(f"        {name}: {stats['calls']} calls, {stats['total_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the update tick on recorded fixtures.")
+    parser.add_argument("fixtures", nargs="*", help="fixture dirs (default: every fixture under FIXTURES_DIR)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario; the median is reported")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay per replayed request")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(args.child, args.latency_ms / 1000)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        sys.exit(0)
+
+    # Safe here: this process never runs a tick itself
+    from config import FIXTURES_DIR, BENCHMARK_RESULTS_DIR
+    fixture_dirs = args.fixtures or find_fixtures(FIXTURES_DIR)
+    if not fixture_dirs:
+        sys.exit(f"No fixtures found in {FIXTURES_DIR}; record one with: python replay.py record <dir>")
+
+    results = run_benchmarks(fixture_dirs, args.repeat, args.latency_ms / 1000)
+    path = save_results(results, BENCHMARK_RESULTS_DIR)
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nResults written to {path}")
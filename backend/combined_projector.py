@@ -1,35 +1,50 @@
 import os
-import sys
-import math
-import subprocess
 import unicodedata
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from config import FANTASY_PROJECTIONS_CSV, NBA_PER_GAME_CSV, WEIGHTED_PER36_CSV, PROJECTION_WEIGHT, SPS_WEIGHT
+from config import FANTASY_PROJECTIONS_CSV, WEIGHTED_PER36_CSV, PROJECTION_WEIGHT, SPS_WEIGHT
+from projection_refresh import publish_csv
 
 # ---- CONFIG ----
 PROJECTIONS_CSV = str(FANTASY_PROJECTIONS_CSV)
-SPS_EXPECTED    = str(NBA_PER_GAME_CSV)
 OUTPUT_CSV      = str(WEIGHTED_PER36_CSV)
 
 W_PROJ = PROJECTION_WEIGHT
 W_SPS  = SPS_WEIGHT
 # ---------------
 
+@lru_cache(maxsize=None)
 def normalize_ascii_capitalized(s: str) -> str:
     """Convert to ASCII and use proper capitalization (e.g. 'Luka Doncic')."""
-    if pd.isna(s):
-        return None
     # Normalize to remove accents
     clean = unicodedata.normalize("NFKD", str(s)).encode("ascii", "ignore").decode("ascii")
     # Lowercase everything, then title case it
     clean = clean.strip().title()
     return clean
 
-def trunc1(x: float) -> float:
-    """Truncate (not round) to 1 decimal place."""
-    if pd.isna(x):
-        return 0.0
-    return math.trunc(x * 10) / 10.0
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Normalize a name column, converting each distinct name once (missing names stay missing)."""
+    unique = names.dropna().unique()
+    return names.map(dict(zip(unique, map(normalize_ascii_capitalized, unique))))
+
+def trunc1(x):
+    """Truncate (not round) to 1 decimal place; works on whole columns. Missing values become 0."""
+    return np.trunc(np.nan_to_num(np.asarray(x, dtype=float)) * 10) / 10.0
+
+def blend_projections(proj_fpts36, sps_fpts36, w_proj=W_PROJ, w_sps=W_SPS):
+    """
+    Per-36 projection for every player at once. If one source is 0, use the
+    other entirely; otherwise take the weighted average. Truncated to 1 decimal.
+    """
+    proj_fpts36 = np.asarray(proj_fpts36, dtype=float)
+    sps_fpts36 = np.asarray(sps_fpts36, dtype=float)
+    blended = np.select(
+        [(proj_fpts36 == 0) & (sps_fpts36 > 0), (sps_fpts36 == 0) & (proj_fpts36 > 0)],
+        [sps_fpts36, proj_fpts36],
+        default=w_proj * proj_fpts36 + w_sps * sps_fpts36
+    )
+    return trunc1(blended)
 
 def find_name_col(df: pd.DataFrame) -> str:
     for c in ["PLAYER_NAME", "Player", "player_name", "Name"]:
@@ -37,24 +52,9 @@ def find_name_col(df: pd.DataFrame) -> str:
             return c
     return df.columns[0]
 
-def find_sps_csv() -> str | None:
-    if os.path.exists(SPS_EXPECTED):
-        return SPS_EXPECTED
-    return None
-
-def main():
-    print("Running sps_2.py...")
-    subprocess.run([sys.executable, "sps_2.py"], check=True)
-
-    sps_csv = find_sps_csv()
-    if not sps_csv:
-        raise SystemExit(f"Could not find sps_2 output.")
-    if not os.path.exists(PROJECTIONS_CSV):
-        raise SystemExit(f"Missing projections CSV: {PROJECTIONS_CSV}")
-
-    proj = pd.read_csv(PROJECTIONS_CSV)
-    sps  = pd.read_csv(sps_csv)
-
+def build_projections(proj: pd.DataFrame, sps: pd.DataFrame,
+                      w_proj: float = W_PROJ, w_sps: float = W_SPS) -> pd.DataFrame:
+    """Blend the preseason projections with season per-36 stats into the published table."""
     proj_name_col = find_name_col(proj)
     sps_name_col  = find_name_col(sps)
 
@@ -62,8 +62,8 @@ def main():
     sps_fpts_col  = sps.columns[-1]
 
     # Normalize ASCII and proper capitalization
-    proj["NAME_CLEAN"] = proj[proj_name_col].map(normalize_ascii_capitalized)
-    sps["NAME_CLEAN"]  = sps[sps_name_col].map(normalize_ascii_capitalized)
+    proj = proj.assign(NAME_CLEAN=normalize_names(proj[proj_name_col]))
+    sps  = sps.assign(NAME_CLEAN=normalize_names(sps[sps_name_col]))
 
     proj_small = proj[["NAME_CLEAN", proj_fpts_col]].rename(columns={proj_fpts_col: "PROJ_FPTS36"})
     sps_small  = sps[["NAME_CLEAN", sps_fpts_col, "MIN"]].rename(columns={sps_fpts_col: "SPS_FPTS36"})
@@ -75,29 +75,35 @@ def main():
     merged["SPS_FPTS36"]  = pd.to_numeric(merged["SPS_FPTS36"], errors="coerce").fillna(0)
     merged["MIN"] = pd.to_numeric(merged["MIN"], errors="coerce").fillna(0)
 
-    # Handle case where one projection is 0 - use the other entirely
-    def calculate_projection(row):
-        proj_val = row["PROJ_FPTS36"]
-        sps_val = row["SPS_FPTS36"]
-        
-        # If one is 0, use the other entirely
-        if proj_val == 0 and sps_val > 0:
-            return trunc1(sps_val)
-        elif sps_val == 0 and proj_val > 0:
-            return trunc1(proj_val)
-        # Otherwise use weighted average
-        else:
-            return trunc1(W_PROJ * proj_val + W_SPS * sps_val)
-    
-    merged["Per36_Projection"] = merged.apply(calculate_projection, axis=1)
-    
+    # Whole-column blend; a player with a 0 in one source uses the other entirely
+    merged["Per36_Projection"] = blend_projections(merged["PROJ_FPTS36"], merged["SPS_FPTS36"], w_proj, w_sps)
+
     # Calculate per-game projection: points_per_36 * minutes / 36
-    merged["PerGame_Projection"] = (merged["Per36_Projection"] * merged["MIN"] / 36).apply(trunc1)
+    merged["PerGame_Projection"] = trunc1(merged["Per36_Projection"] * merged["MIN"] / 36)
 
     # Output clean name, projection, and minutes
-    out = merged[["NAME_CLEAN", "Per36_Projection", "PerGame_Projection", "MIN"]].rename(columns={"NAME_CLEAN": "Player", "MIN": "Minutes_Per_Game"})
-    out.to_csv(OUTPUT_CSV, index=False)
+    return merged[["NAME_CLEAN", "Per36_Projection", "PerGame_Projection", "MIN"]].rename(columns={"NAME_CLEAN": "Player", "MIN": "Minutes_Per_Game"})
+
+def main(sps: pd.DataFrame | None = None):
+    """
+    Rebuild and publish OUTPUT_CSV. sps is the per-game stats table from sps_2;
+    if omitted, sps_2 is run first.
+    """
+    if sps is None:
+        import sps_2
+        print("Running sps_2...")
+        sps = sps_2.main()
+
+    if not os.path.exists(PROJECTIONS_CSV):
+        raise SystemExit(f"Missing projections CSV: {PROJECTIONS_CSV}")
+
+    proj = pd.read_csv(PROJECTIONS_CSV)
+    out = build_projections(proj, sps)
+
+    # Readers (the live tick) only ever see a complete file
+    publish_csv(out, OUTPUT_CSV)
     print(f"✅ Wrote {len(out)} rows to {OUTPUT_CSV}")
+    return out
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,8 @@ from pathlib import Path
 # Base directories
 BASE_DIR = Path(__file__).resolve().parent.parent
 BACKEND_DIR = BASE_DIR / "backend"
-PROJECTIONS_DIR = BASE_DIR / "projections"
+# FANTASY_PROJECTIONS_DIR points all generated data at another directory (used by replay.py)
+PROJECTIONS_DIR = Path(os.environ.get("FANTASY_PROJECTIONS_DIR", BASE_DIR / "projections"))
 
 # ESPN API custom path (if needed)
 ESPN_API_PATH = "/Users/christian/Desktop/PyCharmProjects/espn-api"
@@ -22,12 +23,82 @@ SPS_1_CSV = PROJECTIONS_DIR / "sps_1.csv"
 LIVE_PROJECTIONS_CSV = PROJECTIONS_DIR / "live_projections.csv"
 
 # JSON Files
-WEEKLY_MATCHUPS_JSON = PROJECTIONS_DIR / "weekly_matchups.json"
+WEEKLY_MATCHUPS_JSON = PROJECTIONS_DIR / "weekly_matchups.json"  # Full state, read back by incremental updates
+
+# Published matchups read by index.php: a small summary plus one shard per matchup per day
+MATCHUPS_DIR = PROJECTIONS_DIR / "matchups"
+MATCHUPS_SUMMARY_JSON = MATCHUPS_DIR / "summary.json"
+MATCHUPS_MANIFEST_JSON = MATCHUPS_DIR / "manifest.json"  # Per-file content hashes (ETags) + change stats
+
+# On-disk cache for finalized scoring periods (rosters, game lists, projections)
+PERIOD_CACHE_DIR = PROJECTIONS_DIR / "cache"
+
+# Season schedule index (date -> teams playing, team -> game dates)
+SCHEDULE_INDEX_JSON = PROJECTIONS_DIR / "schedule_index.json"
+SCHEDULE_MAX_AGE_HOURS = 24          # Full refresh at most once a day
+SCHEDULE_STATUS_REFRESH_MINUTES = 60 # Re-check while past games aren't final yet
+
+# Projection refresh stage: what the last refresh used, and how often the updater checks
+PROJECTION_STATE_JSON = PROJECTIONS_DIR / "projection_state.json"
+PROJECTION_CHECK_MINUTES = 15
+PROJECTION_MAX_AGE_HOURS = 24        # Fallback when game statuses can't be read
 
 # Text Files
 FILE1_TXT = PROJECTIONS_DIR / "file1.txt"
 FILE2_TXT = PROJECTIONS_DIR / "file2.txt"
 
+# ESPN HTTP client
+ESPN_READS_URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/fba/seasons/{year}/segments/0/leagues/{league_id}"
+ESPN_POOL_CONNECTIONS = 4   # Number of distinct hosts to keep pools for
+ESPN_POOL_MAXSIZE = 16      # Keep-alive connections kept open per host
+ESPN_MAX_RETRIES = 2        # Retries on connection errors (not on HTTP errors)
+# (connect, read) timeouts in seconds per endpoint
+ESPN_TIMEOUTS = {
+    'roster': (3.05, 10),
+    'default': (3.05, 15),
+}
+
+# Live scoreboard: reuse one snapshot for this many seconds (covers a whole update run)
+SCOREBOARD_TTL_SECONDS = 60
+
+# Worker threads for one update tick (roster/schedule/scoreboard fetches and matchups).
+# 1 runs everything sequentially; keep at or below ESPN_POOL_MAXSIZE.
+MAX_WORKERS = 4
+
+# Win probability simulation (player spreads fitted from game logs in the projection refresh stage)
+PLAYER_VARIANCE_CSV = PROJECTIONS_DIR / "player_variance.csv"
+WIN_PROB_SIMULATIONS = 100_000
+VARIANCE_MIN_GAMES = 5      # Fewer games than this -> DEFAULT_PLAYER_CV
+DEFAULT_PLAYER_CV = 0.35    # Typical std / mean of a player's fantasy points per game
+# Chance a player sits out a game that hasn't started, by injury status (None = healthy)
+MISSED_GAME_PROBABILITY = {None: 0.08, 'DAY-TO-DAY': 0.4}
+# Error of a player's projection for the rest of the week, shared by all of their games (std / mean)
+PROJECTION_ERROR_CV = 0.25
+
+# Per-week win probability history (one line per tick) and chart files
+WIN_HISTORY_DIR = PROJECTIONS_DIR / "history"
+
+# Reuse unchanged periods from the last weekly_matchups.json instead of recomputing the whole week
+INCREMENTAL_UPDATES = True
+
+# Server-Sent Events push server, started by updater.py in in-process mode
+PUSH_ENABLED = True
+PUSH_HOST = "0.0.0.0"
+PUSH_PORT = 8765
+PUSH_HEARTBEAT_SECONDS = 15   # Comment line to idle clients so proxies keep the connection open
+PUSH_QUEUE_SIZE = 64          # Events buffered per client before a stalled client is dropped
+
+# Per-player DEBUG logging in the tick (slow: several lines per player per period)
+VERBOSE_LOGGING = False
+
+# Per-tick timing traces (see tracing.py); only the newest TRACE_KEEP files are kept
+TRACE_DIR = PROJECTIONS_DIR / "traces"
+TRACE_KEEP = 200
+
+# Recorded ticks for replay.py / benchmark.py, and where benchmark results go
+FIXTURES_DIR = BASE_DIR / "fixtures"
+BENCHMARK_RESULTS_DIR = BASE_DIR / "benchmarks"
+
 # Projection weights
 PROJECTION_WEIGHT = 7/8
 SPS_WEIGHT = 1/8
@@ -0,0 +1,218 @@
+# day_view.py
+"""
+Server-side port of index.php's generatePlayerTablesHTML.
+
+The publisher renders each (matchup, day) player table once per tick and writes
+it next to the day shard, so switching days on the page is a static file fetch.
+Formatting follows PHP: number_format() rounding and thousands separators, float
+echo with 14 significant digits and htmlspecialchars() escaping.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+STANDARD_POSITIONS = ["PG", "SG", "SF", "PF", "C", "G", "F"]
+EMPTY_SLOT = "Empty Slot"
+
+
+def php_number_format(value, decimals=1):
+    """PHP number_format($value, $decimals): half away from zero, ',' thousands separator."""
+    rounded = Decimal(repr(float(value))).quantize(Decimal(1).scaleb(-decimals), rounding=ROUND_HALF_UP)
+    if rounded == 0:
+        rounded = abs(rounded)
+    return f"{rounded:,.{decimals}f}"
+
+
+def php_echo(value):
+    """How PHP prints a number or string in string context (precision=14)."""
+    if isinstance(value, bool):
+        return "1" if value else ""
+    if isinstance(value, float):
+        text = format(value, '.14G')
+        if 'E' in text:
+            # PHP keeps a ".0" on the mantissa and doesn't zero-pad the exponent: 1.0E+15, 1.0E-5
+            mantissa, exponent = text.split('E')
+            if '.' not in mantissa:
+                mantissa += '.0'
+            text = f"{mantissa}E{exponent[0]}{int(exponent[1:])}"
+        return text
+    return str(value)
+
+
+def htmlspecialchars(text):
+    return (str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;').replace("'", '&#039;'))
+
+
+def abbreviate_name(name):
+    """Abbreviate the first name to an initial when the name is longer than 18 bytes."""
+    if len(name.encode('utf-8')) <= 18:
+        return name
+    parts = name.split(' ')
+    if len(parts) >= 2:
+        parts[0] = parts[0][:1] + '.'
+        return ' '.join(parts)
+    return name
+
+
+def injury_tag(injury_status):
+    if not injury_status:
+        return ''
+
+    status_upper = injury_status.upper()
+    css_class = 'injury-tag'
+    if status_upper in ('OUT', 'O'):
+        css_class += ' out'
+        display = 'O'
+    elif status_upper in ('DAY-TO-DAY', 'DTD', 'DAY'):
+        css_class += ' dtd'
+        display = 'DTD'
+    elif status_upper in ('QUESTIONABLE', 'Q'):
+        css_class += ' questionable'
+        display = 'Q'
+    elif status_upper in ('PROBABLE', 'P'):
+        css_class += ' probable'
+        display = 'P'
+    elif status_upper in ('DOUBTFUL', 'D'):
+        css_class += ' questionable'
+        display = 'D'
+    else:
+        display = status_upper[:3]
+    return f'<span class="{css_class}">{display}</span>'
+
+
+def _player_cells(day, player_name):
+    """(points, projection display, injury tag, points added, projection added) for a starter slot."""
+    if player_name == EMPTY_SLOT:
+        return "", "", "", 0, 0
+    for player in day.get('players', []):
+        if player['name'] != player_name:
+            continue
+        points = player['points']
+        tag = injury_tag(player.get('injury_status'))
+        if player['points'] > 0:  # Game has started or finished
+            proj_display = php_number_format(player['live_projection'])
+            proj_display += f' <span class="static-proj">({php_number_format(player["static_projection"])})</span>'
+            return php_echo(points), proj_display, tag, points, player['live_projection']
+        if player['static_projection'] > 0:  # Scheduled but not played yet
+            return "-", php_number_format(player['static_projection']), tag, points, player['static_projection']
+        return "0", "0.0", tag, points, 0  # Not playing today
+    return "", "", "", 0, 0
+
+
+def _bench_entries(roster, key):
+    for player_data in roster.get(key, []) if roster else []:
+        if isinstance(player_data, dict):
+            yield player_data['name'], player_data.get('injury_status')
+        else:
+            yield player_data, None
+
+
+def _name_cell(name, tag):
+    return f'<td class="player-name"><span class="player-text">{htmlspecialchars(abbreviate_name(name))}</span>{tag}</td>'
+
+
+def _team_rows(day, mirrored):
+    """Table body rows for one team; mirrored=True is team1's right-hand (reversed) layout."""
+    html = ''
+    day_total = 0
+    day_proj = 0
+
+    if day is None:
+        html += '<tr><td colspan="4" class="text-center">No data for this day</td></tr>'
+        return html, day_total, day_proj
+
+    roster = day.get('roster')
+    slots = [(pos, roster.get(pos, EMPTY_SLOT) if roster else EMPTY_SLOT) for pos in STANDARD_POSITIONS]
+    utl = roster.get('UTL') if roster else None
+    slots += [('UTL', name) for name in (utl if utl is not None else [EMPTY_SLOT] * 3)]
+
+    for pos, player_name in slots:
+        points, proj_display, tag, points_added, proj_added = _player_cells(day, player_name)
+        day_total += points_added
+        day_proj += proj_added
+        cells = [
+            f'<td><span class="position-badge">{pos}</span></td>',
+            _name_cell(player_name, tag),
+            f'<td>{proj_display}</td>',
+            f'<td class="points-col">{points}</td>',
+        ]
+        html += '<tr>' + ''.join(reversed(cells) if mirrored else cells) + '</tr>'
+
+    for key, row_class, badge_class, label in (('BENCH', 'bench-row', 'bench-badge', 'BN'),
+                                               ('IR', 'ir-row', 'ir-badge', 'IR')):
+        for player_name, injury_status in _bench_entries(roster, key):
+            cells = [
+                f'<td><span class="position-badge {badge_class}">{label}</span></td>',
+                _name_cell(player_name, injury_tag(injury_status)),
+                '<td></td>',
+                '<td></td>',
+            ]
+            if mirrored:
+                cells = [cells[3], cells[2], cells[1], cells[0]]
+            html += f'<tr class="{row_class}">' + ''.join(cells) + '</tr>'
+
+    return html, day_total, day_proj
+
+
+def render_player_tables(team1_name, team1_day, team2_name, team2_day):
+    """HTML for both teams' tables on one day (same markup as generatePlayerTablesHTML)."""
+    html = f'''<div class="row team-names-row">
+        <div class="col-md-6 text-center mb-3">
+            <h4>{htmlspecialchars(team2_name)}</h4>
+        </div>
+        <div class="col-md-6 text-center mb-3">
+            <h4>{htmlspecialchars(team1_name)}</h4>
+        </div>
+    </div>'''
+
+    html += '<div class="row player-details p-3">'
+
+    # Away Team (team2) on Left
+    html += '''<div class="col-md-6">
+        <table class="table table-sm centered-layout">
+            <thead>
+                <tr>
+                    <th style="width: 15%">POS</th>
+                    <th style="width: 35%">Player</th>
+                    <th style="width: 25%">Projection</th>
+                    <th style="width: 25%">Points</th>
+                </tr>
+            </thead>
+            <tbody>'''
+    rows, day_total, day_proj = _team_rows(team2_day, mirrored=False)
+    html += rows
+    html += f'''<tr class="table-secondary day-total-row">
+                <td><strong>Day Total</strong></td>
+                <td></td>
+                <td><strong>{php_number_format(day_proj)}</strong></td>
+                <td><strong>{php_echo(day_total)}</strong></td>
+            </tr>
+            </tbody>
+        </table>
+        </div>'''
+
+    # Home Team (team1) on Right, columns reversed
+    html += '''<div class="col-md-6">
+        <table class="table table-sm centered-layout">
+            <thead>
+                <tr>
+                    <th style="width: 25%">Points</th>
+                    <th style="width: 25%">Projection</th>
+                    <th style="width: 35%;">Player</th>
+                    <th style="width: 15%">POS</th>
+                </tr>
+            </thead>
+            <tbody>'''
+    rows, day_total, day_proj = _team_rows(team1_day, mirrored=True)
+    html += rows
+    html += f'''<tr class="table-secondary day-total-row">
+                <td><strong>{php_echo(day_total)}</strong></td>
+                <td><strong>{php_number_format(day_proj)}</strong></td>
+                <td></td>
+                <td><strong>Day Total</strong></td>
+            </tr>
+            </tbody>
+        </table>
+        </div>'''
+
+    html += '</div>'  # End of player-details row
+    return html
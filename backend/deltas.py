@@ -0,0 +1,104 @@
+# deltas.py
+"""
+Per-week delta log of what each tick changed.
+
+The publisher diffs the new matchups document against the previous tick's and
+appends one line to MATCHUPS_DIR/week_<w>/deltas.jsonl:
+
+    {"seq": 12, "t": 1700000000.0, "ops": [{"op": "set", "path": [...], "value": ...}, ...]}
+
+Paths are keys into the full matchups document (list indices as ints), e.g.
+["matchup_0", "team1", "days", "53", "players", 4, "points"]. "del" ops carry no
+value. When there is no previous document for the week to diff against, the
+entry is {"seq": n, "t": ..., "reset": true} and clients reload in full.
+
+summary.json carries the seq it was published at, so a client holding version N
+fetches the entries with seq > N (index.php?deltas=1&since=N) and applies them in order.
+"""
+import os
+import json
+import time
+from config import MATCHUPS_DIR
+
+# Per-tick bookkeeping kept in weekly_matchups.json, not part of what clients see
+INTERNAL_KEYS = ('periods',)
+
+
+def public_view(matchups):
+    return {
+        matchup_id: {key: value for key, value in matchup.items() if key not in INTERNAL_KEYS}
+        for matchup_id, matchup in matchups.items()
+    }
+
+
+def structural_diff(old, new, path=()):
+    """
+    Ops that turn old into new. Dicts are compared key by key and equal-length
+    lists element by element; anything else that differs is replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key in old:
+                ops.extend(structural_diff(old[key], value, path + (key,)))
+            else:
+                ops.append({'op': 'set', 'path': list(path + (key,)), 'value': value})
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'del', 'path': list(path + (key,))})
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            ops.extend(structural_diff(old_item, new_item, path + (i,)))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{'op': 'set', 'path': list(path), 'value': new}]
+
+
+def apply_ops(document, ops):
+    """Apply a delta entry's ops to a document in place (the client-side half, in Python)."""
+    for op in ops:
+        target = document
+        for key in op['path'][:-1]:
+            target = target[key]
+        if op['op'] == 'set':
+            target[op['path'][-1]] = op['value']
+        else:
+            del target[op['path'][-1]]
+    return document
+
+
+def delta_log_path(week):
+    return os.path.join(MATCHUPS_DIR, f"week_{week}", "deltas.jsonl")
+
+
+def append_delta(week, seq, ops=None, reset=False, timestamp=None):
+    """Append one entry to the week's delta log as a single line write."""
+    entry = {'seq': seq, 't': timestamp or time.time()}
+    if reset:
+        entry['reset'] = True
+    else:
+        entry['ops'] = ops
+    path = delta_log_path(week)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+
+def load_deltas(week, since=0):
+    """Entries with seq > since, oldest first (stops at a torn last line)."""
+    entries = []
+    try:
+        with open(delta_log_path(week), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if entry['seq'] > since:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
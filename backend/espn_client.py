@@ -0,0 +1,79 @@
+# espn_client.py
+"""
+Shared HTTP client for ESPN fantasy API reads.
+
+All reads go through one pooled requests.Session so repeated lm-api-reads
+calls reuse keep-alive connections instead of doing a new TLS handshake
+per request. Cookies are attached once when the session is created.
+"""
+import os
+import threading
+from config import (ESPN_READS_URL, ESPN_POOL_CONNECTIONS, ESPN_POOL_MAXSIZE,
+                    ESPN_MAX_RETRIES, ESPN_TIMEOUTS)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    # Imported here so importing this module stays cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=ESPN_POOL_CONNECTIONS,
+        pool_maxsize=ESPN_POOL_MAXSIZE,
+        max_retries=ESPN_MAX_RETRIES
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    session.cookies.set('swid', os.getenv('ESPN_SWID'))
+    session.cookies.set('espn_s2', os.getenv('ESPN_S2'))
+    return session
+
+
+def get_session():
+    """Return the process-wide ESPN session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session():
+    """Close pooled connections (the next call to get_session() reconnects)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_league_url():
+    return ESPN_READS_URL.format(
+        year=os.getenv('ESPN_YEAR'),
+        league_id=os.getenv('ESPN_LEAGUE_ID')
+    )
+
+
+def get_timeout(endpoint):
+    return ESPN_TIMEOUTS.get(endpoint, ESPN_TIMEOUTS['default'])
+
+
+def get_league_view(params, endpoint='default'):
+    """
+    GET the league endpoint with the given query params.
+    Returns the parsed JSON on HTTP 200, otherwise None.
+    """
+    response = get_session().get(get_league_url(), params=params, timeout=get_timeout(endpoint))
+    if response.status_code == 200:
+        return response.json()
+    return None
@@ -1,156 +1,292 @@
 import sys
 import os
+import logging
 from dotenv import load_dotenv
-from config import ESPN_API_PATH, WEIGHTED_PER36_CSV, SEASON_START_DATE
+from config import ESPN_API_PATH
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 sys.path.insert(0, ESPN_API_PATH)
-from espn_api.basketball import League
-import requests
-from tabulate import tabulate
-import pandas as pd
-import subprocess
-import datetime
-from nba_api.stats.endpoints import scoreboardv2
-import unicodedata
-
-# Initialize the league
-league = League(
-    league_id=int(os.getenv('ESPN_LEAGUE_ID')),
-    year=int(os.getenv('ESPN_YEAR')),
-    swid=os.getenv('ESPN_SWID'),
-    espn_s2=os.getenv('ESPN_S2')
-)
-
-subprocess.run([sys.executable, "combined_projector.py"], check=True)
-
-def get_roster_for_scoring_period(team_id, scoring_period):
-    league_id = os.getenv('ESPN_LEAGUE_ID')
-    year = os.getenv('ESPN_YEAR')
-    url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/fba/seasons/{year}/segments/0/leagues/{league_id}"
-
-    cookies = {
-        'swid': os.getenv('ESPN_SWID'),
-        'espn_s2': os.getenv('ESPN_S2')
-    }
-
+from espn_client import get_league_view
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import period_cache
+from tracing import span, count
+from nba_utils import ESPN_TEAM_MAPPING, get_scoring_period_date, now_est
+from schedule_index import get_schedule_index
+from player_index import PlayerIndex
+from projection_store import get_projection_store, standardize_name
+from projection_refresh import refresh_projections_if_stale
+from matchup_rows import PlayerSlot, MatchupRow, MatchupTable, EMPTY_SLOT
+
+logger = logging.getLogger(__name__)
+
+# Importing this module does no network or subprocess work. The league is
+# built on first use and projections are refreshed only when asked for.
+_league = None
+
+
+def get_league(refresh=False):
+    """
+    Return the ESPN League, connecting on first use.
+    refresh=True re-reads league data (teams, rosters, injuries) on the existing object.
+    """
+    global _league, _box_scores
+    if _league is not None and refresh:
+        _league.refresh()
+        _box_scores = None
+    elif _league is None:
+        from espn_api.basketball import League
+        _league = League(
+            league_id=int(os.getenv('ESPN_LEAGUE_ID')),
+            year=int(os.getenv('ESPN_YEAR')),
+            swid=os.getenv('ESPN_SWID'),
+            espn_s2=os.getenv('ESPN_S2')
+        )
+    return _league
+
+
+# This week's box scores, fetched once per tick (get_league(refresh=True) drops them)
+_box_scores = None
+_box_scores_lock = threading.Lock()
+
+
+def get_box_scores():
+    """The current week's box scores, one per matchup in league order."""
+    global _box_scores
+    with _box_scores_lock:
+        if _box_scores is None:
+            _box_scores = get_league().box_scores()
+        return _box_scores
+
+
+def refresh_projections(force=False):
+    """
+    Rebuild weighted_per36_projection.csv if it is stale (see projection_refresh).
+    Returns True if a refresh ran.
+    """
+    return refresh_projections_if_stale(force=force)
+
+
+# Rosters for every team keyed by (team_id, scoring_period). Each period is
+# filled by one league-wide mRoster request and then shared by every consumer.
+_roster_cache = {}
+_loaded_periods = set()
+# Player -> NBA team index over everything in the roster cache (built on demand)
+_player_index = None
+# Guards the three above; matchups may be computed from several threads at once
+_roster_lock = threading.Lock()
+
+
+def _parse_roster_entries(entries, scoring_period):
+    result = []
+    for entry in entries:
+        player_data = entry.get('playerPoolEntry', {}).get('player', {})
+        player_name = player_data.get('fullName', 'Unknown Player')
+
+        # Get the player's pro team
+        pro_team_id = player_data.get('proTeamId', 0)
+
+        # Find stats for this specific scoring period
+        points = 0
+        player_stats = player_data.get('stats', [])
+        for stat in player_stats:
+            # Look for stats with statSplitTypeId = 5 (specific game stats)
+            if stat.get('statSplitTypeId') == 5 and stat.get('scoringPeriodId') == scoring_period:
+                points = stat.get('appliedTotal', 0)
+                break
+
+        # Get the lineup position
+        lineup_slot = entry.get('lineupSlotId', 0)
+
+        result.append({
+            'playerId': player_data.get('id'),
+            'name': player_name,
+            'points': points,
+            'lineupSlotId': lineup_slot,
+            'proTeamId': pro_team_id
+        })
+
+    # Sort by lineup position
+    result.sort(key=lambda x: x['lineupSlotId'])
+    return result
+
+
+def fetch_league_rosters(scoring_period):
+    """
+    Fetch every team's roster for a scoring period in a single request.
+    Returns a dict mapping team_id -> roster list (empty dict on failure).
+    """
+    import requests
     params = {
-        'forTeamId': team_id,
         'scoringPeriodId': scoring_period,
         'view': 'mRoster'
     }
 
-    response = requests.get(url, cookies=cookies, params=params)
-    if response.status_code == 200:
-        data = response.json()
-
-        # Find the team's roster
-        for team in data.get('teams', []):
-            if team['id'] == team_id:
-                roster = team.get('roster', {})
-                entries = roster.get('entries', [])
-
-                result = []
-                for entry in entries:
-                    player_data = entry.get('playerPoolEntry', {}).get('player', {})
-                    player_name = player_data.get('fullName', 'Unknown Player')
-                    
-                    # Get the player's pro team
-                    pro_team_id = player_data.get('proTeamId', 0)
-                    # Map pro team ID to team name/tricode
-                    # We'll get this from defaultPositionId and proTeamId
-                    # ESPN uses proTeamId, but we need the team name
-                    # The API might provide it in another field
-
-                    # Find stats for this specific scoring period
-                    points = 0
-                    player_stats = player_data.get('stats', [])
-                    for stat in player_stats:
-                        # Look for stats with statSplitTypeId = 5 (specific game stats)
-                        if stat.get('statSplitTypeId') == 5 and stat.get('scoringPeriodId') == scoring_period:
-                            points = stat.get('appliedTotal', 0)
-                            break
-
-                    # Get the lineup position
-                    lineup_slot = entry.get('lineupSlotId', 0)
-
-                    result.append({
-                        'name': player_name,
-                        'points': points,
-                        'lineupSlotId': lineup_slot,
-                        'proTeamId': pro_team_id
-                    })
-
-                # Sort by lineup position
-                result.sort(key=lambda x: x['lineupSlotId'])
-                return result
-
-    return []
-
-def get_scoring_period_date(scoring_period):
+    try:
+        data = get_league_view(params, endpoint='roster')
+    except requests.RequestException as e:
+        # A timeout or dropped connection costs this period only; the next call retries it
+        logger.warning("Could not fetch rosters for scoring period %s: %s", scoring_period, e)
+        return {}
+    if data is None:
+        return {}
+
+    rosters = {}
+    for team in data.get('teams', []):
+        entries = team.get('roster', {}).get('entries', [])
+        rosters[team['id']] = _parse_roster_entries(entries, scoring_period)
+    return rosters
+
+
+def _load_period_rosters(league_id, period):
+    """Rosters for one period from the finalized-period cache or ESPN. None on failure."""
+    finalized = is_period_finalized(period)
+    rosters = period_cache.load_league_rosters(league_id, period) if finalized else None
+    if rosters is None:
+        rosters = fetch_league_rosters(period)
+        if not rosters:
+            return None
+        if finalized:
+            period_cache.save_league_rosters(league_id, period, rosters)
+    return rosters
+
+
+def load_rosters_for_periods(scoring_periods, max_workers=1):
     """
-    Calculate the date for a given scoring period.
-    Scoring period 1 starts on October 21, 2025.
-    Each scoring period is one day.
+    Bulk-load all rosters for the given scoring periods into the roster cache.
+    Periods that are already loaded are not fetched again. With max_workers > 1
+    the missing periods are fetched concurrently.
     """
-    start_date = datetime.date(*SEASON_START_DATE)
-    # Scoring period 1 = Oct 21, scoring period 2 = Oct 22, etc.
-    period_date = start_date + datetime.timedelta(days=(scoring_period - 1))
-    return period_date
+    global _player_index
+    league_id = os.getenv('ESPN_LEAGUE_ID')
+    with _roster_lock:
+        missing = [period for period in dict.fromkeys(scoring_periods) if period not in _loaded_periods]
+    if not missing:
+        return
+
+    if max_workers > 1 and len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            results = list(executor.map(lambda period: _load_period_rosters(league_id, period), missing))
+    else:
+        results = [_load_period_rosters(league_id, period) for period in missing]
+
+    with _roster_lock:
+        for period, rosters in zip(missing, results):
+            if rosters is None:
+                # Don't remember failures so the next call retries
+                continue
+            for team_id, roster in rosters.items():
+                _roster_cache[(team_id, period)] = roster
+            _loaded_periods.add(period)
+            _player_index = None
 
-def get_teams_playing_for_period(scoring_period):
+
+def clear_roster_cache():
+    """Forget all loaded rosters (call at the start of each update run)."""
+    global _player_index
+    with _roster_lock:
+        _roster_cache.clear()
+        _loaded_periods.clear()
+        _player_index = None
+
+
+def get_player_index():
+    """Player -> NBA team index built from every roster loaded so far."""
+    global _player_index
+    with _roster_lock:
+        if _player_index is None:
+            # Oldest period first, so a traded player resolves to their latest team
+            by_period = sorted(_roster_cache.items(), key=lambda item: item[0][1])
+            _player_index = PlayerIndex.from_rosters(roster for _, roster in by_period)
+        return _player_index
+
+
+def get_roster_for_scoring_period(team_id, scoring_period):
+    load_rosters_for_periods([scoring_period])
+    # Hand out copies since callers annotate the player dicts
+    with _roster_lock:
+        roster = _roster_cache.get((team_id, scoring_period), [])
+    return [dict(player) for player in roster]
+
+# NBA team ID to tricode mapping
+NBA_TEAM_ID_TO_TRICODE = {
+    1610612737: 'ATL', 1610612738: 'BOS', 1610612739: 'CLE', 1610612740: 'NOP',
+    1610612741: 'CHI', 1610612742: 'DAL', 1610612743: 'DEN', 1610612744: 'GSW',
+    1610612745: 'HOU', 1610612746: 'LAC', 1610612747: 'LAL', 1610612748: 'MIA',
+    1610612749: 'MIL', 1610612750: 'MIN', 1610612751: 'BKN', 1610612752: 'NYK',
+    1610612753: 'ORL', 1610612754: 'IND', 1610612755: 'PHI', 1610612756: 'PHX',
+    1610612757: 'POR', 1610612758: 'SAC', 1610612759: 'SAS', 1610612760: 'OKC',
+    1610612761: 'TOR', 1610612762: 'UTA', 1610612763: 'MEM', 1610612764: 'WAS',
+    1610612765: 'DET', 1610612766: 'CHA'
+}
+
+
+def is_past_period(scoring_period):
+    """True if the period's date is before today (EST)."""
+    today_est = now_est().date()
+    return get_scoring_period_date(scoring_period) < today_est
+
+
+def get_games_for_period(scoring_period):
     """
-    Get all teams playing during a given scoring period (one day).
-    Returns a set of team tricodes.
+    Get all games in a scoring period as a list of
+    {'home': tricode, 'away': tricode, 'status': game status id} dicts.
+    Returns None if the schedule could not be fetched.
+    Served from the season schedule index; scoreboardv2 is only used as a
+    fallback when the index is unavailable or doesn't cover the date.
     """
-    # NBA team ID to tricode mapping
-    nba_team_id_to_tricode = {
-        1610612737: 'ATL', 1610612738: 'BOS', 1610612739: 'CLE', 1610612740: 'NOP',
-        1610612741: 'CHI', 1610612742: 'DAL', 1610612743: 'DEN', 1610612744: 'GSW',
-        1610612745: 'HOU', 1610612746: 'LAC', 1610612747: 'LAL', 1610612748: 'MIA',
-        1610612749: 'MIL', 1610612750: 'MIN', 1610612751: 'BKN', 1610612752: 'NYK',
-        1610612753: 'ORL', 1610612754: 'IND', 1610612755: 'PHI', 1610612756: 'PHX',
-        1610612757: 'POR', 1610612758: 'SAC', 1610612759: 'SAS', 1610612760: 'OKC',
-        1610612761: 'TOR', 1610612762: 'UTA', 1610612763: 'MEM', 1610612764: 'WAS',
-        1610612765: 'DET', 1610612766: 'CHA'
-    }
-    
-    teams_playing = set()
     period_date = get_scoring_period_date(scoring_period)
-    #print(f"\n=== DEBUG: get_teams_playing_for_period ===")
-    #print(f"Scoring period: {scoring_period}")
-    #print(f"Period date: {period_date}")
-    
-    # Check games on this specific day only
+    index = get_schedule_index()
+    if index is not None and index.covers(period_date):
+        return index.games_on(period_date)
+
     date_str = period_date.strftime('%m/%d/%Y')
-    #print(f"\nChecking games for: {date_str}")
-    
     try:
+        from nba_api.stats.endpoints import scoreboardv2
         # Use scoreboardv2 for any date (past, present, or future)
         scoreboard_data = scoreboardv2.ScoreboardV2(game_date=date_str)
-        games = scoreboard_data.get_dict()['resultSets'][0]['rowSet']
-        #print(f"  Found {len(games)} games")
-        
-        for game in games:
-            # Extract team IDs from game data (indices 6 and 7 are home/away team IDs)
-            home_team_id = game[6]
-            away_team_id = game[7]
-            
-            # Convert team IDs to tricodes
-            home_tricode = nba_team_id_to_tricode.get(home_team_id, None)
-            away_tricode = nba_team_id_to_tricode.get(away_team_id, None)
-            
-            #print(f"    Game: {home_tricode} (ID: {home_team_id}) vs {away_tricode} (ID: {away_team_id})")
-            
-            if home_tricode:
-                teams_playing.add(home_tricode)
-            if away_tricode:
-                teams_playing.add(away_tricode)
+        rows = scoreboard_data.get_dict()['resultSets'][0]['rowSet']
     except Exception as e:
         # If the API fails for a future date or other reason, continue
-        print(f"  ERROR: Could not fetch games for {date_str}: {e}")
-        pass
-    
-    #print(f"\nTotal teams playing on this date: {teams_playing}")
+        logger.error("Could not fetch games for %s: %s", date_str, e)
+        return None
+
+    games = []
+    for game in rows:
+        # Index 3 is the game status (3 = final); indices 6 and 7 are home/away team IDs
+        games.append({
+            'home': NBA_TEAM_ID_TO_TRICODE.get(game[6]),
+            'away': NBA_TEAM_ID_TO_TRICODE.get(game[7]),
+            'status': game[3]
+        })
+    return games
+
+
+def is_period_finalized(scoring_period):
+    """
+    A period is finalized once its date has passed and all of its games are final.
+    Data for finalized periods never changes and can be cached permanently.
+    """
+    if not is_past_period(scoring_period):
+        return False
+    games = get_games_for_period(scoring_period)
+    return games is not None and all(game['status'] == 3 for game in games)
+
+
+def get_teams_playing_for_period(scoring_period):
+    """
+    Get all teams playing during a given scoring period (one day).
+    Returns a set of team tricodes.
+    """
+    index = get_schedule_index()
+    if index is not None and index.covers(get_scoring_period_date(scoring_period)):
+        return set(index.teams_playing(scoring_period))
+
+    teams_playing = set()
+    for game in get_games_for_period(scoring_period) or []:
+        if game['home']:
+            teams_playing.add(game['home'])
+        if game['away']:
+            teams_playing.add(game['away'])
     return teams_playing
 
 def get_nba_team_tricode(pro_team_name):
@@ -193,14 +329,71 @@ def get_nba_team_tricode(pro_team_name):
     }
     return team_mapping.get(pro_team_name, None)
 
-def standardize_name(name):
-    # Remove accents and convert to ASCII
-    return unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII').lower()
+def assign_projections(players, scoringperiod, injury_dict):
+    """
+    Set each player's 'Projection' for the scoring period from the weighted
+    projections CSV. Returns False if the projections file is missing.
+    """
+    # Load projections (parsed once per process, reloaded only if the CSV changes)
+    projections = get_projection_store()
+    if not projections.available():
+        return False
+
+    # Get teams playing during this scoring period
+    teams_playing = get_teams_playing_for_period(scoringperiod)
+    
+    # Check if this scoring period is in the past
+    is_past_date = is_past_period(scoringperiod)
+    
+    # Assign projections to all players
+    for player in players:
+        # Get player's NBA team
+        pro_team_id = player.get('proTeamId', 0)
+        player_team_tricode = ESPN_TEAM_MAPPING.get(pro_team_id, None)
+        
+        # Check if player's team is playing during this scoring period
+        is_playing = player_team_tricode and player_team_tricode in teams_playing
+
+        # For PAST dates: If player has 0 points, they didn't play - set projection to 0
+        # This handles cases where a player was OUT during the game but later changed to DTD/ACTIVE
+        if is_past_date and player.get("points", 0) == 0:
+            player["Projection"] = 0
+            continue
+
+        # For CURRENT/FUTURE dates: Check injury status
+        # Check if player is OUT - set projection to 0 ONLY if they haven't already played (points == 0)
+        if player["name"] in injury_dict and injury_dict[player["name"]] == "OUT":
+            # Only zero out projection if game hasn't been played yet; otherwise assign it normally
+            if player.get("points", 0) == 0:
+                player["Projection"] = 0
+                continue
+        
+        # If player's team is not playing, set projection to 0 ONLY if they haven't already played
+        if not is_playing:
+            # Only zero out if game hasn't been played yet; otherwise assign it normally
+            if player.get("points", 0) == 0:
+                player["Projection"] = 0
+                continue
+
+        # Find player in projections
+        projection_value = projections.per_game(player["name"])
+        if projection_value is not None:
+            player["Projection"] = projection_value
+        else:
+            player["Projection"] = 0
+
+    return True
 
 
 def matchup_comparison(box_id, scoringperiod):
-    team1_id = league.box_scores()[box_id].home_team.team_id
-    team2_id = league.box_scores()[box_id].away_team.team_id
+    """
+    Pair both teams' lineups slot by slot for a scoring period: 7 starting positions,
+    3 UTL, then BENCH and IR. Returns a MatchupTable, or None if projections are missing.
+    """
+    league = get_league()
+    box = get_box_scores()[box_id]
+    team1_id = box.home_team.team_id
+    team2_id = box.away_team.team_id
     team1_roster = get_roster_for_scoring_period(team1_id, scoringperiod)
     team2_roster = get_roster_for_scoring_period(team2_id, scoringperiod)
 
@@ -228,17 +421,6 @@ def matchup_comparison(box_id, scoringperiod):
             case 13:
                 player.update({"Position": "IR"})
 
-    # Load projections
-    try:
-        df = pd.read_csv(WEIGHTED_PER36_CSV)
-        #print("Using projections from weighted_per36_projection.csv")
-    except FileNotFoundError:
-        #print("Projection file not found!")
-        return None
-
-    # Create standardized names in projection dataframe for better matching
-    df['Player_Standardized'] = df['Player'].apply(standardize_name)
-
     # Get injury information
     injuredListName = []
     injuredListInjury = []
@@ -260,81 +442,24 @@ def matchup_comparison(box_id, scoringperiod):
         elif leagueteam.team_id == team2_id:
             team2_name = leagueteam.team_name
 
-    # Get teams playing during this scoring period
-    teams_playing = get_teams_playing_for_period(scoringperiod)
-    #print(f"Teams playing in scoring period {scoringperiod}: {teams_playing}")
-    
-    # Check if this scoring period is in the past
-    from zoneinfo import ZoneInfo
-    period_date = get_scoring_period_date(scoringperiod)
-    today_est = datetime.datetime.now(ZoneInfo('America/New_York')).date()
-    is_past_date = period_date < today_est
-    
-    # ESPN pro team ID to NBA tricode mapping
-    espn_team_mapping = {
-        1: 'ATL', 2: 'BOS', 3: 'NOP', 4: 'CHI', 5: 'CLE', 6: 'DAL', 7: 'DEN',
-        8: 'DET', 9: 'GSW', 10: 'HOU', 11: 'IND', 12: 'LAC', 13: 'LAL',
-        14: 'MIA', 15: 'MIL', 16: 'MIN', 17: 'BKN', 18: 'NYK', 19: 'ORL',
-        20: 'PHI', 21: 'PHX', 22: 'POR', 23: 'SAC', 24: 'SAS', 25: 'OKC',
-        26: 'UTA', 27: 'WAS', 28: 'TOR', 29: 'MEM', 30: 'CHA'
-    }
-    
-    # Assign projections to all players
-    #print(f"\n=== DEBUG: Assigning Projections ===")
-    for idx, player in enumerate(team1_roster + team2_roster):
-        #print(f"\n--- Player {idx + 1}: {player['name']} ---")
-        player_name_std = standardize_name(player["name"])
-        #print(f"  Standardized name: {player_name_std}")
-        
-        # Get player's NBA team
-        pro_team_id = player.get('proTeamId', 0)
-        #print(f"  ESPN proTeamId: {pro_team_id}")
-        player_team_tricode = espn_team_mapping.get(pro_team_id, None)
-        #print(f"  Mapped to NBA tricode: {player_team_tricode}")
-        
-        # Check if player's team is playing during this scoring period
-        is_playing = player_team_tricode and player_team_tricode in teams_playing
-        #print(f"  Is team in teams_playing? {player_team_tricode in teams_playing if player_team_tricode else 'N/A (no tricode)'}")
-        #print(f"  is_playing: {is_playing}")
-
-        # For PAST dates: If player has 0 points, they didn't play - set projection to 0
-        # This handles cases where a player was OUT during the game but later changed to DTD/ACTIVE
-        if is_past_date and player.get("points", 0) == 0:
-            #print(f"  -> Setting projection to 0 (Past date with 0 points - player didn't play)")
-            player["Projection"] = 0
-            continue
-
-        # For CURRENT/FUTURE dates: Check injury status
-        # Check if player is OUT - set projection to 0 ONLY if they haven't already played (points == 0)
-        if player["name"] in injury_dict and injury_dict[player["name"]] == "OUT":
-            if player.get("points", 0) == 0:  # Only zero out projection if game hasn't been played yet
-                #print(f"  -> Setting projection to 0 (Player is OUT and hasn't played)")
-                player["Projection"] = 0
-                continue
-            else:
-                #print(f"  -> Player is OUT now but already played (has {player['points']} points), keeping projection")
-                pass  # Continue to assign projection normally
-        
-        # If player's team is not playing, set projection to 0 ONLY if they haven't already played
-        if not is_playing:
-            if player.get("points", 0) == 0:  # Only zero out if game hasn't been played yet
-                #print(f"  -> Setting projection to 0 (Team not playing)")
-                player["Projection"] = 0
-                continue
-            else:
-                #print(f"  -> Team not playing now but player already played (has {player['points']} points), keeping projection")
-                pass  # Continue to assign projection normally
-
-        # Find player in projections
-        player_row = df[df['Player_Standardized'] == player_name_std]
-        #print(f"  Found in projections CSV? {not player_row.empty}")
-        if not player_row.empty:
-            projection_value = player_row['PerGame_Projection'].values[0]
-            #print(f"  Projection value from CSV: {projection_value}")
-            player["Projection"] = projection_value
-        else:
-            #print(f"  -> Setting projection to 0 (Not found in CSV)")
-            player["Projection"] = 0
+    # Finalized periods never change, so their projected rosters come from disk
+    league_id = os.getenv('ESPN_LEAGUE_ID')
+    finalized = is_period_finalized(scoringperiod)
+    cached_team1 = period_cache.load_team_period(league_id, team1_id, scoringperiod, 'projected') if finalized else None
+    cached_team2 = period_cache.load_team_period(league_id, team2_id, scoringperiod, 'projected') if finalized else None
+
+    if cached_team1 is not None and cached_team2 is not None:
+        team1_roster = cached_team1
+        team2_roster = cached_team2
+        count('projection_cache_hits')
+    else:
+        with span('projection_lookup', players=len(team1_roster) + len(team2_roster)):
+            assigned = assign_projections(team1_roster + team2_roster, scoringperiod, injury_dict)
+        if not assigned:
+            return None
+        if finalized:
+            period_cache.save_team_period(league_id, team1_id, scoringperiod, 'projected', team1_roster)
+            period_cache.save_team_period(league_id, team2_id, scoringperiod, 'projected', team2_roster)
 
     # Build position-indexed lists for both teams so we can align rows by Position
     def build_pos_map(roster):
@@ -350,24 +475,24 @@ def matchup_comparison(box_id, scoringperiod):
     team1_by_pos = build_pos_map(team1_roster)
     team2_by_pos = build_pos_map(team2_roster)
 
-    def fmt_team1(player):
-        if not player:
-            return [0, 0, 'Empty Slot']
-        name = player.get('name', 'Empty Slot')
-        if name in injury_dict:
-            name = f"{name} ({injury_dict[name]})"
-        return [player.get('points', 0), player.get('Projection', 0), name]
-
-    def fmt_team2(player, pos):
+    def to_slot(player):
         if not player:
-            return [pos, 'Empty Slot', 0, 0]
-        name = player.get('name', 'Empty Slot')
-        if name in injury_dict:
-            name = f"{name} ({injury_dict[name]})"
-        return [player.get('Position', pos), name, player.get('Projection', 0), player.get('points', 0)]
-
-    headerlist = ["Position", team2_name, "Projection", "Points", "Points", "Projection", team1_name]
-    bigarr = []
+            return PlayerSlot()
+        name = player.get('name', EMPTY_SLOT)
+        return PlayerSlot(
+            name=name,
+            player_id=player.get('playerId'),
+            pro_team=ESPN_TEAM_MAPPING.get(player.get('proTeamId', 0)),
+            lineup_slot_id=player.get('lineupSlotId'),
+            points=float(player.get('points', 0) or 0),
+            projection=float(player.get('Projection', 0) or 0),
+            injury=injury_dict.get(name)
+        )
+
+    def pair(pos, t2_player, t1_player):
+        return MatchupRow(pos, to_slot(t2_player), to_slot(t1_player))
+
+    rows = []
 
     # Standard positions in order
     standard_positions = ["PG", "SG", "SF", "PF", "C", "G", "F"]
@@ -376,18 +501,13 @@ def matchup_comparison(box_id, scoringperiod):
     for pos in standard_positions:
         t2_player = team2_by_pos.get(pos, []).pop(0) if team2_by_pos.get(pos) else None
         t1_player = team1_by_pos.get(pos, []).pop(0) if team1_by_pos.get(pos) else None
-
-        arr2 = fmt_team2(t2_player, pos)
-        arr1 = fmt_team1(t1_player)
-        bigarr.append(arr2 + arr1)
+        rows.append(pair(pos, t2_player, t1_player))
 
     # UTL slots: up to 3
     for _ in range(3):
         t2_player = team2_by_pos.get('UTL', []).pop(0) if team2_by_pos.get('UTL') else None
         t1_player = team1_by_pos.get('UTL', []).pop(0) if team1_by_pos.get('UTL') else None
-        arr2 = fmt_team2(t2_player, 'UTL')
-        arr1 = fmt_team1(t1_player)
-        bigarr.append(arr2 + arr1)
+        rows.append(pair('UTL', t2_player, t1_player))
 
     # BENCH and IR: pair remaining players by position-bucket order so bench lists line up
     def append_pairs(pos_name):
@@ -397,31 +517,21 @@ def matchup_comparison(box_id, scoringperiod):
         for i in range(max_len):
             t2_player = t2_list[i] if i < len(t2_list) else None
             t1_player = t1_list[i] if i < len(t1_list) else None
-            arr2 = fmt_team2(t2_player, pos_name)
-            arr1 = fmt_team1(t1_player)
-            bigarr.append(arr2 + arr1)
+            rows.append(pair(pos_name, t2_player, t1_player))
 
     append_pairs('BENCH')
     append_pairs('IR')
 
-    table = tabulate(
-        bigarr,
-        headers=["Position", team2_name, "Projection", "Points", "Points", "Projection", team1_name],
-        tablefmt="grid"
-    )
-    #print(table)
-    print(f"Scoring Period: {scoringperiod}")
-
-    return [headerlist] + bigarr
+    logger.debug("Scoring Period: %s", scoringperiod)
 
+    return MatchupTable(team1_name, team2_name, rows)
 
-# Use it with:
-#get_matchup_comparison(league, 5)
-# Or for a specific scoring period:
-# get_matchup_comparison(league, 5)
 
-team1_id = league.box_scores()[3].home_team.team_id
-team2_id = league.box_scores()[3].away_team.team_id
+if __name__ == "__main__":
+    from tabulate import tabulate
 
-print(team1_id, team2_id)
-matchup_comparison(3, 5)
+    refresh_projections()
+    sample = matchup_comparison(3, 5)
+    if sample:
+        header, rows = sample.as_table()
+        print(tabulate(rows, headers=header, tablefmt="grid"))
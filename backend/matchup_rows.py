@@ -0,0 +1,63 @@
+# matchup_rows.py
+"""
+Typed rows passed between matchup_comparison, live projection and weekly totals.
+
+Each matchup row pairs one lineup slot of both teams. A PlayerSlot carries the
+player's id, NBA team, points, projections and injury status as separate typed
+fields, so no stage has to glue "Name (OUT)" strings together, split them apart
+again or coerce numbers back out of table cells.
+"""
+from dataclasses import dataclass, field
+
+EMPTY_SLOT = "Empty Slot"
+
+
+@dataclass(slots=True)
+class PlayerSlot:
+    name: str = EMPTY_SLOT
+    player_id: int | None = None
+    pro_team: str | None = None        # NBA tricode
+    lineup_slot_id: int | None = None
+    points: float = 0.0
+    projection: float = 0.0
+    live_projection: float = 0.0
+    injury: str | None = None          # ESPN injury status, e.g. "OUT" or "DAY_TO_DAY"
+
+    @property
+    def is_empty(self):
+        return self.name == EMPTY_SLOT
+
+    @property
+    def display_name(self):
+        """Name with the injury status appended, as shown in printed tables."""
+        return f"{self.name} ({self.injury})" if self.injury else self.name
+
+
+@dataclass(slots=True)
+class MatchupRow:
+    position: str
+    team2: PlayerSlot = field(default_factory=PlayerSlot)
+    team1: PlayerSlot = field(default_factory=PlayerSlot)
+
+
+@dataclass(slots=True)
+class MatchupTable:
+    team1_name: str
+    team2_name: str
+    rows: list
+
+    def as_table(self, live=False):
+        """(header, rows) lists for tabulate; live=True adds the live projection columns."""
+        if live:
+            header = ["Position", self.team2_name, "Projection", "Live Proj", "Points",
+                      "Points", "Live Proj", "Projection", self.team1_name]
+            rows = [[r.position, r.team2.display_name, r.team2.projection, r.team2.live_projection, r.team2.points,
+                     r.team1.points, r.team1.live_projection, r.team1.projection, r.team1.display_name]
+                    for r in self.rows]
+        else:
+            header = ["Position", self.team2_name, "Projection", "Points",
+                      "Points", "Projection", self.team1_name]
+            rows = [[r.position, r.team2.display_name, r.team2.projection, r.team2.points,
+                     r.team1.points, r.team1.projection, r.team1.display_name]
+                    for r in self.rows]
+        return header, rows
@@ -1,4 +1,5 @@
 # nba_utils.py
+import os
 import re
 import datetime
 from zoneinfo import ZoneInfo
@@ -13,13 +14,37 @@ ESPN_TEAM_MAPPING = {
     26: 'UTA', 27: 'WAS', 28: 'TOR', 29: 'MEM', 30: 'CHA'
 }
 
+def now_est():
+    """
+    Current time in EST. FANTASY_NOW (ISO datetime, EST if no offset) freezes the
+    clock, so a recorded tick can be replayed as of the moment it was recorded.
+    """
+    frozen = os.environ.get('FANTASY_NOW')
+    if frozen:
+        now = datetime.datetime.fromisoformat(frozen)
+        if now.tzinfo is None:
+            return now.replace(tzinfo=ZoneInfo('America/New_York'))
+        return now.astimezone(ZoneInfo('America/New_York'))
+    return datetime.datetime.now(ZoneInfo('America/New_York'))
+
+
+def get_scoring_period_date(scoring_period):
+    """
+    Calculate the date for a given scoring period.
+    Scoring period 1 starts on October 21, 2025.
+    Each scoring period is one day.
+    """
+    start_date = datetime.date(*SEASON_START_DATE)
+    # Scoring period 1 = Oct 21, scoring period 2 = Oct 22, etc.
+    return start_date + datetime.timedelta(days=(scoring_period - 1))
+
 def get_current_scoring_period():
     """
     Calculate the current scoring period based on today's date (EST timezone).
     Scoring period 1 = October 21, 2025.
     """
     start_date = datetime.date(*SEASON_START_DATE)
-    now = datetime.datetime.now(ZoneInfo('America/New_York'))
+    now = now_est()
     today = now.date()
     days_since_start = (today - start_date).days
     current_period = days_since_start + 1
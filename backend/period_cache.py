@@ -0,0 +1,65 @@
+# period_cache.py
+"""
+On-disk cache for finalized scoring periods.
+
+Once a period's date has passed and every game that day is final (status 3),
+its rosters and projections can never change, so they are written here once
+and served from disk on every later run. (Game lists live in the season
+schedule index.)
+
+Layout under PERIOD_CACHE_DIR:
+    <league_id>/<period>/rosters.json           - every team's roster, keyed by team id
+    <league_id>/<period>/<kind>_<team_id>.json  - other per-team data (e.g. 'projected')
+"""
+import os
+import json
+import tempfile
+from config import PERIOD_CACHE_DIR
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(path, data):
+    """Write atomically so a crash mid-write never leaves a truncated cache file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _team_path(league_id, team_id, period, kind):
+    return os.path.join(PERIOD_CACHE_DIR, str(league_id), str(period), f"{kind}_{team_id}.json")
+
+
+def load_team_period(league_id, team_id, period, kind):
+    """Return cached per-team data for a finalized period, or None."""
+    return _read_json(_team_path(league_id, team_id, period, kind))
+
+
+def save_team_period(league_id, team_id, period, kind, data):
+    _write_json(_team_path(league_id, team_id, period, kind), data)
+
+
+def load_league_rosters(league_id, period):
+    """Return {team_id: roster} for a finalized period, or None if not cached."""
+    data = _read_json(os.path.join(PERIOD_CACHE_DIR, str(league_id), str(period), "rosters.json"))
+    if data is None:
+        return None
+    # JSON object keys are strings; team ids are ints everywhere else
+    return {int(team_id): roster for team_id, roster in data.items()}
+
+
+def save_league_rosters(league_id, period, rosters):
+    _write_json(os.path.join(PERIOD_CACHE_DIR, str(league_id), str(period), "rosters.json"), rosters)
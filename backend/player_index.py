@@ -0,0 +1,75 @@
+# player_index.py
+"""
+Player -> NBA team lookup built once per update run.
+
+Replaces scanning every roster of every league team for each player row. The
+index is keyed by ESPN player id and by normalized name (with a first + last
+name fallback for suffixes and middle names), and every lookup is a dict read.
+All three keys take the most recent roster entry, so a lookup by id and one by
+name agree for traded players.
+"""
+import unicodedata
+from nba_utils import ESPN_TEAM_MAPPING
+
+
+def normalize_player_name(name):
+    """ASCII, lowercase, single-spaced version of a player name."""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII')
+    return " ".join(ascii_name.lower().split())
+
+
+def _first_last_key(normalized_name):
+    parts = normalized_name.split()
+    if len(parts) >= 2:
+        return parts[0], parts[-1]
+    return None
+
+
+class PlayerIndex:
+    def __init__(self):
+        self._by_id = {}
+        self._by_name = {}
+        self._by_first_last = {}
+
+    def __len__(self):
+        return len(self._by_id) + len(self._by_name)
+
+    def add(self, name, tricode, player_id=None):
+        """Later entries win for id and name alike, so add rosters oldest first."""
+        if not tricode:
+            return
+        if player_id is not None:
+            self._by_id[player_id] = tricode
+        if name:
+            normalized = normalize_player_name(name)
+            self._by_name[normalized] = tricode
+            key = _first_last_key(normalized)
+            if key:
+                self._by_first_last[key] = tricode
+
+    def tricode_for(self, player_id=None, name=None):
+        """NBA tricode for a player by ESPN id, falling back to name. None if unknown."""
+        if player_id is not None and player_id in self._by_id:
+            return self._by_id[player_id]
+        if not name or not name.strip():
+            return None
+
+        normalized = normalize_player_name(name)
+        if normalized in self._by_name:
+            return self._by_name[normalized]
+        key = _first_last_key(normalized)
+        return self._by_first_last.get(key) if key else None
+
+    @classmethod
+    def from_rosters(cls, rosters):
+        """
+        Build from parsed roster lists (dicts with 'name', 'proTeamId' and optional
+        'playerId'), oldest scoring period first: a traded player maps to their latest team.
+        """
+        index = cls()
+        for roster in rosters:
+            for player in roster:
+                index.add(player.get('name'),
+                          ESPN_TEAM_MAPPING.get(player.get('proTeamId', 0)),
+                          player.get('playerId'))
+        return index
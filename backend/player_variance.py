@@ -0,0 +1,95 @@
+# player_variance.py
+"""
+Per-player game-to-game spread of fantasy points, fitted from this season's game logs.
+
+The fit runs in the projection refresh stage (one PlayerGameLogs request for the
+whole league) and is published to PLAYER_VARIANCE_CSV. The live tick only reads
+that file: each player's coefficient of variation (std / mean fantasy points per
+game), used by the win-probability simulation. Players with fewer than
+VARIANCE_MIN_GAMES games, or not in the file, use DEFAULT_PLAYER_CV.
+"""
+import os
+import csv
+import logging
+import threading
+from config import PLAYER_VARIANCE_CSV, VARIANCE_MIN_GAMES, DEFAULT_PLAYER_CV
+from projection_store import standardize_name
+
+logger = logging.getLogger(__name__)
+
+
+def fit_player_variance():
+    """Download season game logs and return a per-player Games/Mean/Std/CV DataFrame."""
+    import time
+    import numpy as np
+    from nba_api.stats.endpoints import playergamelogs
+    from sps_2 import SEASON, SEASON_TYPE, fantasy_points, normalize_name
+
+    logger.info("Fetching %s game logs for %s...", SEASON_TYPE, SEASON)
+    time.sleep(0.6)  # small delay helps avoid rate limits
+    logs = playergamelogs.PlayerGameLogs(
+        season_nullable=SEASON,
+        season_type_nullable=SEASON_TYPE
+    ).get_data_frames()[0]
+
+    logs["FPTS"] = fantasy_points(logs)
+    # Only games the player actually played in
+    logs = logs[logs["MIN"] > 0]
+
+    fit = logs.groupby("PLAYER_NAME")["FPTS"].agg(Games="count", Mean_FPTS="mean", Std_FPTS="std").reset_index()
+    fit["Std_FPTS"] = fit["Std_FPTS"].fillna(0.0)
+    fit["CV"] = np.where(fit["Mean_FPTS"] > 0, fit["Std_FPTS"] / fit["Mean_FPTS"].where(fit["Mean_FPTS"] > 0), np.nan)
+    fit["PLAYER_NAME"] = fit["PLAYER_NAME"].map(normalize_name)
+    return fit.rename(columns={"PLAYER_NAME": "Player"}).round(3)
+
+
+def main(output_csv=PLAYER_VARIANCE_CSV):
+    from projection_refresh import publish_csv
+
+    fit = fit_player_variance()
+    publish_csv(fit, output_csv)
+    logger.info("Wrote variance fit for %s players to %s", len(fit), output_csv)
+    return fit
+
+
+class PlayerVariance:
+    """Coefficient of variation per player, reloaded when the CSV changes on disk."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._signature = None
+        self._cv = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            signature = None
+        if signature == self._signature:
+            return
+        with self._lock:
+            cv = {}
+            if signature is not None:
+                with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                    for row in csv.DictReader(f):
+                        if row.get('CV') and int(float(row.get('Games') or 0)) >= VARIANCE_MIN_GAMES:
+                            cv.setdefault(standardize_name(row['Player']), float(row['CV']))
+            self._cv = cv
+            self._signature = signature
+
+    def cv(self, player_name):
+        """Coefficient of variation for a player, or DEFAULT_PLAYER_CV if there's no usable fit."""
+        return self._cv.get(standardize_name(player_name), DEFAULT_PLAYER_CV)
+
+
+_variance = None
+
+
+def get_player_variance():
+    global _variance
+    if _variance is None:
+        _variance = PlayerVariance(PLAYER_VARIANCE_CSV)
+    _variance.refresh()
+    return _variance
@@ -0,0 +1,170 @@
+# projection_refresh.py
+"""
+Projection refresh stage, scheduled separately from the live update tick.
+
+Season per-game stats only change once a day's games are final, so the
+sps_2 -> combined_projector pipeline runs only when:
+  - a later game day has gone completely final since the last refresh,
+  - the preseason projections CSV or the blend weights changed,
+  - the published CSV is missing, or
+  - nothing could be checked and the last refresh is older than PROJECTION_MAX_AGE_HOURS.
+
+What was used for the last refresh is recorded in PROJECTION_STATE_JSON. The
+live tick never runs this; it only reads the published WEIGHTED_PER36_CSV.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import datetime
+import tempfile
+from config import (PROJECTION_STATE_JSON, PROJECTION_MAX_AGE_HOURS, FANTASY_PROJECTIONS_CSV,
+                    WEIGHTED_PER36_CSV, PROJECTION_WEIGHT, SPS_WEIGHT)
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path, write, newline=None):
+    """Call write(f) on a temp file next to path, then rename it into place."""
+    path = str(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def publish_csv(df, path):
+    """Write a DataFrame to CSV atomically, so readers never see a half-written file."""
+    _write_atomic(path, lambda f: df.to_csv(f, index=False), newline='')
+
+
+def _file_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def load_state(path=PROJECTION_STATE_JSON):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state, path=PROJECTION_STATE_JSON):
+    _write_atomic(path, lambda f: json.dump(state, f, indent=4))
+
+
+def get_stats_through(today=None):
+    """
+    Latest game day (ISO date, up to today) on which every game is final, i.e. the
+    last day season stats can include. Today's statuses come from the live
+    scoreboard, earlier days from the schedule index. None if unknown.
+    """
+    from schedule_index import get_schedule_index
+    from scoreboard_snapshot import get_scoreboard_snapshot
+
+    from nba_utils import now_est
+    today = today or now_est().date()
+    index = get_schedule_index()
+    if index is None:
+        return None
+
+    live_status = {}
+    try:
+        live_status = {game.game_id: game.status for game in get_scoreboard_snapshot().games}
+    except Exception as e:
+        logger.warning("Could not read live scoreboard for projection freshness: %s", e)
+
+    # Walk back from today to the first fully final game day
+    day = min(today, datetime.date.fromisoformat(index.last_date)) if index.last_date else today
+    for _ in range(14):
+        if not index.covers(day):
+            break
+        games = index.games_on(day)
+        if games and all(live_status.get(g['game_id'], g['status']) == 3 for g in games):
+            return day.isoformat()
+        day -= datetime.timedelta(days=1)
+    return None
+
+
+def current_inputs(today=None):
+    """Everything the published projections depend on."""
+    return {
+        'stats_through': get_stats_through(today),
+        'fantasy_projections_hash': _file_hash(FANTASY_PROJECTIONS_CSV),
+        'weights': [PROJECTION_WEIGHT, SPS_WEIGHT],
+    }
+
+
+def stale_reason(state, inputs):
+    """Why the published projections need rebuilding, or None if they are fresh."""
+    if not os.path.exists(WEIGHTED_PER36_CSV):
+        return "no published projections"
+    previous = state.get('inputs')
+    if not previous:
+        return "no refresh recorded"
+    if inputs['fantasy_projections_hash'] != previous.get('fantasy_projections_hash'):
+        return "projections CSV changed"
+    if inputs['weights'] != previous.get('weights'):
+        return "blend weights changed"
+    if inputs['stats_through'] is None:
+        if time.time() - state.get('refreshed_at', 0) > PROJECTION_MAX_AGE_HOURS * 3600:
+            return f"older than {PROJECTION_MAX_AGE_HOURS}h and game statuses unavailable"
+        return None
+    if inputs['stats_through'] != previous.get('stats_through'):
+        return f"games through {inputs['stats_through']} are final"
+    return None
+
+
+def refresh_projections_if_stale(force=False):
+    """
+    Rebuild and publish WEIGHTED_PER36_CSV if it is stale (or force=True).
+    Returns True if a refresh ran.
+    """
+    state = load_state()
+    inputs = current_inputs()
+    reason = "forced" if force else stale_reason(state, inputs)
+    if reason is None:
+        return False
+
+    logger.info("Refreshing projections (%s)...", reason)
+    # Imported here: pandas and nba_api are only needed when a refresh actually runs
+    import sps_2
+    import combined_projector
+
+    start = time.perf_counter()
+    sps = sps_2.main()
+    combined_projector.main(sps)
+    try:
+        # Per-player spreads for the win simulation change on the same schedule
+        import player_variance
+        player_variance.main()
+    except Exception as e:
+        # The simulation falls back to DEFAULT_PLAYER_CV, so don't fail the refresh
+        logger.error("Could not fit player variance: %s", e)
+
+    save_state({
+        'refreshed_at': time.time(),
+        'inputs': inputs,
+        'output_hash': _file_hash(WEIGHTED_PER36_CSV),
+    })
+    logger.info("Projections refreshed in %.2fs", time.perf_counter() - start)
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+    from tracing import configure_logging
+    configure_logging()
+    refresh_projections_if_stale(force="--force" in sys.argv)
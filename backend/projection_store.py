@@ -0,0 +1,93 @@
+# projection_store.py
+"""
+In-memory per-game projection table.
+
+weighted_per36_projection.csv is parsed once per process into a dict keyed by
+standardized player name. Every lookup after that is a hash read. The file is
+re-parsed only when its mtime/size changes and its content hash differs.
+"""
+import os
+import csv
+import hashlib
+import threading
+import unicodedata
+from config import WEIGHTED_PER36_CSV
+
+
+def standardize_name(name):
+    # Remove accents and convert to ASCII
+    return unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII').lower()
+
+
+class ProjectionStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self._signature = None      # (mtime_ns, size) of the file last checked
+        self._content_hash = None
+        self._per_game = {}
+        self._lock = threading.Lock()
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def refresh(self):
+        """Reload the table if the file changed on disk. Cheap (one stat) when it hasn't."""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            if signature is None:
+                self._per_game = {}
+                self._content_hash = None
+                self._signature = None
+                return
+
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            content_hash = hashlib.sha1(raw).hexdigest()
+            if content_hash != self._content_hash:
+                self._per_game = self._parse(raw.decode('utf-8'))
+                self._content_hash = content_hash
+            self._signature = signature
+
+    @staticmethod
+    def _parse(text):
+        per_game = {}
+        for row in csv.DictReader(text.splitlines()):
+            name = row.get('Player')
+            if not name:
+                continue
+            value = row.get('PerGame_Projection')
+            # Keep the first row for a name, like the old DataFrame filter did
+            per_game.setdefault(standardize_name(name), float(value) if value else 0.0)
+        return per_game
+
+    @property
+    def content_hash(self):
+        """SHA-1 of the loaded CSV (None if the file is missing); changes when projections change."""
+        return self._content_hash
+
+    def available(self):
+        return self._signature is not None
+
+    def per_game(self, player_name):
+        """Per-game projection for a player, or None if they aren't in the table."""
+        return self._per_game.get(standardize_name(player_name))
+
+
+_store = None
+
+
+def get_projection_store():
+    """Process-wide projection store, refreshed from disk if the CSV changed."""
+    global _store
+    if _store is None:
+        _store = ProjectionStore(WEIGHTED_PER36_CSV)
+    _store.refresh()
+    return _store
@@ -0,0 +1,220 @@
+# publisher.py
+"""
+Publishes a tick's matchups as small files the web page reads on demand.
+
+Layout under MATCHUPS_DIR:
+    summary.json                            - week, day list and each matchup's teams and totals
+    week_<w>/<matchup_id>/<period>.json     - both teams' roster and players for one day
+    week_<w>/<matchup_id>/<period>.html     - that day's player tables, prerendered (see day_view)
+    week_<w>/deltas.jsonl                   - what each tick changed, by sequence number (see deltas)
+    manifest.json                           - content hash of every file above, the combined
+                                              version, the current seq and tick / changed-tick counters
+
+Every file (compact JSON or prerendered HTML) is written to a temp file and
+renamed into place, so a reader never sees a half-written file. Day shards are written before the summary
+that points at them, and a shard whose content didn't change is left untouched. Shards
+the new manifest doesn't list (a matchup or day that left the summary) are deleted
+after the summary is swapped in.
+WEEKLY_MATCHUPS_JSON is still written in full as the state file for incremental
+updates.
+
+The hashes in the manifest are what index.php uses as ETags. Nothing in the
+summary or shards depends on the clock, so a tick whose numbers didn't move
+leaves every hash, and the version, unchanged.
+"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+from config import MATCHUPS_DIR, MATCHUPS_SUMMARY_JSON, MATCHUPS_MANIFEST_JSON, WEEKLY_MATCHUPS_JSON
+from day_view import render_player_tables
+from deltas import public_view, structural_diff, append_delta
+import push_server
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def content_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def write_atomic(path, text):
+    """Write text to path via temp file + rename. Returns False if the file already had this content."""
+    path = str(path)
+    encoded = text.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == encoded:
+                return False
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def day_shard_path(week, matchup_id, period, ext='json'):
+    return os.path.join(MATCHUPS_DIR, f"week_{week}", matchup_id, f"{period}.{ext}")
+
+
+def remove_stale_shards(hashes):
+    """
+    Delete day shards (json and html) the manifest no longer lists: matchups, days
+    and weeks that dropped out of the summary. Delta logs are kept.
+    Returns the removed paths relative to MATCHUPS_DIR.
+    """
+    removed = []
+    root = str(MATCHUPS_DIR)
+    for week_dir in os.listdir(root) if os.path.isdir(root) else []:
+        if not week_dir.startswith("week_") or not os.path.isdir(os.path.join(root, week_dir)):
+            continue
+        for matchup_id in os.listdir(os.path.join(root, week_dir)):
+            matchup_dir = os.path.join(root, week_dir, matchup_id)
+            if not os.path.isdir(matchup_dir):
+                continue
+            for name in os.listdir(matchup_dir):
+                relative = f"{week_dir}/{matchup_id}/{name}"
+                if name.endswith(('.json', '.html')) and relative not in hashes:
+                    os.remove(os.path.join(matchup_dir, name))
+                    removed.append(relative)
+            if not os.listdir(matchup_dir):
+                os.rmdir(matchup_dir)
+    return removed
+
+
+def _team_summary(team):
+    return {key: value for key, value in team.items() if key != 'days'}
+
+
+def build_summary(week, matchups, seq=0):
+    periods = {}
+    for matchup in matchups.values():
+        for period, day in matchup['team1']['days'].items():
+            periods[str(period)] = day['date']
+    summary_matchups = {}
+    for matchup_id, matchup in matchups.items():
+        entry = {
+            'team1': _team_summary(matchup['team1']),
+            'team2': _team_summary(matchup['team2']),
+            'totals': matchup['totals'],
+        }
+        if 'simulation' in matchup:
+            entry['simulation'] = matchup['simulation']
+        summary_matchups[matchup_id] = entry
+    return {
+        'week': week,
+        'seq': seq,
+        'periods': dict(sorted(periods.items(), key=lambda item: int(item[0]))),
+        'matchups': summary_matchups,
+    }
+
+
+def load_manifest():
+    try:
+        with open(MATCHUPS_MANIFEST_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_state():
+    try:
+        with open(WEEKLY_MATCHUPS_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def next_delta(previous_manifest, previous_state, week, matchups):
+    """(seq, entry to append or None) for this tick; seq restarts at 0 each week."""
+    if previous_manifest.get('week') != week:
+        return 0, None
+    seq = previous_manifest.get('seq', 0)
+    if previous_state is None:
+        return seq + 1, {'reset': True}
+    ops = structural_diff(public_view(previous_state), public_view(matchups))
+    if not ops:
+        return seq, None
+    return seq + 1, {'ops': ops}
+
+
+def build_manifest(previous, week, seq, hashes, changed_files):
+    """Next manifest: file hashes, combined version and how often ticks changed anything."""
+    now = time.time()
+    version = content_hash(_dumps(sorted(hashes.items())))
+    changed = version != previous.get('version')
+    stats = previous.get('stats', {})
+    ticks = stats.get('ticks', 0) + 1
+    ticks_changed = stats.get('ticks_changed', 0) + (1 if changed else 0)
+    return {
+        'week': week,
+        'version': version,
+        'seq': seq,
+        'published_at': now,
+        'changed_at': now if changed else previous.get('changed_at', now),
+        'changed_files': changed_files,
+        'stats': {
+            'ticks': ticks,
+            'ticks_changed': ticks_changed,
+            'change_rate': round(ticks_changed / ticks, 3),
+        },
+        'files': hashes,
+    }
+
+
+def publish_matchups(week, matchups):
+    """
+    Write the day shards and their prerendered views, then this tick's delta, then
+    the summary, then the manifest, then the full state file, then pushes the tick
+    to connected clients (see push_server). Returns the manifest.
+    """
+    previous_manifest = load_manifest()
+    # Diff what the state file will hold (string keys, as the previous state was read back)
+    state_text = _dumps(matchups)
+    seq, delta = next_delta(previous_manifest, load_state(), week, json.loads(state_text))
+    hashes = {}
+    changed_files = []
+
+    def publish(path, text):
+        relative = os.path.relpath(path, MATCHUPS_DIR).replace(os.sep, '/')
+        hashes[relative] = content_hash(text)
+        if write_atomic(path, text):
+            changed_files.append(relative)
+
+    for matchup_id, matchup in matchups.items():
+        team1, team2 = matchup['team1'], matchup['team2']
+        for period, team1_day in team1['days'].items():
+            team2_day = team2['days'].get(period)
+            shard = {'team1': team1_day, 'team2': team2_day}
+            publish(day_shard_path(week, matchup_id, period), _dumps(shard))
+            html = render_player_tables(team1['name'], team1_day, team2['name'], team2_day)
+            publish(day_shard_path(week, matchup_id, period, 'html'), html)
+
+    # Appended before the summary so any seq a client can see is already in the log
+    if delta is not None:
+        append_delta(week, seq, **delta)
+    summary = build_summary(week, matchups, seq)
+    publish(str(MATCHUPS_SUMMARY_JSON), _dumps(summary))
+
+    manifest = build_manifest(previous_manifest, week, seq, hashes, changed_files)
+    write_atomic(MATCHUPS_MANIFEST_JSON, _dumps(manifest))
+    write_atomic(WEEKLY_MATCHUPS_JSON, state_text)
+    # Only once the new summary is in place, so nothing it points at goes missing
+    remove_stale_shards(hashes)
+
+    # Files first, so anything a pushed event points at is already on disk
+    push_server.broadcast(week, seq, summary['matchups'],
+                          None if delta and delta.get('reset') else (delta or {}).get('ops', []))
+    return manifest
@@ -0,0 +1,210 @@
+# push_server.py
+"""
+Server-Sent Events push server for live matchup updates.
+
+Runs one asyncio loop in a daemon thread next to the in-process updater and
+holds the current summary (teams, totals and simulation per matchup) in memory.
+The publisher feeds it directly after every tick via broadcast().
+
+    GET /events                      every matchup
+    GET /events?matchup=matchup_3    one matchup only
+
+Events (the id is the delta seq, see deltas.py):
+    snapshot  {"week", "seq", "matchups": {...}}  on connect, on a new week and on a reset
+    matchup   {"week", "seq", "matchup_id", "summary": {...}, "ops": [...]}  one per changed matchup
+
+An idle client costs one coroutine and a small queue. A client that falls more
+than PUSH_QUEUE_SIZE events behind is disconnected and reconnects with a fresh
+snapshot; EventSource does that on its own.
+"""
+import json
+import asyncio
+import logging
+import threading
+from urllib.parse import urlsplit, parse_qs
+from config import (PUSH_HOST, PUSH_PORT, PUSH_HEARTBEAT_SECONDS, PUSH_QUEUE_SIZE,
+                    MATCHUPS_SUMMARY_JSON)
+
+logger = logging.getLogger(__name__)
+
+_server = None
+
+
+def _event(name, seq, data):
+    return f"id: {seq}\nevent: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
+class _Client:
+    __slots__ = ('writer', 'matchup_id', 'queue', 'task')
+
+    def __init__(self, writer, matchup_id):
+        self.writer = writer
+        self.matchup_id = matchup_id
+        self.queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+        self.task = asyncio.current_task()
+
+
+class PushServer:
+    def __init__(self, host=PUSH_HOST, port=PUSH_PORT, state=None):
+        self.host = host
+        self.port = port
+        self.state = state     # {'week', 'seq', 'matchups'}; only touched on the loop thread
+        self.clients = set()
+        self.loop = None
+        self._ready = threading.Event()
+        self.error = None
+
+    # --- Thread side ---
+
+    def start(self):
+        """Start the loop thread and wait until the socket is bound (or binding failed)."""
+        threading.Thread(target=self._run, name="push-server", daemon=True).start()
+        self._ready.wait()
+        if self.error:
+            raise self.error
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            server = self.loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            # The bound port, in case port 0 asked for any free one
+            self.port = server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = e
+            self._ready.set()
+            return
+        self.loop.create_task(self._heartbeat())
+        self._ready.set()
+        self.loop.run_forever()
+
+    def update(self, week, seq, matchups, ops):
+        """Called from the tick thread; the loop does the rest."""
+        self.loop.call_soon_threadsafe(self._update, week, seq, matchups, ops)
+
+    # --- Loop side ---
+
+    def _update(self, week, seq, matchups, ops):
+        previous = self.state
+        self.state = {'week': week, 'seq': seq, 'matchups': matchups}
+        if previous is None or previous['week'] != week or ops is None:
+            self._send_all(lambda client: self._snapshot(client.matchup_id))
+            return
+
+        by_matchup = {}
+        for op in ops:
+            by_matchup.setdefault(op['path'][0], []).append(op)
+        for matchup_id, matchup_ops in by_matchup.items():
+            event = _event('matchup', seq, {
+                'week': week,
+                'seq': seq,
+                'matchup_id': matchup_id,
+                'summary': matchups.get(matchup_id),
+                'ops': matchup_ops,
+            })
+            self._send_all(lambda client: event if client.matchup_id in (None, matchup_id) else None)
+
+    def _snapshot(self, matchup_id=None):
+        matchups = self.state['matchups']
+        if matchup_id is not None:
+            matchups = {matchup_id: matchups[matchup_id]} if matchup_id in matchups else {}
+        return _event('snapshot', self.state['seq'],
+                      {'week': self.state['week'], 'seq': self.state['seq'], 'matchups': matchups})
+
+    def _send_all(self, make_event):
+        for client in list(self.clients):
+            event = make_event(client)
+            if event is not None:
+                self._send(client, event)
+
+    def _send(self, client, event):
+        try:
+            client.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._drop(client)
+
+    def _drop(self, client):
+        self.clients.discard(client)
+        client.task.cancel()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(PUSH_HEARTBEAT_SECONDS)
+            self._send_all(lambda client: b": ping\n\n")
+
+    async def _handle(self, reader, writer):
+        client = None
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+            request_line, *header_lines = request.decode('latin-1').split("\r\n")
+            method, target = request_line.split(" ")[:2]
+            headers = {}
+            for line in header_lines:
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+
+            url = urlsplit(target)
+            if method != "GET" or url.path != "/events":
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+
+            matchup_id = parse_qs(url.query).get('matchup', [None])[0]
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\n"
+                         b"Connection: keep-alive\r\n"
+                         b"Access-Control-Allow-Origin: *\r\n"
+                         b"\r\n"
+                         b"retry: 5000\n\n")
+
+            client = _Client(writer, matchup_id)
+            # A reconnecting client that already has the current seq doesn't need a snapshot
+            if self.state is not None and headers.get('last-event-id') != str(self.state['seq']):
+                self._send(client, self._snapshot(matchup_id))
+            self.clients.add(client)
+
+            while True:
+                writer.write(await client.queue.get())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if client is not None:
+                self.clients.discard(client)
+            writer.close()
+
+
+def _load_published_state():
+    """Start from the last published summary so early clients get a snapshot before the first tick."""
+    try:
+        with open(MATCHUPS_SUMMARY_JSON, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+        return {'week': summary['week'], 'seq': summary.get('seq', 0), 'matchups': summary['matchups']}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def start_push_server(host=PUSH_HOST, port=PUSH_PORT):
+    """Start the process-wide push server (once). Returns it."""
+    global _server
+    if _server is None:
+        server = PushServer(host, port, _load_published_state())
+        server.start()
+        _server = server
+        logger.info("Push server listening on %s:%s/events", host, server.port)
+    return _server
+
+
+def broadcast(week, seq, matchups, ops):
+    """
+    Push a published tick to connected clients. ops: the tick's delta ops ([] if
+    nothing changed), or None when clients must take a fresh snapshot.
+    No-op unless start_push_server() ran in this process.
+    """
+    if _server is not None:
+        _server.update(week, seq, matchups, ops)
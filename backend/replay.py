@@ -0,0 +1,300 @@
+# replay.py
+"""
+Record a real update tick's HTTP traffic and replay it offline.
+
+Every requests.Session (ours in espn_client, espn_api's and nba_api's) is routed
+through one transport adapter:
+  - record: requests go to the network and each response is saved under the fixture dir
+  - replay: responses come from the fixture, after a configurable delay, and nothing
+    touches the network; a request that wasn't recorded fails like a dropped connection
+
+A fixture holds the raw responses (ESPN lm-api-reads views such as mRoster, the
+NBA schedule / scoreboardv2 and live ScoreBoard payloads), the projection CSVs
+the tick read, and the EST time it was recorded at. Replays run with the clock
+frozen at that time (FANTASY_NOW) in a scratch projections dir
+(FANTASY_PROJECTIONS_DIR), so every replay starts cold and produces the same output.
+
+    python replay.py record ../fixtures/week5_day3
+    python replay.py replay ../fixtures/week5_day3 --latency-ms 80
+    python replay.py replay ../fixtures/week5_day3 --recorded-latency --out /tmp/replay_out
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import datetime
+import threading
+from zoneinfo import ZoneInfo
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# config must not be imported before prepare_environment(): PROJECTIONS_DIR is read at import time
+DEFAULT_PROJECTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "projections")
+
+# Inputs the tick reads from PROJECTIONS_DIR; everything else it fetches or generates
+INPUT_FILES = ("weighted_per36_projection.csv", "player_variance.csv")
+
+# Request headers that select a different response for the same URL
+KEY_HEADERS = ("x-fantasy-filter",)
+
+# Response headers that no longer apply once the body is stored decoded
+DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "set-cookie")
+
+_original_get_adapter = None
+
+
+def request_key(request):
+    """Stable key for a prepared request: method, URL with sorted query, and KEY_HEADERS."""
+    url = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    key = f"{request.method} {url.scheme}://{url.netloc}{url.path}?{query}"
+    for header in KEY_HEADERS:
+        if header in request.headers:
+            key += f" {header}={request.headers[header]}"
+    return key
+
+
+class FixtureStore:
+    """
+    Recorded responses on disk, keyed by request_key. Counts requests and their
+    wire bytes: the body size as received (gzip-compressed when the server sent it so).
+    """
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = str(fixture_dir)
+        self.index_path = os.path.join(self.fixture_dir, "requests.json")
+        self.entries = {}       # key -> [response entry, ...] in the order they were recorded
+        self.calls = {}         # key -> times served in this replay
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for entry in json.load(f):
+                    self.entries.setdefault(entry['key'], []).append(entry)
+
+    def add(self, key, response, elapsed, wire_bytes=None):
+        """wire_bytes: body size as received (before gzip decoding); defaults to the decoded size."""
+        body = response.content
+        wire_bytes = len(body) if wire_bytes is None else wire_bytes
+        with self._lock:
+            responses = self.entries.setdefault(key, [])
+            name = f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}_{len(responses)}.body"
+            responses.append({
+                'key': key,
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROP_HEADERS},
+                'body': name,
+                'wire_bytes': wire_bytes,
+                'elapsed': elapsed,
+            })
+            self.requests += 1
+            self.bytes += wire_bytes
+        os.makedirs(os.path.join(self.fixture_dir, "bodies"), exist_ok=True)
+        with open(os.path.join(self.fixture_dir, "bodies", name), 'wb') as f:
+            f.write(body)
+
+    def next(self, key):
+        """(entry, body) for the next call of key; repeats the last recording once exhausted."""
+        with self._lock:
+            responses = self.entries.get(key)
+            if not responses:
+                return None, None
+            n = self.calls.get(key, 0)
+            self.calls[key] = n + 1
+            entry = responses[min(n, len(responses) - 1)]
+        with open(os.path.join(self.fixture_dir, "bodies", entry['body']), 'rb') as f:
+            body = f.read()
+        with self._lock:
+            self.requests += 1
+            # Fixtures recorded before wire sizes were kept count the decoded body
+            self.bytes += entry.get('wire_bytes', len(body))
+        return entry, body
+
+    def save(self):
+        with self._lock:
+            entries = [entry for responses in self.entries.values() for entry in responses]
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=1)
+
+
+def _wire_bytes(response):
+    """Body bytes as they came over the wire (compressed if the server gzipped them)."""
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        length = response.headers.get('content-length')
+        return int(length) if length and length.isdigit() else len(response.content)
+
+
+def _recording_adapter(store):
+    from requests.adapters import HTTPAdapter
+
+    class RecordingAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            start = time.perf_counter()
+            response = super().send(request, **kwargs)
+            _ = response.content  # Read the body here so the recorded time includes it
+            store.add(request_key(request), response, time.perf_counter() - start, _wire_bytes(response))
+            return response
+
+    return RecordingAdapter()
+
+
+def _replay_adapter(store, latency, recorded_latency):
+    import requests
+    from requests.adapters import BaseAdapter
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    class ReplayAdapter(BaseAdapter):
+        def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+            key = request_key(request)
+            entry, body = store.next(key)
+            if entry is None:
+                raise requests.exceptions.ConnectionError(f"No recorded response for {key}", request=request)
+            time.sleep(entry['elapsed'] if recorded_latency else latency)
+
+            response = requests.models.Response()
+            response.status_code = entry['status']
+            response.reason = entry['reason']
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = body
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            return response
+
+        def close(self):
+            pass
+
+    return ReplayAdapter()
+
+
+def _route_all_sessions(adapter):
+    """Make every requests.Session use adapter, including sessions created before this call."""
+    global _original_get_adapter
+    import requests
+    if _original_get_adapter is None:
+        _original_get_adapter = requests.Session.get_adapter
+    requests.Session.get_adapter = lambda session, url: adapter
+
+
+def uninstall():
+    global _original_get_adapter
+    if _original_get_adapter is not None:
+        import requests
+        requests.Session.get_adapter = _original_get_adapter
+        _original_get_adapter = None
+
+
+def install_recorder(fixture_dir):
+    store = FixtureStore(fixture_dir)
+    _route_all_sessions(_recording_adapter(store))
+    return store
+
+
+def install_replay(fixture_dir, latency=0.0, recorded_latency=False):
+    """Serve every request from the fixture. latency: seconds per request (or the recorded time)."""
+    store = FixtureStore(fixture_dir)
+    _route_all_sessions(_replay_adapter(store, latency, recorded_latency))
+    return store
+
+
+def load_meta(fixture_dir):
+    with open(os.path.join(fixture_dir, "meta.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def prepare_environment(out_dir, inputs_dir, now=None, meta=None):
+    """
+    Point PROJECTIONS_DIR at out_dir (seeded with the input CSVs) and freeze the clock.
+    Must run before config is imported.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for name in INPUT_FILES:
+        source = os.path.join(inputs_dir, name)
+        if os.path.exists(source):
+            shutil.copy2(source, os.path.join(out_dir, name))
+    os.environ['FANTASY_PROJECTIONS_DIR'] = str(out_dir)
+    if now:
+        os.environ['FANTASY_NOW'] = now
+    for name in ('ESPN_LEAGUE_ID', 'ESPN_YEAR'):
+        if meta and meta.get(name):
+            os.environ.setdefault(name, str(meta[name]))
+
+
+def record(fixture_dir, out_dir=None):
+    """Run one cold tick against the live APIs and save everything it fetched."""
+    projections_dir = os.environ.get('FANTASY_PROJECTIONS_DIR', DEFAULT_PROJECTIONS_DIR)
+    inputs_dir = os.path.join(fixture_dir, "inputs")
+    os.makedirs(inputs_dir, exist_ok=True)
+    for name in INPUT_FILES:
+        source = os.path.join(projections_dir, name)
+        if os.path.exists(source):
+            shutil.copy2(source, os.path.join(inputs_dir, name))
+
+    # Start from an empty fixture; a re-record replaces the old one
+    shutil.rmtree(os.path.join(fixture_dir, "bodies"), ignore_errors=True)
+    if os.path.exists(os.path.join(fixture_dir, "requests.json")):
+        os.remove(os.path.join(fixture_dir, "requests.json"))
+
+    now = datetime.datetime.now(ZoneInfo('America/New_York')).isoformat()
+    # Cold scratch dir, so the tick fetches everything a fresh process would
+    prepare_environment(out_dir or tempfile.mkdtemp(prefix="record_"), inputs_dir, now)
+    store = install_recorder(fixture_dir)
+    try:
+        from weekly_totals import run_weekly_update
+        run_weekly_update()
+    finally:
+        uninstall()
+        store.save()
+
+    meta = {
+        'now': now,
+        'recorded_at': time.time(),
+        'requests': store.requests,
+        'bytes': store.bytes,
+        'ESPN_LEAGUE_ID': os.getenv('ESPN_LEAGUE_ID'),
+        'ESPN_YEAR': os.getenv('ESPN_YEAR'),
+    }
+    with open(os.path.join(fixture_dir, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=4)
+    return store
+
+
+def replay(fixture_dir, out_dir=None, latency=0.0, recorded_latency=False):
+    """Run one tick offline from the fixture. Returns the FixtureStore with request/byte counts."""
+    meta = load_meta(fixture_dir)
+    prepare_environment(out_dir or tempfile.mkdtemp(prefix="replay_"),
+                        os.path.join(fixture_dir, "inputs"), meta['now'], meta)
+    store = install_replay(fixture_dir, latency, recorded_latency)
+    try:
+        from weekly_totals import run_weekly_update
+        run_weekly_update()
+    finally:
+        uninstall()
+    return store
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Record or replay an update tick's HTTP traffic.")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("fixture_dir")
+    parser.add_argument("--out", help="projections dir for the run (default: a new temp dir)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay per replayed request")
+    parser.add_argument("--recorded-latency", action="store_true", help="delay each request by its recorded time")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.mode == "record":
+        store = record(args.fixture_dir, args.out)
+    else:
+        store = replay(args.fixture_dir, args.out, args.latency_ms / 1000, args.recorded_latency)
+    print(f"{args.mode}: {store.requests} requests, {store.bytes} bytes, "
+          f"{time.perf_counter() - start:.2f}s", file=sys.stderr)
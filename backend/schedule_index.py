@@ -0,0 +1,167 @@
+# schedule_index.py
+"""
+Season-long NBA schedule index.
+
+The whole regular-season schedule is fetched once (ScheduleLeagueV2), saved to
+SCHEDULE_INDEX_JSON and reloaded from disk on later runs. Lookups such as
+"which teams play in scoring period N" are plain dict reads with no network.
+
+The index is refreshed when it is older than SCHEDULE_MAX_AGE_HOURS, or, at most
+every SCHEDULE_STATUS_REFRESH_MINUTES, while a game on a past date is not yet
+marked final (so finalized-period checks see up-to-date game statuses).
+"""
+import os
+import json
+import time
+import logging
+import datetime
+import tempfile
+import threading
+from config import (SCHEDULE_INDEX_JSON, SCHEDULE_MAX_AGE_HOURS, SCHEDULE_STATUS_REFRESH_MINUTES,
+                    SEASON_YEAR)
+from nba_utils import get_scoring_period_date, now_est
+
+SEASON = f"{SEASON_YEAR-1}-{str(SEASON_YEAR)[-2:]}"  # Format: "2025-26"
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleIndex:
+    """Date -> games and team -> games lookups over one season's schedule."""
+
+    def __init__(self, games, fetched_at):
+        # games: list of {'game_id', 'date', 'tipoff', 'home', 'away', 'status'}
+        self.games = games
+        self.fetched_at = fetched_at
+
+        self._games_by_date = {}
+        self._teams_by_date = {}
+        self._games_by_team = {}
+        for game in games:
+            self._games_by_date.setdefault(game['date'], []).append(game)
+            teams = self._teams_by_date.setdefault(game['date'], set())
+            for tricode in (game['home'], game['away']):
+                if tricode:
+                    teams.add(tricode)
+                    self._games_by_team.setdefault(tricode, []).append(game)
+
+        self._teams_by_date = {date: frozenset(teams) for date, teams in self._teams_by_date.items()}
+        for team_games in self._games_by_team.values():
+            team_games.sort(key=lambda g: (g['date'], g['tipoff'] or ''))
+
+        dates = sorted(self._games_by_date)
+        self.first_date = dates[0] if dates else None
+        self.last_date = dates[-1] if dates else None
+
+    def covers(self, date):
+        """True if the date falls inside the season (off days included)."""
+        date_str = str(date)
+        return self.first_date is not None and self.first_date <= date_str <= self.last_date
+
+    def games_on(self, date):
+        return self._games_by_date.get(str(date), [])
+
+    def teams_playing_on(self, date):
+        return self._teams_by_date.get(str(date), frozenset())
+
+    def teams_playing(self, scoring_period):
+        """Set of team tricodes with a game in the scoring period."""
+        return self.teams_playing_on(get_scoring_period_date(scoring_period))
+
+    def team_games(self, tricode):
+        """All of a team's games in date order, with tip-off times (UTC ISO strings)."""
+        return self._games_by_team.get(tricode, [])
+
+    def needs_status_refresh(self, today, lookback_days=3):
+        """
+        True if a game in the last few days before today is still not final in
+        this snapshot. Older non-final games (postponements) are ignored.
+        """
+        today_str = str(today)
+        since_str = str(today - datetime.timedelta(days=lookback_days))
+        return any(since_str <= game['date'] < today_str and game['status'] != 3 for game in self.games)
+
+    def to_dict(self):
+        return {'fetched_at': self.fetched_at, 'games': self.games}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['games'], data['fetched_at'])
+
+
+def fetch_schedule_index():
+    """Download the full season schedule from the NBA stats API."""
+    from nba_api.stats.endpoints import scheduleleaguev2
+
+    data = scheduleleaguev2.ScheduleLeagueV2(season=SEASON, league_id='00').get_dict()
+    games = []
+    for game_date in data.get('leagueSchedule', {}).get('gameDates', []):
+        for g in game_date.get('games', []):
+            date_est = g.get('gameDateEst') or ''
+            if date_est:
+                date = date_est[:10]
+            else:
+                # gameDate looks like "10/21/2025 00:00:00"
+                date = datetime.datetime.strptime(game_date['gameDate'][:10], '%m/%d/%Y').date().isoformat()
+            games.append({
+                'game_id': g.get('gameId'),
+                'date': date,
+                'tipoff': g.get('gameDateTimeUTC'),
+                'home': g.get('homeTeam', {}).get('teamTricode') or None,
+                'away': g.get('awayTeam', {}).get('teamTricode') or None,
+                'status': int(g.get('gameStatus', 0) or 0),
+            })
+    return ScheduleIndex(games, time.time())
+
+
+def load_schedule_index(path=SCHEDULE_INDEX_JSON):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return ScheduleIndex.from_dict(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def save_schedule_index(index, path=SCHEDULE_INDEX_JSON):
+    path = str(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+_index = None
+_last_attempt = 0.0
+_index_lock = threading.Lock()
+
+
+def _is_due(index):
+    age = time.time() - index.fetched_at
+    if age > SCHEDULE_MAX_AGE_HOURS * 3600:
+        return True
+    today = now_est().date()
+    return age > SCHEDULE_STATUS_REFRESH_MINUTES * 60 and index.needs_status_refresh(today)
+
+
+def get_schedule_index():
+    """
+    Return the process-wide schedule index, loading it from disk or the API as needed.
+    Returns None only if there is no saved index and the API cannot be reached.
+    """
+    global _index, _last_attempt
+    with _index_lock:
+        if _index is None:
+            _index = load_schedule_index()
+
+        # Back off after an attempt so a failing API isn't hit on every lookup
+        retry_ok = time.time() - _last_attempt > SCHEDULE_STATUS_REFRESH_MINUTES * 60
+        if retry_ok and (_index is None or _is_due(_index)):
+            _last_attempt = time.time()
+            try:
+                _index = fetch_schedule_index()
+                save_schedule_index(_index)
+            except Exception as e:
+                # Keep serving the saved copy if the refresh fails
+                logger.error("Could not refresh season schedule: %s", e)
+        return _index
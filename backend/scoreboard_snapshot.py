@@ -0,0 +1,108 @@
+# scoreboard_snapshot.py
+"""
+One live NBA scoreboard snapshot shared by every matchup and period in a tick.
+
+The live ScoreBoard endpoint returns the same payload no matter which matchup
+asks, so it is fetched once and reused until it is SCOREBOARD_TTL_SECONDS old.
+Snapshots are immutable, which keeps every consumer on the same game clock.
+"""
+import time
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from config import SCOREBOARD_TTL_SECONDS
+from nba_utils import _clock_to_minutes
+
+
+@dataclass(frozen=True)
+class GameState:
+    game_id: str
+    home: str
+    away: str
+    status: int          # 1 = scheduled, 2 = in progress, 3 = final
+    status_text: str
+    period: int
+    clock_raw: str
+    minutes_left: float
+
+    @property
+    def matchup(self):
+        return f"{self.away} @ {self.home}"
+
+
+class ScoreboardSnapshot:
+    """Immutable view of today's games and a team tricode -> GameState map."""
+
+    def __init__(self, games, fetched_at):
+        self.games = tuple(games)
+        self.fetched_at = fetched_at
+        by_team = {}
+        for game in self.games:
+            if game.away:
+                by_team[game.away] = game
+            if game.home:
+                by_team[game.home] = game
+        self.by_team = MappingProxyType(by_team)
+        self.minutes_left_by_team = MappingProxyType(
+            {tricode: game.minutes_left for tricode, game in by_team.items()}
+        )
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def in_scoreboard(self, tricode):
+        return tricode in self.by_team
+
+    def minutes_left(self, tricode):
+        game = self.by_team.get(tricode)
+        return game.minutes_left if game else 0.0
+
+
+def _minutes_left(g, period_len):
+    status = int(g.get("gameStatus", 0))
+    current_period = int(g.get("period", 0) or 0)
+    regulation_periods = int(g.get("regulationPeriods", 4) or 4)
+
+    if status == 3:
+        return 0.0
+    if status == 1:
+        return regulation_periods * period_len
+
+    rem_this_period = _clock_to_minutes(g.get("gameClock"))
+    if current_period <= regulation_periods:
+        full_periods_left = max(0, regulation_periods - current_period)
+        return rem_this_period + full_periods_left * period_len
+    return rem_this_period
+
+
+def fetch_scoreboard_snapshot(period_len=12):
+    """Fetch the live scoreboard once and freeze it into a snapshot."""
+    from nba_api.live.nba.endpoints import scoreboard
+
+    data = scoreboard.ScoreBoard().get_dict()
+    games = []
+    for g in data.get("scoreboard", {}).get("games", []):
+        games.append(GameState(
+            game_id=g.get("gameId"),
+            home=g.get("homeTeam", {}).get("teamTricode", ""),
+            away=g.get("awayTeam", {}).get("teamTricode", ""),
+            status=int(g.get("gameStatus", 0)),
+            status_text=g.get("gameStatusText", ""),
+            period=int(g.get("period", 0) or 0),
+            clock_raw=g.get("gameClock"),
+            minutes_left=round(_minutes_left(g, period_len), 2),
+        ))
+    return ScoreboardSnapshot(games, time.time())
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_scoreboard_snapshot(max_age=SCOREBOARD_TTL_SECONDS):
+    """Return the shared snapshot, refetching only when it is older than max_age seconds."""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.age() > max_age:
+            _snapshot = fetch_scoreboard_snapshot()
+        return _snapshot
@@ -0,0 +1,125 @@
+# test_day_view.py
+"""Golden output of index.php's generatePlayerTablesHTML, worked out from the PHP by hand."""
+import pytest
+from day_view import php_number_format, php_echo, htmlspecialchars, abbreviate_name, render_player_tables
+
+
+@pytest.mark.parametrize('value, expected', [
+    (2.25, "2.3"),
+    (2.35, "2.4"),
+    (-2.25, "-2.3"),
+    (-0.04, "0.0"),
+    (0, "0.0"),
+    (1234.56, "1,234.6"),
+    (1234567.0, "1,234,567.0"),
+    (-1234.5, "-1,234.5"),
+])
+def test_php_number_format(value, expected):
+    assert php_number_format(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    (12.0, "12"),
+    (12.5, "12.5"),
+    (12, "12"),
+    (0.1 + 0.2, "0.3"),
+    (-0.0, "-0"),
+    (1e15, "1.0E+15"),
+    (1.5e-5, "1.5E-5"),
+    (0.0001, "0.0001"),
+])
+def test_php_echo(value, expected):
+    assert php_echo(value) == expected
+
+
+def test_htmlspecialchars():
+    assert htmlspecialchars('D\'Angelo "DLo" Russell & Co <b>') == \
+        "D&#039;Angelo &quot;DLo&quot; Russell &amp; Co &lt;b&gt;"
+
+
+@pytest.mark.parametrize('name, expected', [
+    ("Giannis Antetokounmpo", "G. Antetokounmpo"),
+    ("Shai Gilgeous-Alexander", "S. Gilgeous-Alexander"),
+    ("Karl-Anthony Towns", "Karl-Anthony Towns"),        # exactly 18 bytes
+    ("Bogdan Bogdanović", "Bogdan Bogdanović"),         # 18 bytes, 17 characters
+    ("Nikola Jokić Junior", "N. Jokić Junior"),         # 20 bytes, 19 characters
+    ("Wembanyamawembanyama", "Wembanyamawembanyama"),    # one word is never abbreviated
+])
+def test_abbreviate_name(name, expected):
+    assert abbreviate_name(name) == expected
+
+
+DAY = {
+    'players': [
+        {'name': "Stephen Curry", 'position': "PG", 'points': 12.0, 'static_projection': 41.25,
+         'live_projection': 38.75, 'injury_status': None},
+        {'name': "Giannis Antetokounmpo", 'position': "UTL", 'points': 0.0, 'static_projection': 50.05,
+         'live_projection': 50.05, 'injury_status': "DAY-TO-DAY"},
+        {'name': "Off Day", 'position': "C", 'points': 0.0, 'static_projection': 0.0,
+         'live_projection': 0.0, 'injury_status': None},
+    ],
+    'roster': {
+        'PG': "Stephen Curry", 'SG': "Empty Slot", 'SF': "Empty Slot", 'PF': "Empty Slot", 'C': "Off Day",
+        'G': "Empty Slot", 'F': "Empty Slot", 'UTL': ["Giannis Antetokounmpo", "Empty Slot", "Empty Slot"],
+        'BENCH': [{'name': "A & B", 'injury_status': "QUESTIONABLE"}],
+        'IR': [{'name': "Hurt Guy", 'injury_status': "OUT"}],
+    },
+}
+
+# Only team1's (right-hand) table has this header cell
+TEAM1_HEADER = '<th style="width: 35%;">Player</th>'
+
+EMPTY_ROW = ('<tr><td><span class="position-badge">{pos}</span></td><td class="player-name">'
+             '<span class="player-text">Empty Slot</span></td><td></td><td class="points-col"></td></tr>')
+EMPTY_ROW_MIRRORED = ('<tr><td class="points-col"></td><td></td><td class="player-name">'
+                      '<span class="player-text">Empty Slot</span></td>'
+                      '<td><span class="position-badge">{pos}</span></td></tr>')
+
+
+def test_team2_rows():
+    html = render_player_tables("Home", None, "Away", DAY)
+    team2 = html[:html.index(TEAM1_HEADER)]
+
+    assert ('<tr><td><span class="position-badge">PG</span></td><td class="player-name">'
+            '<span class="player-text">Stephen Curry</span></td>'
+            '<td>38.8 <span class="static-proj">(41.3)</span></td><td class="points-col">12</td></tr>'
+            + EMPTY_ROW.format(pos="SG")) in team2
+    assert ('<tr><td><span class="position-badge">C</span></td><td class="player-name">'
+            '<span class="player-text">Off Day</span></td><td>0.0</td><td class="points-col">0</td></tr>') in team2
+    assert ('<tr><td><span class="position-badge">UTL</span></td><td class="player-name">'
+            '<span class="player-text">G. Antetokounmpo</span><span class="injury-tag dtd">DTD</span></td>'
+            '<td>50.1</td><td class="points-col">-</td></tr>') in team2
+    assert ('<tr class="bench-row"><td><span class="position-badge bench-badge">BN</span></td>'
+            '<td class="player-name"><span class="player-text">A &amp; B</span>'
+            '<span class="injury-tag questionable">Q</span></td><td></td><td></td></tr>'
+            '<tr class="ir-row"><td><span class="position-badge ir-badge">IR</span></td>'
+            '<td class="player-name"><span class="player-text">Hurt Guy</span>'
+            '<span class="injury-tag out">O</span></td><td></td><td></td></tr>') in team2
+    # 38.75 live (started) + 50.05 static (scheduled); points echo as a PHP float
+    assert ('<td><strong>Day Total</strong></td>\n                <td></td>\n'
+            '                <td><strong>88.8</strong></td>\n                <td><strong>12</strong></td>') in team2
+
+
+def test_team1_rows_are_mirrored():
+    html = render_player_tables("Home", DAY, "Away", None)
+    team1 = html[html.index(TEAM1_HEADER):]
+
+    assert ('<tr><td class="points-col">12</td><td>38.8 <span class="static-proj">(41.3)</span></td>'
+            '<td class="player-name"><span class="player-text">Stephen Curry</span></td>'
+            '<td><span class="position-badge">PG</span></td></tr>'
+            + EMPTY_ROW_MIRRORED.format(pos="SG")) in team1
+    assert ('<tr class="ir-row"><td></td><td></td><td class="player-name">'
+            '<span class="player-text">Hurt Guy</span><span class="injury-tag out">O</span></td>'
+            '<td><span class="position-badge ir-badge">IR</span></td></tr>') in team1
+    assert ('<td><strong>12</strong></td>\n                <td><strong>88.8</strong></td>\n'
+            '                <td></td>\n                <td><strong>Day Total</strong></td>') in team1
+
+
+def test_no_data_for_day():
+    html = render_player_tables("Home & Co", None, "Away", None)
+
+    assert html.count('<tr><td colspan="4" class="text-center">No data for this day</td></tr>') == 2
+    assert '<h4>Home &amp; Co</h4>' in html
+    assert html.count('<strong>0.0</strong>') == 2
+    assert html.count('<strong>0</strong>') == 2
+    assert html.endswith('</div>') and html.count('<table') == 2
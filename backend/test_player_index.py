@@ -0,0 +1,18 @@
+# test_player_index.py
+from player_index import PlayerIndex
+
+
+def test_traded_player_resolves_to_latest_team_by_id_and_name():
+    before_trade = [{'name': "Dennis Schröder", 'proTeamId': 1, 'playerId': 7}]
+    after_trade = [{'name': "Dennis Schroder", 'proTeamId': 2, 'playerId': 7}]
+    index = PlayerIndex.from_rosters([before_trade, after_trade])
+
+    assert index.tricode_for(player_id=7) == "BOS"
+    assert index.tricode_for(name="Dennis Schröder") == "BOS"
+    assert index.tricode_for(name="Dennis J. Schroder") == "BOS"
+
+
+def test_unknown_player():
+    index = PlayerIndex.from_rosters([[{'name': "Trae Young", 'proTeamId': 1, 'playerId': 3}]])
+    assert index.tricode_for(player_id=99, name="Nobody Here") is None
+    assert index.tricode_for(name=" ") is None
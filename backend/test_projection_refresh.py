@@ -0,0 +1,20 @@
+# test_projection_refresh.py
+import os
+import pytest
+import projection_refresh
+
+
+def test_save_state_creates_missing_dir(tmp_path):
+    path = tmp_path / "fresh" / "projection_state.json"
+    projection_refresh.save_state({'refreshed_at': 1.0}, path)
+    assert projection_refresh.load_state(path) == {'refreshed_at': 1.0}
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path):
+    path = tmp_path / "projection_state.json"
+    projection_refresh.save_state({'refreshed_at': 1.0}, path)
+    with pytest.raises(TypeError):
+        projection_refresh.save_state({'refreshed_at': object()}, path)
+
+    assert os.listdir(tmp_path) == ["projection_state.json"]
+    assert projection_refresh.load_state(path) == {'refreshed_at': 1.0}
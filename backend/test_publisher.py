@@ -0,0 +1,84 @@
+# test_publisher.py
+"""Run from backend/: python -m pytest -q"""
+import json
+import publisher
+import deltas
+
+
+def _matchups():
+    day = {
+        'date': "2025-10-27",
+        'players': [
+            {'name': "Tyrese Maxey", 'position': "PG", 'points': 66.0, 'static_projection': 52.9,
+             'live_projection': 66.0, 'injury_status': None},
+        ],
+    }
+    team = {'name': "Team", 'id': 1, 'owner': "Owner", 'record': "1-0", 'days': {}}
+    matchup = {
+        'team1': dict(team, days={53: day, 54: day}),
+        'team2': dict(team, id=2, days={53: day, 54: day}),
+        'totals': {'team1': {'points': 66.0}, 'team2': {'points': 66.0}},
+        # Int period keys, as calculate_weekly_totals built them before the state file round trip
+        'periods': {53: {'fingerprint': "abc", 'final': True}},
+    }
+    return {'matchup_0': matchup}
+
+
+def _use_tmp_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(publisher, 'MATCHUPS_DIR', tmp_path)
+    monkeypatch.setattr(publisher, 'MATCHUPS_SUMMARY_JSON', tmp_path / "summary.json")
+    monkeypatch.setattr(publisher, 'MATCHUPS_MANIFEST_JSON', tmp_path / "manifest.json")
+    monkeypatch.setattr(publisher, 'WEEKLY_MATCHUPS_JSON', tmp_path / "weekly_matchups.json")
+    monkeypatch.setattr(deltas, 'MATCHUPS_DIR', tmp_path)
+
+
+def test_unchanged_matchups_publish_no_delta(monkeypatch, tmp_path):
+    _use_tmp_dir(monkeypatch, tmp_path)
+    first = publisher.publish_matchups(5, _matchups())
+    log_after_first = deltas.load_deltas(5)
+
+    for _ in range(2):
+        manifest = publisher.publish_matchups(5, _matchups())
+
+    assert manifest['seq'] == first['seq']
+    assert manifest['version'] == first['version']
+    assert manifest['stats'] == {'ticks': 3, 'ticks_changed': 1, 'change_rate': 0.333}
+    assert deltas.load_deltas(5) == log_after_first
+    with open(tmp_path / "summary.json", 'r', encoding='utf-8') as f:
+        assert json.load(f)['seq'] == first['seq']
+
+
+def test_changed_day_is_one_set_op(monkeypatch, tmp_path):
+    _use_tmp_dir(monkeypatch, tmp_path)
+    publisher.publish_matchups(5, _matchups())
+    matchups = _matchups()
+    matchups['matchup_0']['team1']['days'][54] = dict(matchups['matchup_0']['team1']['days'][54], date="2025-10-28")
+    manifest = publisher.publish_matchups(5, matchups)
+
+    entry = deltas.load_deltas(5)[-1]
+    assert entry['seq'] == manifest['seq'] == 1
+    assert entry['ops'] == [{'op': 'set', 'path': ['matchup_0', 'team1', 'days', '54', 'date'],
+                             'value': "2025-10-28"}]
+
+
+def test_stale_shards_are_removed(monkeypatch, tmp_path):
+    _use_tmp_dir(monkeypatch, tmp_path)
+    matchups = _matchups()
+    matchups['matchup_1'] = _matchups()['matchup_0']
+    publisher.publish_matchups(5, matchups)
+    assert (tmp_path / "week_5" / "matchup_1" / "54.html").exists()
+
+    matchups = _matchups()
+    del matchups['matchup_0']['team1']['days'][54]
+    del matchups['matchup_0']['team2']['days'][54]
+    manifest = publisher.publish_matchups(5, matchups)
+
+    assert not (tmp_path / "week_5" / "matchup_1").exists()
+    assert not (tmp_path / "week_5" / "matchup_0" / "54.json").exists()
+    assert sorted(p.name for p in (tmp_path / "week_5" / "matchup_0").iterdir()) == ["53.html", "53.json"]
+    assert (tmp_path / "week_5" / "deltas.jsonl").exists()
+    assert all((tmp_path / name).exists() for name in manifest['files'])
+
+    # A new week drops the old week's shards but keeps its delta log
+    publisher.publish_matchups(6, _matchups())
+    assert sorted(p.name for p in (tmp_path / "week_5").iterdir()) == ["deltas.jsonl"]
@@ -0,0 +1,60 @@
+# test_push_server.py
+import json
+import socket
+from push_server import PushServer
+
+SUMMARY = {
+    'matchup_0': {'totals': {'team1': {'points': 10.0}, 'team2': {'points': 8.0}}},
+    'matchup_1': {'totals': {'team1': {'points': 3.0}, 'team2': {'points': 4.0}}},
+}
+
+
+def _read_event(stream):
+    """Next SSE event as (name, id, data), skipping the retry line and heartbeats."""
+    fields = {}
+    while True:
+        line = stream.readline().decode('utf-8').rstrip("\n")
+        if line:
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        elif 'event' in fields:
+            return fields['event'], fields['id'], json.loads(fields['data'])
+        else:
+            fields = {}
+
+
+def _connect(port, query=""):
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(f"GET /events{query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    stream = sock.makefile('rb')
+    assert stream.readline().startswith(b"HTTP/1.1 200")
+    while stream.readline() != b"\r\n":
+        pass
+    return sock, stream
+
+
+def test_snapshot_then_delta():
+    server = PushServer("127.0.0.1", 0, {'week': 5, 'seq': 3, 'matchups': SUMMARY})
+    server.start()
+    sock, stream = _connect(server.port)
+    filtered_sock, filtered = _connect(server.port, "?matchup=matchup_1")
+    try:
+        assert _read_event(stream) == ('snapshot', '3', {'week': 5, 'seq': 3, 'matchups': SUMMARY})
+        assert _read_event(filtered)[2]['matchups'] == {'matchup_1': SUMMARY['matchup_1']}
+
+        updated = dict(SUMMARY, matchup_0={'totals': {'team1': {'points': 12.0}, 'team2': {'points': 8.0}}})
+        ops = [{'op': 'set', 'path': ['matchup_0', 'totals', 'team1', 'points'], 'value': 12.0}]
+        server.update(5, 4, updated, ops)
+        server.update(5, 5, dict(updated, matchup_1={'totals': {'team1': {'points': 3.0}, 'team2': {'points': 9.0}}}),
+                      [{'op': 'set', 'path': ['matchup_1', 'totals', 'team2', 'points'], 'value': 9.0}])
+
+        name, event_id, data = _read_event(stream)
+        assert (name, event_id) == ('matchup', '4')
+        assert data == {'week': 5, 'seq': 4, 'matchup_id': 'matchup_0',
+                        'summary': updated['matchup_0'], 'ops': ops}
+        # A client watching one matchup only gets that matchup's events
+        name, event_id, data = _read_event(filtered)
+        assert (name, event_id, data['matchup_id']) == ('matchup', '5', 'matchup_1')
+    finally:
+        sock.close()
+        filtered_sock.close()
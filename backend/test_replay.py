@@ -0,0 +1,85 @@
+# test_replay.py
+import gzip
+import json
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import pytest
+import requests
+import replay
+
+BODY = json.dumps({'teams': [{'id': i, 'roster': {'entries': []}} for i in range(50)]}).encode('utf-8')
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        payload = gzip.compress(BODY + self.headers.get('x-fantasy-filter', '').encode('utf-8'))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = HTTPServer(("127.0.0.1", 0), _GzipHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/league"
+    server.shutdown()
+
+
+def test_record_then_replay(tmp_path, http_server):
+    session = requests.Session()
+    store = replay.install_recorder(tmp_path)
+    try:
+        recorded = session.get(http_server, params={'view': 'mRoster', 'scoringPeriodId': 3})
+        session.get(http_server, params={'view': 'mRoster'}, headers={'x-fantasy-filter': '{"a":1}'})
+    finally:
+        replay.uninstall()
+        store.save()
+    wire = len(gzip.compress(BODY))
+    assert recorded.content == BODY
+    # Bytes are counted as sent over the wire, not after gzip decoding
+    assert store.requests == 2
+    assert wire <= store.bytes / 2 < len(BODY)
+
+    store = replay.install_replay(tmp_path)
+    try:
+        # Same request with the query in another order
+        replayed = session.get(f"{http_server}?scoringPeriodId=3&view=mRoster")
+        filtered = session.get(http_server, params={'view': 'mRoster'}, headers={'x-fantasy-filter': '{"a":1}'})
+        with pytest.raises(requests.ConnectionError):
+            # Recorded only with the filter header, which selects a different response
+            session.get(http_server, params={'view': 'mRoster'})
+    finally:
+        replay.uninstall()
+
+    assert replayed.status_code == 200 and replayed.json() == json.loads(BODY)
+    assert filtered.content == BODY + b'{"a":1}'
+    assert 'content-encoding' not in replayed.headers
+    assert store.requests == 2
+    assert store.bytes == sum(entry['wire_bytes'] for entries in store.entries.values() for entry in entries)
+
+
+def test_replay_repeats_last_recording(tmp_path):
+    store = replay.FixtureStore(tmp_path)
+    (tmp_path / "bodies").mkdir()
+    for i, text in enumerate((b"first", b"second")):
+        (tmp_path / "bodies" / f"b{i}.body").write_bytes(text)
+        store.entries.setdefault("GET http://espn.test/x?", []).append(
+            {'key': "GET http://espn.test/x?", 'status': 200, 'reason': "OK", 'headers': {},
+             'body': f"b{i}.body", 'elapsed': 0.0})
+    store.save()
+
+    store = replay.install_replay(tmp_path)
+    try:
+        bodies = [requests.get("http://espn.test/x").content for _ in range(3)]
+    finally:
+        replay.uninstall()
+    assert bodies == [b"first", b"second", b"second"]
+    # No wire size recorded (older fixtures): the decoded body counts
+    assert (store.requests, store.bytes) == (3, 5 + 6 + 6)
@@ -0,0 +1,185 @@
+# test_weekly_totals.py
+"""Incremental updates: when a period is reused, and that reuse doesn't change the totals."""
+import json
+import datetime
+from types import SimpleNamespace
+import pytest
+import weekly_totals
+from matchup_rows import PlayerSlot, MatchupRow, MatchupTable
+
+WEEK = 3
+PERIODS = weekly_totals.get_scoring_periods_in_week(WEEK)   # 14..20
+TEAM1, TEAM2 = 1, 2
+
+
+def _roster(team_id, period):
+    base = 10 * team_id + period
+    return [
+        {'name': f"Guard {team_id}", 'playerId': 100 * team_id, 'lineupSlotId': 0, 'proTeamId': 1,
+         'points': float(base)},
+        {'name': f"Wing {team_id}", 'playerId': 100 * team_id + 1, 'lineupSlotId': 7, 'proTeamId': 2,
+         'points': float(base) / 2},
+        {'name': f"Sub {team_id}", 'playerId': 100 * team_id + 2, 'lineupSlotId': 12, 'proTeamId': 3,
+         'points': 5.0},
+        {'name': f"Hurt {team_id}", 'playerId': 100 * team_id + 3, 'lineupSlotId': 13, 'proTeamId': 4,
+         'points': 0.0},
+    ]
+
+
+def _slot(player, projection, injury=None):
+    return PlayerSlot(name=player['name'], player_id=player['playerId'], lineup_slot_id=player['lineupSlotId'],
+                      points=player['points'], projection=projection, live_projection=player['points'] * 1.5,
+                      injury=injury)
+
+
+def _matchup(box_id, period, snapshot=None):
+    team1, team2 = _roster(TEAM1, period), _roster(TEAM2, period)
+    return MatchupTable("Team 1", "Team 2", [
+        MatchupRow('PG', team2=_slot(team2[0], 30.0), team1=_slot(team1[0], 32.5)),
+        MatchupRow('UTL', team2=_slot(team2[1], 20.0), team1=_slot(team1[1], 21.0)),
+        MatchupRow('UTL', team2=PlayerSlot(), team1=PlayerSlot()),
+        MatchupRow('BENCH', team2=_slot(team2[2], 15.0), team1=_slot(team1[2], 14.0, "DAY_TO_DAY")),
+        MatchupRow('IR', team2=_slot(team2[3], 0.0, "OUT"), team1=_slot(team1[3], 0.0, "OUT")),
+    ])
+
+
+@pytest.fixture
+def league(monkeypatch):
+    """Fake ESPN/NBA inputs for one matchup; returns the mutable pieces tests change."""
+    state = SimpleNamespace(current_period=17, finalized={14, 15, 16}, teams_playing={'ATL', 'BOS'},
+                            projection_hash="v1", injuries={}, computed=[])
+    owners = [{'firstName': "Alex", 'lastName': "Owner"}]
+    box = SimpleNamespace(
+        home_team=SimpleNamespace(team_id=TEAM1, team_name="Team 1", owners=owners, wins=2, losses=1, ties=0),
+        away_team=SimpleNamespace(team_id=TEAM2, team_name="Team 2", owners=owners, wins=1, losses=2, ties=0),
+    )
+
+    def league_teams():
+        return [SimpleNamespace(team_id=team_id, roster=[
+            SimpleNamespace(name=name, injuryStatus=status) for name, status in state.injuries.items()])
+            for team_id in (TEAM1, TEAM2)]
+
+    def calculate_period_results(*args):
+        state.computed.append(args[1])
+        return real_calculate_period_results(*args)
+
+    real_calculate_period_results = weekly_totals.calculate_period_results
+    monkeypatch.setattr(weekly_totals, 'calculate_period_results', calculate_period_results)
+    monkeypatch.setattr(weekly_totals, 'get_league', lambda: SimpleNamespace(teams=league_teams()))
+    monkeypatch.setattr(weekly_totals, 'get_box_scores', lambda: [box])
+    monkeypatch.setattr(weekly_totals, 'load_rosters_for_periods', lambda periods, max_workers=1: None)
+    monkeypatch.setattr(weekly_totals, 'get_roster_for_scoring_period', _roster)
+    monkeypatch.setattr(weekly_totals, 'add_live_projections_to_matchup', _matchup)
+    monkeypatch.setattr(weekly_totals, 'get_current_scoring_period', lambda: state.current_period)
+    monkeypatch.setattr(weekly_totals, 'is_period_finalized', lambda period: period in state.finalized)
+    monkeypatch.setattr(weekly_totals, 'get_teams_playing_for_period', lambda period: set(state.teams_playing))
+    monkeypatch.setattr(weekly_totals, 'get_projection_store',
+                        lambda: SimpleNamespace(content_hash=state.projection_hash))
+    monkeypatch.setattr(weekly_totals, 'get_scoring_period_date',
+                        lambda period: datetime.date(2025, 10, 20) + datetime.timedelta(days=period))
+    return state
+
+
+def _run(previous=None):
+    result = weekly_totals.calculate_weekly_totals(0, WEEK, snapshot=object(), previous=previous)
+    # What the next tick reads back from weekly_matchups.json
+    return json.loads(json.dumps(result))
+
+
+def test_can_reuse_period():
+    previous = {'fingerprint': "abc", 'final': True}
+    assert not weekly_totals.can_reuse_period(17, 17, previous, "abc")
+    assert weekly_totals.can_reuse_period(16, 17, previous, "changed")
+    assert not weekly_totals.can_reuse_period(16, 17, {'fingerprint': "abc", 'final': False}, "abc")
+    assert weekly_totals.can_reuse_period(18, 17, previous, "abc")
+    assert not weekly_totals.can_reuse_period(18, 17, previous, "changed")
+
+
+def test_calculate_period_results(league):
+    team1_day, team2_day = weekly_totals.calculate_period_results(0, 14, TEAM1, TEAM2, None)
+
+    assert team1_day['date'] == "2025-11-03"
+    assert team1_day['roster'] == {
+        'PG': "Guard 1", 'SG': "Empty Slot", 'SF': "Empty Slot", 'PF': "Empty Slot", 'C': "Empty Slot",
+        'G': "Empty Slot", 'F': "Empty Slot", 'UTL': ["Wing 1", "Empty Slot", "Empty Slot"],
+        'BENCH': [{'name': "Sub 1", 'injury_status': "DAY-TO-DAY"}],
+        'IR': [{'name': "Hurt 1", 'injury_status': "OUT"}],
+    }
+    assert [player['name'] for player in team2_day['players']] == ["Guard 2", "Wing 2", "Empty Slot"]
+    # Bench and IR points don't count; started games count live, others static
+    assert team1_day['totals'] == {'points': 24.0 + 12.0, 'live_projection': 36.0 + 18.0}
+    assert team2_day['totals'] == {'points': 34.0 + 17.0, 'live_projection': 51.0 + 25.5}
+
+
+def test_current_period_is_always_recomputed(league):
+    previous = _run()
+    league.computed.clear()
+    _run(previous)
+    assert league.computed == [17]
+
+
+def test_past_period_is_reused_only_when_final(league):
+    previous = _run()
+    league.finalized = {14, 15}
+    previous = _run(previous)
+    league.computed.clear()
+    _run(previous)
+    assert league.computed == [16, 17]
+
+
+@pytest.mark.parametrize('change', ['lineup', 'injury', 'teams_playing', 'projections'])
+def test_future_period_recomputed_when_inputs_change(league, monkeypatch, change):
+    previous = _run()
+    league.computed.clear()
+    if change == 'lineup':
+        def moved(team_id, period):
+            roster = _roster(team_id, period)
+            if period == 19:
+                roster[0]['lineupSlotId'] = 12
+            return roster
+        monkeypatch.setattr(weekly_totals, 'get_roster_for_scoring_period', moved)
+    elif change == 'injury':
+        league.injuries = {"Guard 1": "OUT"}
+    elif change == 'teams_playing':
+        league.teams_playing = {'ATL'}
+    else:
+        league.projection_hash = "v2"
+    _run(previous)
+
+    # Injuries, teams playing and projections apply to every period, a lineup change only to 19
+    expected = [17, 19] if change == 'lineup' else [17, 18, 19, 20]
+    assert league.computed == expected
+
+
+def test_reused_totals_equal_full_recompute(league):
+    full = _run()
+    league.computed.clear()
+    incremental = _run(full)
+
+    assert league.computed == [17]
+    assert list(incremental['team1']['days']) == [str(period) for period in PERIODS]
+    assert incremental['team1']['days'] == full['team1']['days']
+    assert incremental['team2']['days'] == full['team2']['days']
+    assert incremental['totals'] == full['totals']
+    assert incremental['periods'] == full['periods']
+
+
+def test_unreadable_variance_falls_back_to_normal_model(league, monkeypatch):
+    def unreadable():
+        raise ValueError("could not convert string to float: 'n/a'")
+    monkeypatch.setattr(weekly_totals, 'get_player_variance', unreadable)
+    result = _run()
+
+    assert 'simulation' not in result
+    totals = result['totals']
+    expected, _ = weekly_totals.win_probability(totals['team1']['points'], totals['team1']['live_projection'],
+                                                totals['team2']['points'], totals['team2']['live_projection'])
+    assert totals['team1']['win_probability'] == pytest.approx(expected * 100)
+
+
+def test_simulation_bugs_are_not_masked(league, monkeypatch):
+    def broken(*args, **kwargs):
+        raise KeyError('players')
+    monkeypatch.setattr(weekly_totals, 'simulate_matchup', broken)
+    with pytest.raises(KeyError):
+        _run()
@@ -0,0 +1,75 @@
+# test_win_simulation.py
+import time
+import numpy as np
+import pytest
+from config import DEFAULT_PLAYER_CV, WIN_PROB_SIMULATIONS
+import win_simulation
+
+
+class _DefaultVariance:
+    """Every player at DEFAULT_PLAYER_CV, so results don't depend on the published fit."""
+
+    def cv(self, player_name):
+        return DEFAULT_PLAYER_CV
+
+
+def _team(prefix, projections, played_days=4, days=7, injuries=None):
+    """One team's day entries: each player scores their projection on the played days."""
+    injuries = injuries or {}
+    team_days = {}
+    for day in range(days):
+        played = day < played_days
+        team_days[str(day + 14)] = {'players': [
+            {'name': f"{prefix} {i}", 'points': projection if played else 0.0,
+             'static_projection': projection, 'live_projection': projection,
+             'injury_status': injuries.get(i)}
+            for i, projection in enumerate(projections)
+        ]}
+    return team_days
+
+
+# Three days left; team 2 leads by 32 and projects 8 more per day, but its best player is day-to-day
+TEAM1 = _team("A", [40, 36, 33, 30, 28, 26, 24, 22, 20, 18, 15, 12, 10])
+TEAM2 = _team("B", [38, 35, 33, 31, 29, 27, 25, 23, 21, 19, 16, 14, 11], injuries={0: "DAY-TO-DAY"})
+TEAM1_POINTS = 4 * 314.0
+TEAM2_POINTS = 4 * 322.0
+
+
+def test_player_moments_match_brute_force():
+    games = [(30.0, 30.0, 0.92), (30.0, 30.0, 0.92), (12.0, 25.0, 1.0)]
+    mean, variance = win_simulation.player_moments(games, cv=0.35, projection_cv=0.25)
+
+    rng = np.random.default_rng(1)
+    n = 400_000
+    factor = 1.0 + 0.25 * rng.standard_normal(n)
+    total = np.zeros(n)
+    for remaining, per_game, q in games:
+        noise = 0.35 * np.sqrt(remaining * per_game) * rng.standard_normal(n)
+        total += (rng.random(n) < q) * (factor * remaining + noise)
+    assert mean == pytest.approx(total.mean(), rel=0.01)
+    assert variance == pytest.approx(total.var(), rel=0.02)
+
+
+def test_win_probability_on_fixed_matchup():
+    result = win_simulation.simulate_matchup(TEAM1_POINTS, TEAM1, TEAM2_POINTS, TEAM2,
+                                             seed=(3, 1, 2), variance=_DefaultVariance())
+    # Pinned: a change in the spread model that moves this by more than a few points
+    # changes what the page shows and has to be deliberate
+    assert result['simulations'] == WIN_PROB_SIMULATIONS >= 100_000
+    assert result['win_probability']['team1'] == pytest.approx(0.449, abs=0.01)
+    assert result['margin']['std'] == pytest.approx(135.7, abs=1.0)
+
+
+def test_nothing_left_to_play():
+    result = win_simulation.simulate_matchup(120.0, {}, 100.0, {}, n_sims=1000, variance=_DefaultVariance())
+    assert result['win_probability'] == {'team1': 1.0, 'team2': 0.0}
+
+
+def test_default_simulation_count_within_budget():
+    timings = []
+    for seed in range(5):
+        start = time.perf_counter()
+        win_simulation.simulate_matchup(TEAM1_POINTS, TEAM1, TEAM2_POINTS, TEAM2,
+                                        seed=seed, variance=_DefaultVariance())
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.1
@@ -0,0 +1,161 @@
+# tracing.py
+"""
+Nested timing spans for the update tick, and the logging setup.
+
+    with trace("tick"):                       # root: written to TRACE_DIR when it ends
+        with span("fetch_rosters", periods=7):
+            ...
+            count("requests")                 # counter on the innermost open span
+
+The open span is held in a contextvar, so spans nest by themselves. Worker
+threads don't inherit it; wrap the callable with propagate() when submitting it
+to an executor. Outside a trace, span() and count() do nothing.
+
+Each trace file has the span tree (offsets and durations in ms, counters and
+attributes) plus per-name totals. Only the newest TRACE_KEEP files are kept.
+
+Per-player detail goes through logging at DEBUG level, which is off unless
+VERBOSE_LOGGING (or --verbose) turns it on.
+"""
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import contextvars
+from contextlib import contextmanager
+from config import TRACE_DIR, TRACE_KEEP, VERBOSE_LOGGING
+
+_current = contextvars.ContextVar('current_span', default=None)
+_children_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'counters', 'children', 'start', 'duration')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.counters = {}
+        self.children = []
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self, origin):
+        entry = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round((self.duration or 0.0) * 1000, 3),
+        }
+        if self.attrs:
+            entry['attrs'] = self.attrs
+        if self.counters:
+            entry['counters'] = self.counters
+        if self.children:
+            entry['children'] = [child.as_dict(origin) for child in self.children]
+        return entry
+
+
+def _totals(root):
+    """{span name: {'count', 'total_ms', counters summed}} over the whole tree."""
+    totals = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        entry = totals.setdefault(node.name, {'count': 0, 'total_ms': 0.0})
+        entry['count'] += 1
+        entry['total_ms'] += (node.duration or 0.0) * 1000
+        for name, value in node.counters.items():
+            entry[name] = entry.get(name, 0) + value
+        stack.extend(node.children)
+    for entry in totals.values():
+        entry['total_ms'] = round(entry['total_ms'], 3)
+    return totals
+
+
+@contextmanager
+def span(name, **attrs):
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    node = Span(name, attrs)
+    with _children_lock:
+        parent.children.append(node)
+    token = _current.set(node)
+    try:
+        yield node
+    finally:
+        node.duration = time.perf_counter() - node.start
+        _current.reset(token)
+
+
+def count(name, n=1):
+    """Add to a counter on the innermost open span (no-op outside a trace)."""
+    node = _current.get()
+    if node is not None:
+        node.count(name, n)
+
+
+def propagate(fn):
+    """Run fn under the caller's open span, e.g. executor.submit(propagate(fn), ...)."""
+    parent = _current.get()
+
+    def run(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+def write_trace(root, trace_dir=TRACE_DIR, keep=TRACE_KEEP):
+    trace_dir = str(trace_dir)
+    os.makedirs(trace_dir, exist_ok=True)
+    data = {
+        'name': root.name,
+        'started_at': time.time() - (root.duration or 0.0),
+        'duration_ms': round((root.duration or 0.0) * 1000, 3),
+        'totals': _totals(root),
+        'root': root.as_dict(root.start),
+    }
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(data['started_at']))
+    path = os.path.join(trace_dir, f"{root.name}_{stamp}.json")
+    fd, tmp_path = tempfile.mkstemp(dir=trace_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+    traces = sorted(name for name in os.listdir(trace_dir) if name.startswith(f"{root.name}_"))
+    for name in traces[:-keep]:
+        os.remove(os.path.join(trace_dir, name))
+    return path
+
+
+@contextmanager
+def trace(name, **attrs):
+    """Root span; its trace file is written when it ends (even if the tick failed)."""
+    root = Span(name, attrs)
+    token = _current.set(root)
+    try:
+        yield root
+    finally:
+        root.duration = time.perf_counter() - root.start
+        _current.reset(token)
+        try:
+            write_trace(root)
+        except OSError as e:
+            logging.getLogger(__name__).warning("Could not write trace: %s", e)
+
+
+def configure_logging(verbose=VERBOSE_LOGGING):
+    """Plain message output; DEBUG (per-player detail) only when verbose."""
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format="%(message)s")
+    # Connection-level chatter from requests isn't what --verbose is for
+    logging.getLogger("urllib3").setLevel(logging.INFO)
@@ -1,14 +1,59 @@
+import sys
 import schedule
 import time
 import subprocess
+import logging
 import datetime
 from zoneinfo import ZoneInfo
+from config import PROJECTION_CHECK_MINUTES, PUSH_ENABLED, VERBOSE_LOGGING
+from tracing import configure_logging
+
+# Default: run the weekly computation in this process so the ESPN league,
+# HTTP sessions, projection table and schedule index stay warm between ticks.
+# Pass --subprocess to spawn a fresh `python3 weekly_totals.py` every tick instead.
+IN_PROCESS = "--subprocess" not in sys.argv
+
+# Tick output goes through logging; --verbose adds per-player detail
+VERBOSE = VERBOSE_LOGGING or "--verbose" in sys.argv
+configure_logging(verbose=VERBOSE)
+logger = logging.getLogger(__name__)
 
 
 def run_weekly_totals():
-    subprocess.run(["python3", "weekly_totals.py"])
+    if IN_PROCESS:
+        run_weekly_totals_in_process()
+        return
+    # Projections are refreshed by their own job below, never by the tick
+    subprocess.run(["python3", "weekly_totals.py", "--skip-projections"] + (["--verbose"] if VERBOSE else []))
     now_est = datetime.datetime.now(ZoneInfo('America/New_York'))
-    print(f"Ran weekly_totals.py at {now_est.strftime('%Y-%m-%d %H:%M:%S')} EST")
+    logger.info("Ran weekly_totals.py at %s EST", now_est.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def run_weekly_totals_in_process():
+    # Imported on first use; everything it loads stays resident afterwards.
+    # The tick only reads the last published projections (see run_projection_refresh).
+    from weekly_totals import run_weekly_update
+
+    start = time.perf_counter()
+    try:
+        run_weekly_update()
+    except Exception:
+        logger.exception("Error during weekly update")
+        return
+    end = time.perf_counter()
+
+    now_est = datetime.datetime.now(ZoneInfo('America/New_York'))
+    logger.info("Ran weekly update in-process at %s EST (tick %.2fs)",
+                now_est.strftime('%Y-%m-%d %H:%M:%S'), end - start)
+
+
+def run_projection_refresh():
+    """Rebuild projections only when new games have gone final or inputs changed."""
+    from projection_refresh import refresh_projections_if_stale
+    try:
+        refresh_projections_if_stale()
+    except Exception:
+        logger.exception("Error during projection refresh")
 
 
 # Schedule runs every three hours from 2am to 11am EST
@@ -32,12 +77,24 @@ def setup_frequent_schedule():
             job.tag = 'frequent'
 
 
+# Live updates are pushed to browsers by the tick itself, so only in-process mode can serve them
+if IN_PROCESS and PUSH_ENABLED:
+    from push_server import start_push_server
+    try:
+        start_push_server()
+    except OSError as e:
+        logger.warning("Push server not started: %s", e)
+
+# Projection refresh is its own stage: check freshness now and every few minutes
+run_projection_refresh()
+schedule.every(PROJECTION_CHECK_MINUTES).minutes.do(run_projection_refresh)
+
 # Initial setup of frequent schedule
 setup_frequent_schedule()
 # Refresh frequent schedule every hour to adjust for time passing
 schedule.every().hour.do(setup_frequent_schedule)
 
-print("Scheduler started. Press Ctrl+C to exit.")
+logger.info("Scheduler started (%s mode). Press Ctrl+C to exit.", 'in-process' if IN_PROCESS else 'subprocess')
 while True:
     schedule.run_pending()
-    time.sleep(1)
\ No newline at end of file
+    time.sleep(1)
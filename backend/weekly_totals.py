@@ -1,16 +1,32 @@
-import math
+import sys
+import csv
 import time
-from main import get_roster_for_scoring_period, league, get_scoring_period_date
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from main import (get_roster_for_scoring_period, get_league, get_scoring_period_date, load_rosters_for_periods,
+                  clear_roster_cache, refresh_projections, get_teams_playing_for_period, is_period_finalized,
+                  get_box_scores)
+from projection_store import get_projection_store
 from nba_utils import ESPN_TEAM_MAPPING, calculate_live_projection, get_current_scoring_period
-from live_projection import get_minutes_left_by_team, add_live_projections_to_matchup
+from live_projection import add_live_projections_to_matchup
+from scoreboard_snapshot import get_scoreboard_snapshot
+from schedule_index import get_schedule_index
+from win_simulation import simulate_matchup
+from player_variance import get_player_variance
+from win_history import win_probabilities, record_snapshot, write_chart_files
 import json
-from config import WEEKLY_MATCHUPS_JSON
+from config import WEEKLY_MATCHUPS_JSON, MATCHUPS_DIR, INCREMENTAL_UPDATES, MAX_WORKERS, VERBOSE_LOGGING
+from publisher import publish_matchups
+from tracing import trace, span, count, propagate, configure_logging
 
 # ===== CONFIGURATION =====
 # Set to True to use owner names instead of team names (e.g., "Christian's Team" instead of "284 lbs")
 USE_SAFE_TEAM_NAMES = True
 # =========================
 
+logger = logging.getLogger(__name__)
+
 
 def get_week_from_scoring_period(scoring_period):
     """
@@ -69,45 +85,205 @@ def win_probability(score_a, proj_a, score_b, proj_b, alpha=10.5,
     if remaining_b is None:
         remaining_b = max(0.0, proj_b - score_b)
 
-    # Expected final scores
-    EA = proj_a  # or equivalently: score_a + remaining_a
-    EB = proj_b  # or equivalently: score_b + remaining_b
-    
-    # Standard deviation based on remaining points
-    # More remaining points = more uncertainty
-    remaining_total = remaining_a + remaining_b
-    denom = alpha * math.sqrt(max(remaining_total, 1e-9))
-    
-    # Z-score: how many standard deviations is the difference
-    z = (EA - EB) / denom
-    
-    # Standard normal CDF using error function
-    # This gives us P(team A wins)
-    p_a = 0.5 * (1.0 + math.erf(z / math.sqrt(2)))
-    
-    # Clamp to valid probability range
-    p_a = max(0.0, min(1.0, p_a))
-    
-    return p_a, 1.0 - p_a
+    # Same model as the batched version used for history charts
+    p_a, p_b = win_probabilities(score_a, proj_a, score_b, proj_b, alpha=alpha,
+                                 remaining_a=remaining_a, remaining_b=remaining_b)
+    return float(p_a), float(p_b)
+
+
+def get_period_fingerprint(team_ids, period, injury_dict):
+    """
+    Hash of everything a period's results depend on apart from the live clock:
+    both lineups (slots, pro teams, points), injury statuses, which NBA teams
+    play that day and the projection table version.
+    """
+    players = []
+    for team_id in team_ids:
+        for p in get_roster_for_scoring_period(team_id, period):
+            players.append([team_id, p.get('playerId'), p['name'], p['lineupSlotId'], p['proTeamId'],
+                            p['points'], injury_dict.get(p['name'])])
+    inputs = {
+        'players': players,
+        'teams_playing': sorted(get_teams_playing_for_period(period)),
+        'projections': get_projection_store().content_hash
+    }
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def can_reuse_period(period, current_period, previous_state, fingerprint):
+    """
+    Whether a period's results from the previous run are still valid.
+    - Today's period always moves with the live clock, so it is recomputed.
+    - Past periods are reused once they were computed after all games went final.
+    - Future periods are reused while their input fingerprint is unchanged.
+    """
+    if period == current_period:
+        return False
+    if period < current_period:
+        return previous_state.get('final', False)
+    return previous_state.get('fingerprint') == fingerprint
+
+
+# ESPN lineupSlotId -> starting position; 7-9 are the UTL slots, 12 bench and 13 IR
+LINEUP_SLOT_POSITIONS = {0: 'PG', 1: 'SG', 2: 'SF', 3: 'PF', 4: 'C', 5: 'G', 6: 'F'}
+UTL_SLOT_IDS = (7, 8, 9)
+BENCH_SLOT_ID = 12
+IR_SLOT_ID = 13
+
+
+def _empty_day(period_date):
+    return {
+        'date': str(period_date),
+        'players': [],
+        'roster': {
+            'PG': "Empty Slot",
+            'SG': "Empty Slot",
+            'SF': "Empty Slot",
+            'PF': "Empty Slot",
+            'C': "Empty Slot",
+            'G': "Empty Slot",
+            'F': "Empty Slot",
+            'UTL': ["Empty Slot", "Empty Slot", "Empty Slot"],
+            'BENCH': [],
+            'IR': []
+        }
+    }
 
 
-def calculate_weekly_totals(box_id, week_number):
+def _place_roster(day, roster):
+    """
+    Put a team's parsed ESPN roster into day['roster'] by lineup slot.
+    Returns the points scored by the active (non-bench, non-IR) players.
+    """
+    total_points = 0.0
+    slots = day['roster']
+    for player in roster:
+        if 'lineupSlotId' not in player:
+            logger.debug("No lineupSlotId found for player: %s", player)
+            continue
+        lineup_slot = player['lineupSlotId']
+        player_name = player.get('name', "Empty Slot")
+
+        if lineup_slot not in (BENCH_SLOT_ID, IR_SLOT_ID):
+            total_points += player.get('points', 0)
+
+        if lineup_slot in LINEUP_SLOT_POSITIONS:
+            slots[LINEUP_SLOT_POSITIONS[lineup_slot]] = player_name
+        elif lineup_slot in UTL_SLOT_IDS:
+            slots['UTL'][lineup_slot - UTL_SLOT_IDS[0]] = player_name
+        elif lineup_slot in (BENCH_SLOT_ID, IR_SLOT_ID):
+            slots['BENCH' if lineup_slot == BENCH_SLOT_ID else 'IR'].append({
+                'name': player_name,
+                'injury_status': None  # Filled in from the matchup rows below
+            })
+        else:
+            logger.debug("Unknown lineup slot ID: %s for player %s", lineup_slot, player_name)
+    return total_points
+
+
+def _add_row_slot(day, position, slot):
+    """
+    Add one team's side of a matchup row to its day entry. Returns what the slot
+    adds to the day's live projection total.
+    """
+    # Normalize injury status (convert DAY_TO_DAY to DAY-TO-DAY for consistency)
+    injury = slot.injury.replace('_', '-') if slot.injury else None
+    slots = day['roster']
+
+    # BENCH and IR rows only carry the injury status for the roster entry
+    if position in ("BENCH", "IR"):
+        for player in slots[position]:
+            if isinstance(player, dict) and player['name'] == slot.name:
+                player['injury_status'] = injury
+                break
+        return 0.0
+
+    day['players'].append({
+        'name': slot.name,
+        'position': position,
+        'points': slot.points,
+        'static_projection': slot.projection,
+        'live_projection': slot.live_projection,
+        'injury_status': injury
+    })
+
+    # Backup for the roster placement in case the roster fetch failed
+    if slot.name and slot.name not in ("Empty Slot", "Unknown Player"):
+        if position in LINEUP_SLOT_POSITIONS.values():
+            slots[position] = slot.name
+        elif position == "UTL" and slot.name not in slots['UTL'] and "Empty Slot" in slots['UTL']:
+            slots['UTL'][slots['UTL'].index("Empty Slot")] = slot.name
+
+    # Live projection once the game has started (points > 0), static projection before
+    return slot.live_projection if slot.points > 0 else slot.projection
+
+
+def calculate_period_results(box_id, period, team1_id, team2_id, snapshot):
+    """
+    Build both teams' day entries (roster, players, day totals) for one scoring period.
+    Returns (team1_day, team2_day); each day has a 'totals' dict with the day's
+    active points and live projection.
+    """
+    logger.debug("\n=== Processing period %s ===", period)
+    period_date = get_scoring_period_date(period)
+    team1_day = _empty_day(period_date)
+    team2_day = _empty_day(period_date)
+    team1_total_points = 0.0
+    team2_total_points = 0.0
+    team1_total_live_proj = 0.0
+    team2_total_live_proj = 0.0
+
+    try:
+        with span('fetch_rosters'):
+            team1_roster = get_roster_for_scoring_period(team1_id, period)
+            team2_roster = get_roster_for_scoring_period(team2_id, period)
+        logger.debug("Roster counts: team 1 %s, team 2 %s", len(team1_roster), len(team2_roster))
+
+        with span('aggregation', part='roster'):
+            team1_total_points = _place_roster(team1_day, team1_roster)
+            team2_total_points = _place_roster(team2_day, team2_roster)
+    except Exception:
+        logger.exception("Error processing roster data for period %s", period)
+        # Continue with live projections even if roster data fails
+
+    try:
+        with span('live_projection'):
+            matchup = add_live_projections_to_matchup(box_id, period, snapshot)
+        rows = matchup.rows if matchup is not None else []
+        if matchup is None:
+            logger.debug("No matchup data for period %s", period)
+
+        with span('aggregation', part='rows'):
+            count('rows', len(rows))
+            for row in rows:
+                logger.debug("%s: %s (%s pts, %s live) vs %s (%s pts, %s live)", row.position,
+                             row.team1.display_name, row.team1.points, row.team1.live_projection,
+                             row.team2.display_name, row.team2.points, row.team2.live_projection)
+                team1_total_live_proj += _add_row_slot(team1_day, row.position, row.team1)
+                team2_total_live_proj += _add_row_slot(team2_day, row.position, row.team2)
+    except Exception:
+        logger.exception("Error processing live projections for period %s", period)
+
+    team1_day['totals'] = {'points': team1_total_points, 'live_projection': team1_total_live_proj}
+    team2_day['totals'] = {'points': team2_total_points, 'live_projection': team2_total_live_proj}
+    return team1_day, team2_day
+
+
+def calculate_weekly_totals(box_id, week_number, snapshot=None, previous=None):
     """
     Calculate total live projections for both teams across all games in a week.
     Returns detailed JSON of each roster on each night with points, live projection, and static projection.
+    snapshot: live scoreboard snapshot shared by all matchups in this run (fetched if omitted).
+    previous: this matchup's result from the last run; periods whose inputs haven't
+              changed are copied from it instead of recomputed (see can_reuse_period).
     """
     start_time = time.time()
 
-    # Enable debug mode
-    DEBUG = True
-
-    def debug_print(message):
-        if DEBUG:
-            print(f"DEBUG - {message}")
-
     # Get team info
-    team1_obj = league.box_scores()[box_id].home_team
-    team2_obj = league.box_scores()[box_id].away_team
+    league = get_league()
+    box = get_box_scores()[box_id]
+    team1_obj = box.home_team
+    team2_obj = box.away_team
     team1_id = team1_obj.team_id
     team2_id = team2_obj.team_id
     team1_name = team1_obj.team_name
@@ -145,7 +321,7 @@ def calculate_weekly_totals(box_id, week_number):
         team1_display_name = team1_name
         team2_display_name = team2_name
 
-    debug_print(f"Processing matchup: {team1_name} (ID: {team1_id}) vs {team2_name} (ID: {team2_id})")
+    logger.debug("Processing matchup: %s (ID: %s) vs %s (ID: %s)", team1_name, team1_id, team2_name, team2_id)
 
     # Initialize weekly totals
     team1_total_points = 0.0
@@ -169,411 +345,86 @@ def calculate_weekly_totals(box_id, week_number):
             'record': team2_record,
             'days': {}
         },
-        'totals': {}
+        'totals': {},
+        'week': week_number,
+        'periods': {}
     }
 
     # Get all scoring periods in this week
     scoring_periods = get_scoring_periods_in_week(week_number)
     current_period = get_current_scoring_period()
-    debug_print(f"Scoring periods in week {week_number}: {scoring_periods}")
-    debug_print(f"Current scoring period: {current_period}")
-
-    # Process each scoring period
+    logger.debug("Scoring periods in week %s: %s", week_number, scoring_periods)
+    logger.debug("Current scoring period: %s", current_period)
+
+    # One league-wide roster request per period; every team/consumer reads from the cache
+    load_rosters_for_periods(scoring_periods)
+    snapshot = snapshot or get_scoreboard_snapshot()
+
+    # Injury statuses feed the per-period input fingerprints
+    injury_dict = {}
+    for leagueteam in league.teams:
+        if leagueteam.team_id in (team1_id, team2_id):
+            for player in leagueteam.roster:
+                if player.injuryStatus != "ACTIVE":
+                    injury_dict[player.name] = player.injuryStatus
+
+    # Process each scoring period, reusing last run's results where inputs are unchanged
+    previous_periods = previous.get('periods', {}) if previous else {}
     for period in scoring_periods:
-        debug_print(f"\n=== Processing period {period} ===")
-        period_date = get_scoring_period_date(period)
-        debug_print(f"Period date: {period_date}")
-
-        # Initialize data structures for this day
-        detailed_results['team1']['days'][period] = {
-            'date': str(period_date),
-            'players': [],
-            'roster': {
-                'PG': "Empty Slot",
-                'SG': "Empty Slot",
-                'SF': "Empty Slot",
-                'PF': "Empty Slot",
-                'C': "Empty Slot",
-                'G': "Empty Slot",
-                'F': "Empty Slot",
-                'UTL': ["Empty Slot", "Empty Slot", "Empty Slot"],
-                'BENCH': [],
-                'IR': []
-            }
-        }
-        detailed_results['team2']['days'][period] = {
-            'date': str(period_date),
-            'players': [],
-            'roster': {
-                'PG': "Empty Slot",
-                'SG': "Empty Slot",
-                'SF': "Empty Slot",
-                'PF': "Empty Slot",
-                'C': "Empty Slot",
-                'G': "Empty Slot",
-                'F': "Empty Slot",
-                'UTL': ["Empty Slot", "Empty Slot", "Empty Slot"],
-                'BENCH': [],
-                'IR': []
-            }
-        }
-
-        # Get rosters
-        debug_print(f"Fetching rosters for period {period}...")
-        try:
-            team1_roster = get_roster_for_scoring_period(team1_id, period)
-            debug_print(f"Team 1 roster count: {len(team1_roster) if team1_roster else 0}")
-            team2_roster = get_roster_for_scoring_period(team2_id, period)
-            debug_print(f"Team 2 roster count: {len(team2_roster) if team2_roster else 0}")
-
-            # Debug: inspect first player structure
-            if team1_roster and len(team1_roster) > 0:
-                debug_print(f"Team 1 first player keys: {list(team1_roster[0].keys())}")
-                if 'playerPoolEntry' in team1_roster[0]:
-                    debug_print(f"playerPoolEntry keys: {list(team1_roster[0]['playerPoolEntry'].keys())}")
-                else:
-                    debug_print("No playerPoolEntry found for first player!")
-                    debug_print(f"Full first player data: {team1_roster[0]}")
-            else:
-                debug_print("Team 1 roster is empty!")
-
-            # Process team1 roster data
-            for i, player in enumerate(team1_roster):
-                debug_print(f"Processing Team 1 Player {i + 1}/{len(team1_roster)}")
-
-                # Check player structure
-                if 'lineupSlotId' not in player:
-                    debug_print(f"No lineupSlotId found for player: {player}")
-                    continue
-
-                # Track points
-                if player['lineupSlotId'] not in [12, 13]:  # Skip bench and IR
-                    points = player.get('points', 0)
-                    team1_total_points += points
-                    debug_print(f"Adding {points} points to team1_total_points")
-
-                # Extract player name
-                player_name = "Empty Slot"  # Default
-
-                # Check if this is the format with 'playerPoolEntry'
-                if 'playerPoolEntry' in player:
-                    if 'player' in player['playerPoolEntry']:
-                        player_name = player['playerPoolEntry']['player'].get('fullName', "Unknown Player")
-                        debug_print(f"Found player name via playerPoolEntry: {player_name}")
-                    else:
-                        debug_print(f"No player key in playerPoolEntry: {player['playerPoolEntry'].keys()}")
-                # Check if this is an alternative format with direct 'player' access
-                elif 'player' in player:
-                    player_name = player['player'].get('fullName', "Unknown Player")
-                    debug_print(f"Found player name via direct player access: {player_name}")
-                # Check for other formats
-                else:
-                    debug_print(f"Unable to find player name. Available keys: {player.keys()}")
-                    # Try different ways to get the player name
-                    for key in ['name', 'fullName', 'lastName', 'firstName', 'displayName']:
-                        if key in player:
-                            player_name = player[key]
-                            debug_print(f"Found player name via key '{key}': {player_name}")
-                            break
-
-                # Map lineup slot ID to position
-                lineup_slot = player['lineupSlotId']
-                debug_print(f"Player {player_name} has lineup slot ID: {lineup_slot}")
-
-                if lineup_slot == 0:
-                    debug_print(f"Assigning {player_name} to PG")
-                    detailed_results['team1']['days'][period]['roster']['PG'] = player_name
-                elif lineup_slot == 1:
-                    debug_print(f"Assigning {player_name} to SG")
-                    detailed_results['team1']['days'][period]['roster']['SG'] = player_name
-                elif lineup_slot == 2:
-                    debug_print(f"Assigning {player_name} to SF")
-                    detailed_results['team1']['days'][period]['roster']['SF'] = player_name
-                elif lineup_slot == 3:
-                    debug_print(f"Assigning {player_name} to PF")
-                    detailed_results['team1']['days'][period]['roster']['PF'] = player_name
-                elif lineup_slot == 4:
-                    debug_print(f"Assigning {player_name} to C")
-                    detailed_results['team1']['days'][period]['roster']['C'] = player_name
-                elif lineup_slot == 5:
-                    debug_print(f"Assigning {player_name} to G")
-                    detailed_results['team1']['days'][period]['roster']['G'] = player_name
-                elif lineup_slot == 6:
-                    debug_print(f"Assigning {player_name} to F")
-                    detailed_results['team1']['days'][period]['roster']['F'] = player_name
-                elif lineup_slot in [7, 8, 9]:
-                    utl_index = lineup_slot - 7
-                    debug_print(f"Assigning {player_name} to UTL[{utl_index}]")
-                    detailed_results['team1']['days'][period]['roster']['UTL'][utl_index] = player_name
-                elif lineup_slot == 12:
-                    debug_print(f"Adding {player_name} to BENCH")
-                    # Extract injury status from player name
-                    clean_name = player_name.split(' (')[0] if '(' in player_name else player_name
-                    injury_status = player_name.split(' (')[1].rstrip(')') if '(' in player_name else None
-                    detailed_results['team1']['days'][period]['roster']['BENCH'].append({
-                        'name': clean_name,
-                        'injury_status': injury_status
-                    })
-                elif lineup_slot == 13:
-                    debug_print(f"Adding {player_name} to IR")
-                    # Extract injury status from player name
-                    clean_name = player_name.split(' (')[0] if '(' in player_name else player_name
-                    injury_status = player_name.split(' (')[1].rstrip(')') if '(' in player_name else None
-                    detailed_results['team1']['days'][period]['roster']['IR'].append({
-                        'name': clean_name,
-                        'injury_status': injury_status
-                    })
-                else:
-                    debug_print(f"Unknown lineup slot ID: {lineup_slot} for player {player_name}")
-
-            # Process team2 roster data (similar to team1)
-            for i, player in enumerate(team2_roster):
-                debug_print(f"Processing Team 2 Player {i + 1}/{len(team2_roster)}")
-
-                if 'lineupSlotId' not in player:
-                    debug_print(f"No lineupSlotId found for player: {player}")
-                    continue
-
-                if player['lineupSlotId'] not in [12, 13]:
-                    points = player.get('points', 0)
-                    team2_total_points += points
-                    debug_print(f"Adding {points} points to team2_total_points")
-
-                player_name = "Empty Slot"
-
-                if 'playerPoolEntry' in player:
-                    if 'player' in player['playerPoolEntry']:
-                        player_name = player['playerPoolEntry']['player'].get('fullName', "Unknown Player")
-                    else:
-                        debug_print(f"No player key in playerPoolEntry: {player['playerPoolEntry'].keys()}")
-                elif 'player' in player:
-                    player_name = player['player'].get('fullName', "Unknown Player")
-                else:
-                    for key in ['name', 'fullName', 'lastName', 'firstName', 'displayName']:
-                        if key in player:
-                            player_name = player[key]
-                            break
-
-                lineup_slot = player['lineupSlotId']
-
-                if lineup_slot == 0:
-                    detailed_results['team2']['days'][period]['roster']['PG'] = player_name
-                elif lineup_slot == 1:
-                    detailed_results['team2']['days'][period]['roster']['SG'] = player_name
-                elif lineup_slot == 2:
-                    detailed_results['team2']['days'][period]['roster']['SF'] = player_name
-                elif lineup_slot == 3:
-                    detailed_results['team2']['days'][period]['roster']['PF'] = player_name
-                elif lineup_slot == 4:
-                    detailed_results['team2']['days'][period]['roster']['C'] = player_name
-                elif lineup_slot == 5:
-                    detailed_results['team2']['days'][period]['roster']['G'] = player_name
-                elif lineup_slot == 6:
-                    detailed_results['team2']['days'][period]['roster']['F'] = player_name
-                elif lineup_slot in [7, 8, 9]:
-                    utl_index = lineup_slot - 7
-                    detailed_results['team2']['days'][period]['roster']['UTL'][utl_index] = player_name
-                elif lineup_slot == 12:
-                    # Extract injury status from player name
-                    clean_name = player_name.split(' (')[0] if '(' in player_name else player_name
-                    injury_status = player_name.split(' (')[1].rstrip(')') if '(' in player_name else None
-                    detailed_results['team2']['days'][period]['roster']['BENCH'].append({
-                        'name': clean_name,
-                        'injury_status': injury_status
-                    })
-                elif lineup_slot == 13:
-                    # Extract injury status from player name
-                    clean_name = player_name.split(' (')[0] if '(' in player_name else player_name
-                    injury_status = player_name.split(' (')[1].rstrip(')') if '(' in player_name else None
-                    detailed_results['team2']['days'][period]['roster']['IR'].append({
-                        'name': clean_name,
-                        'injury_status': injury_status
-                    })
-
-        except Exception as e:
-            debug_print(f"Error processing roster data for period {period}: {str(e)}")
-            import traceback
-            debug_print(traceback.format_exc())
-            # Continue with live projections even if roster data fails
-
-        # Get live projections from the matchup data
-        debug_print("Fetching live projections...")
-        try:
-            matchup_data = add_live_projections_to_matchup(box_id, period)
-            if matchup_data is None:
-                debug_print(f"No matchup data for period {period}")
-                continue
-
-            debug_print(f"Matchup data rows: {len(matchup_data)}")
-            if len(matchup_data) > 0:
-                debug_print(f"First row: {matchup_data[0]}")
-
-            # Skip the header row [0] and process player rows [1:]
-            for row_index, row in enumerate(matchup_data[1:], 1):
-                print(row)
-                debug_print(f"Processing matchup row {row_index}/{len(matchup_data) - 1}")
-                position = row[0]
-                
-                # Extract data
-                team2_name_raw = row[1]
-                team1_name_raw = row[8]
-                
-                # Extract player names and injury status
-                team1_player_name = team1_name_raw.split(' (')[0] if '(' in team1_name_raw else team1_name_raw
-                team2_player_name = team2_name_raw.split(' (')[0] if '(' in team2_name_raw else team2_name_raw
-                
-                # Extract and normalize injury status (convert DAY_TO_DAY to DTD for consistency)
-                team1_injury_raw = team1_name_raw.split(' (')[1].rstrip(')') if '(' in team1_name_raw else None
-                team2_injury_raw = team2_name_raw.split(' (')[1].rstrip(')') if '(' in team2_name_raw else None
-                
-                # Normalize injury status
-                team1_injury = team1_injury_raw.replace('_', '-') if team1_injury_raw else None
-                team2_injury = team2_injury_raw.replace('_', '-') if team2_injury_raw else None
-                
-                # If this is a BENCH or IR row, update the roster data with injury status
-                if position in ["BENCH", "IR"]:
-                    debug_print(f"Processing {position} row: {team1_player_name} vs {team2_player_name}")
-                    
-                    # Update team1 BENCH/IR with injury status
-                    for i, player in enumerate(detailed_results['team1']['days'][period]['roster'][position]):
-                        if isinstance(player, dict) and player['name'] == team1_player_name:
-                            detailed_results['team1']['days'][period]['roster'][position][i]['injury_status'] = team1_injury
-                            debug_print(f"Updated team1 {position} player {team1_player_name} with injury status: {team1_injury}")
-                            break
-                    
-                    # Update team2 BENCH/IR with injury status
-                    for i, player in enumerate(detailed_results['team2']['days'][period]['roster'][position]):
-                        if isinstance(player, dict) and player['name'] == team2_player_name:
-                            detailed_results['team2']['days'][period]['roster'][position][i]['injury_status'] = team2_injury
-                            debug_print(f"Updated team2 {position} player {team2_player_name} with injury status: {team2_injury}")
-                            break
-                    
-                    continue
-
-                team2_static_proj = float(row[2]) if isinstance(row[2], (int, float)) or (
-                        isinstance(row[2], str) and row[2].strip() and row[2] != 'None') else 0.0
-                team2_live_proj = float(row[3]) if isinstance(row[3], (int, float)) or (
-                        isinstance(row[3], str) and row[3].strip() and row[3] != 'None') else 0.0
-                team2_points = float(row[4]) if isinstance(row[4], (int, float)) or (
-                        isinstance(row[4], str) and row[4].strip() and row[4] != 'None') else 0.0
-                team1_points = float(row[5]) if isinstance(row[5], (int, float)) or (
-                        isinstance(row[5], str) and row[5].strip() and row[5] != 'None') else 0.0
-                team1_live_proj = float(row[6]) if isinstance(row[6], (int, float)) or (
-                        isinstance(row[6], str) and row[6].strip() and row[6] != 'None') else 0.0
-                team1_static_proj = float(row[7]) if isinstance(row[7], (int, float)) or (
-                        isinstance(row[7], str) and row[7].strip() and row[7] != 'None') else 0.0
-
-                debug_print(f"Position: {position}")
-                debug_print(f"Team1: {team1_name_raw}, Points: {team1_points}, Live Proj: {team1_live_proj}")
-                debug_print(f"Team2: {team2_name_raw}, Points: {team2_points}, Live Proj: {team2_live_proj}")
-
-                # Add to running totals using proper logic:
-                # - Use live projection if points > 0 (game has started)
-                # - Use static projection if points == 0 (game hasn't started)
-                # Team 1
-                if team1_points > 0:
-                    team1_total_live_proj += team1_live_proj
-                    debug_print(f"Team1: Adding live projection {team1_live_proj} (game started)")
-                else:
-                    team1_total_live_proj += team1_static_proj
-                    debug_print(f"Team1: Adding static projection {team1_static_proj} (game not started)")
-                
-                # Team 2
-                if team2_points > 0:
-                    team2_total_live_proj += team2_live_proj
-                    debug_print(f"Team2: Adding live projection {team2_live_proj} (game started)")
-                else:
-                    team2_total_live_proj += team2_static_proj
-                    debug_print(f"Team2: Adding static projection {team2_static_proj} (game not started)")
-
-                # Add to detailed results
-                detailed_results['team1']['days'][period]['players'].append({
-                    'name': team1_player_name,
-                    'position': position,
-                    'points': team1_points,
-                    'static_projection': team1_static_proj,
-                    'live_projection': team1_live_proj,
-                    'injury_status': team1_injury
-                })
-                detailed_results['team2']['days'][period]['players'].append({
-                    'name': team2_player_name,
-                    'position': position,
-                    'points': team2_points,
-                    'static_projection': team2_static_proj,
-                    'live_projection': team2_live_proj,
-                    'injury_status': team2_injury
-                })
-
-                # Since we have player data from matchup, let's try to use it to populate roster
-                # (this could be a backup approach if the get_roster_for_scoring_period fails)
-
-                # Check if the names in matchup data match with roster positions
-                # If so, we might be able to infer the positions from the matchup data
-                print(team1_player_name, team2_player_name)
-                if team1_player_name and team1_player_name not in ["Empty Slot", "Unknown Player"]:
-                    debug_print(f"Trying to place {team1_player_name} in Team 1 roster based on position {position}")
-                    if position == "PG":
-                        detailed_results['team1']['days'][period]['roster']['PG'] = team1_player_name
-                    elif position == "SG":
-                        detailed_results['team1']['days'][period]['roster']['SG'] = team1_player_name
-                    elif position == "SF":
-                        detailed_results['team1']['days'][period]['roster']['SF'] = team1_player_name
-                    elif position == "PF":
-                        detailed_results['team1']['days'][period]['roster']['PF'] = team1_player_name
-                    elif position == "C":
-                        detailed_results['team1']['days'][period]['roster']['C'] = team1_player_name
-                    elif position == "G":
-                        detailed_results['team1']['days'][period]['roster']['G'] = team1_player_name
-                    elif position == "F":
-                        detailed_results['team1']['days'][period]['roster']['F'] = team1_player_name
-                    elif position == "UTL":
-                        # Find the first empty UTL slot
-                        for i in range(3):
-                            if detailed_results['team1']['days'][period]['roster']['UTL'][i] == "Empty Slot":
-                                detailed_results['team1']['days'][period]['roster']['UTL'][i] = team1_player_name
-                                break
-
-                if team2_player_name and team2_player_name not in ["Empty Slot", "Unknown Player"]:
-                    debug_print(f"Trying to place {team2_player_name} in Team 2 roster based on position {position}")
-                    if position == "PG":
-                        detailed_results['team2']['days'][period]['roster']['PG'] = team2_player_name
-                    elif position == "SG":
-                        detailed_results['team2']['days'][period]['roster']['SG'] = team2_player_name
-                    elif position == "SF":
-                        detailed_results['team2']['days'][period]['roster']['SF'] = team2_player_name
-                    elif position == "PF":
-                        detailed_results['team2']['days'][period]['roster']['PF'] = team2_player_name
-                    elif position == "C":
-                        detailed_results['team2']['days'][period]['roster']['C'] = team2_player_name
-                    elif position == "G":
-                        detailed_results['team2']['days'][period]['roster']['G'] = team2_player_name
-                    elif position == "F":
-                        detailed_results['team2']['days'][period]['roster']['F'] = team2_player_name
-                    elif position == "UTL":
-                        # Find the first empty UTL slot
-                        for i in range(3):
-                            if detailed_results['team2']['days'][period]['roster']['UTL'][i] == "Empty Slot":
-                                detailed_results['team2']['days'][period]['roster']['UTL'][i] = team2_player_name
-                                break
-
-        except Exception as e:
-            debug_print(f"Error processing live projections for period {period}: {str(e)}")
-            import traceback
-            debug_print(traceback.format_exc())
+        fingerprint = get_period_fingerprint((team1_id, team2_id), period, injury_dict)
+        final = is_period_finalized(period)
+        previous_state = previous_periods.get(str(period))
+
+        if previous_state and can_reuse_period(period, current_period, previous_state, fingerprint):
+            logger.debug("Reusing period %s from previous run (inputs unchanged)", period)
+            count('periods_reused')
+            team1_day = previous['team1']['days'][str(period)]
+            team2_day = previous['team2']['days'][str(period)]
+        else:
+            count('periods_computed')
+            with span('period', period=period):
+                team1_day, team2_day = calculate_period_results(box_id, period, team1_id, team2_id, snapshot)
+
+        # String keys, as they read back from weekly_matchups.json on the next tick
+        detailed_results['team1']['days'][str(period)] = team1_day
+        detailed_results['team2']['days'][str(period)] = team2_day
+        detailed_results['periods'][str(period)] = {'fingerprint': fingerprint, 'final': final}
+
+        team1_total_points += team1_day['totals']['points']
+        team2_total_points += team2_day['totals']['points']
+        team1_total_live_proj += team1_day['totals']['live_projection']
+        team2_total_live_proj += team2_day['totals']['live_projection']
 
     # Calculate win probabilities
     # Compute remaining expected points (live projection minus already scored)
     remaining_team1 = max(0.0, team1_total_live_proj - team1_total_points)
     remaining_team2 = max(0.0, team2_total_live_proj - team2_total_points)
 
-    prob_team1, prob_team2 = win_probability(
-        team1_total_points,
-        team1_total_live_proj,
-        team2_total_points,
-        team2_total_live_proj,
-        remaining_a=remaining_team1,
-        remaining_b=remaining_team2
-    )
+    # Simulate from per-player variance. The closed-form normal model is the fallback
+    # when the published fit can't be read; a missing file just means default spreads.
+    try:
+        variance = get_player_variance()
+    except (OSError, ValueError, KeyError, csv.Error) as e:
+        logger.warning("Could not read player variance, using normal approximation: %s", e)
+        variance = None
+
+    simulation = None
+    if variance is not None:
+        with span('simulation'):
+            simulation = simulate_matchup(team1_total_points, detailed_results['team1']['days'],
+                                          team2_total_points, detailed_results['team2']['days'],
+                                          seed=(week_number, team1_id, team2_id), variance=variance)
+        prob_team1 = simulation['win_probability']['team1']
+        prob_team2 = simulation['win_probability']['team2']
+    else:
+        prob_team1, prob_team2 = win_probability(
+            team1_total_points,
+            team1_total_live_proj,
+            team2_total_points,
+            team2_total_live_proj,
+            remaining_a=remaining_team1,
+            remaining_b=remaining_team2
+        )
 
     # Add totals to results
     detailed_results['totals'] = {
@@ -588,28 +439,84 @@ def calculate_weekly_totals(box_id, week_number):
             'win_probability': prob_team2 * 100
         }
     }
+    if simulation:
+        detailed_results['simulation'] = {key: value for key, value in simulation.items() if key != 'win_probability'}
 
     end_time = time.time()
     execution_time = end_time - start_time
 
-    # Print matchup results
-    print(f"\n{'=' * 50}")
-    print(f"MATCHUP #{box_id + 1}: {team1_name} vs {team2_name} (WEEK {week_number})")
-    print(f"{'=' * 50}")
-    print(f"{team1_name} Points: {team1_total_points}")
-    print(f"{team2_name} Points: {team2_total_points}")
-    print(f"{team1_name} Live Projection: {team1_total_live_proj:.1f}")
-    print(f"{team2_name} Live Projection: {team2_total_live_proj:.1f}")
-    print(f"")
-    print(f"{team1_name} Win Probability: {prob_team1 * 100:.1f}%")
-    print(f"{team2_name} Win Probability: {prob_team2 * 100:.1f}%")
-    print(f"{'=' * 50}\n")
+    # Log matchup results
+    logger.info("\n%s\nMATCHUP #%s: %s vs %s (WEEK %s)\n%s\n"
+                "%s Points: %s\n%s Points: %s\n%s Live Projection: %.1f\n%s Live Projection: %.1f\n\n"
+                "%s Win Probability: %.1f%%\n%s Win Probability: %.1f%%\n%s\n",
+                '=' * 50, box_id + 1, team1_name, team2_name, week_number, '=' * 50,
+                team1_name, team1_total_points, team2_name, team2_total_points,
+                team1_name, team1_total_live_proj, team2_name, team2_total_live_proj,
+                team1_name, prob_team1 * 100, team2_name, prob_team2 * 100, '=' * 50)
 
     return detailed_results
 
 
 
-if __name__ == "__main__":
+def load_previous_matchups():
+    """
+    Index the last written WEEKLY_MATCHUPS_JSON by (week, team1 id, team2 id) so each
+    matchup can pick up its own previous results. Returns {} if there is nothing usable.
+    """
+    try:
+        with open(WEEKLY_MATCHUPS_JSON, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    previous = {}
+    for matchup in data.values():
+        if 'week' in matchup and 'periods' in matchup:
+            previous[(matchup['week'], matchup['team1']['id'], matchup['team2']['id'])] = matchup
+    return previous
+
+
+def prefetch_week_inputs(scoring_periods, max_workers):
+    """
+    Warm every shared input for a tick in parallel: the season schedule index,
+    the live scoreboard snapshot and all rosters for the week's periods.
+    Returns the scoreboard snapshot.
+    """
+    def fetch_scoreboard():
+        with span('fetch_scoreboard'):
+            return get_scoreboard_snapshot()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, 2))) as executor:
+        snapshot_future = executor.submit(propagate(fetch_scoreboard))
+        # Rosters need the schedule index (finalized check), so warm it first on this side
+        with span('fetch_schedule'):
+            get_schedule_index()
+        with span('fetch_rosters', periods=len(scoring_periods)):
+            load_rosters_for_periods(scoring_periods, max_workers=max_workers)
+        return snapshot_future.result()
+
+
+def run_weekly_update(incremental=INCREMENTAL_UPDATES, max_workers=MAX_WORKERS):
+    """
+    One update tick: compute every matchup for the current week and publish
+    them (see publisher.publish_matchups). Safe to call repeatedly from a long-running process;
+    per-run caches are reset here while sessions and indexes stay warm.
+    With incremental=True, periods whose inputs haven't changed since the last
+    written file are reused rather than recomputed. max_workers > 1 fetches
+    inputs and computes matchups concurrently; the output is the same as a
+    sequential run (max_workers=1).
+    Returns the matchups dict that was written. Each call writes a timing trace (see tracing).
+    """
+    with trace('tick', incremental=incremental, max_workers=max_workers):
+        return _run_weekly_update(incremental, max_workers)
+
+
+def _run_weekly_update(incremental, max_workers):
+    clear_roster_cache()
+    # Builds the league on the first run, re-reads teams/injuries on later ones
+    with span('fetch_league'):
+        get_league(refresh=True)
+
     # Determine current week
     current_period = get_current_scoring_period()
     current_week = get_week_from_scoring_period(current_period)
@@ -619,19 +526,64 @@ if __name__ == "__main__":
 
     all_matchups = {}
 
-    for box_id in range(4):
-        try:
-            print(f"Processing matchup #{box_id + 1}...")
-            matchup_results = calculate_weekly_totals(box_id, current_week)
-            all_matchups[f'matchup_{box_id}'] = matchup_results
-        except Exception as e:
-            print(f"Error processing matchup #{box_id + 1}: {str(e)}")
+    # Every matchup in this run shares one live scoreboard snapshot and one roster cache
+    with span('prefetch'):
+        snapshot = prefetch_week_inputs(get_scoring_periods_in_week(current_week), max_workers)
+    previous_matchups = load_previous_matchups() if incremental else {}
+    # One box score request per tick; the league's matchup count drives the loop
+    with span('fetch_box_scores'):
+        box_scores = get_box_scores()
+
+    def process_matchup(box_id):
+        logger.info("Processing matchup #%s...", box_id + 1)
+        box = box_scores[box_id]
+        previous = previous_matchups.get((current_week, box.home_team.team_id, box.away_team.team_id))
+        with span('matchup', box_id=box_id):
+            return calculate_weekly_totals(box_id, current_week, snapshot, previous)
+
+    box_ids = range(len(box_scores))
+    with span('matchups', count=len(box_ids)), ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(propagate(process_matchup), box_id) for box_id in box_ids]
+        # Collect in box order so the output matches a sequential run
+        for box_id, future in zip(box_ids, futures):
+            try:
+                all_matchups[f'matchup_{box_id}'] = future.result()
+            except Exception:
+                logger.exception("Error processing matchup #%s", box_id + 1)
 
     end_time = time.time()
-    print(f"Total execution time for all matchups: {end_time - start_time:.2f} seconds")
+    logger.info("Total execution time for all matchups: %.2f seconds", end_time - start_time)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps(all_matchups, ensure_ascii=False))
+
+    # Day shards + summary for the page, and the full state file for incremental runs
+    with span('publish'):
+        manifest = publish_matchups(current_week, all_matchups)
+        count('files_changed', len(manifest['changed_files']))
+    stats = manifest['stats']
+    logger.info("Weekly matchups published to %s (%s files changed; %s/%s ticks have changed anything)",
+                MATCHUPS_DIR, len(manifest['changed_files']), stats['ticks_changed'], stats['ticks'])
 
-    print(json.dumps(all_matchups, ensure_ascii=False))
+    # Keep the intra-week win probability history and its chart up to date
+    try:
+        with span('history'):
+            record_snapshot(current_week, all_matchups)
+            write_chart_files([current_week])
+    except Exception as e:
+        logger.warning("Could not update win probability history: %s", e)
 
-    with open(WEEKLY_MATCHUPS_JSON, 'w', encoding='utf-8') as f:
-        json.dump(all_matchups, f, ensure_ascii=False, indent=4)
-    print(f"Weekly matchups data saved to {WEEKLY_MATCHUPS_JSON}")
\ No newline at end of file
+    return all_matchups
+
+
+if __name__ == "__main__":
+    # --verbose logs every player of every period (slow)
+    configure_logging(verbose=VERBOSE_LOGGING or "--verbose" in sys.argv)
+    # Standalone runs refresh stale projections first; the updater schedules that
+    # as its own stage and passes --skip-projections
+    if "--skip-projections" not in sys.argv:
+        refresh_projections()
+    # --full recomputes every period instead of reusing unchanged ones;
+    # --sequential computes one matchup at a time
+    run_weekly_update(incremental="--full" not in sys.argv,
+                      max_workers=1 if "--sequential" in sys.argv else MAX_WORKERS)
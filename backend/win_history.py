@@ -0,0 +1,143 @@
+# win_history.py
+"""
+Win probability over time.
+
+Every update tick appends one line to WIN_HISTORY_DIR/week_<n>.jsonl with
+each matchup's current points and live projections. win_probabilities()
+is the array version of the normal model in weekly_totals.win_probability, so
+a whole league's history (every matchup x every stored snapshot, across any
+number of weeks) is scored in one vectorized call.
+
+    python win_history.py            # rebuild chart files for every stored week
+    python win_history.py 5 6 7      # only weeks 5-7
+"""
+import os
+import json
+import time
+import tempfile
+import numpy as np
+from scipy.special import erf
+from config import WIN_HISTORY_DIR
+
+DEFAULT_ALPHA = 10.5
+
+
+def win_probabilities(score_a, proj_a, score_b, proj_b, alpha=DEFAULT_ALPHA,
+                      remaining_a=None, remaining_b=None):
+    """
+    Array-in/array-out normal-model win probability (any matching shapes).
+    Returns (prob_a, prob_b) arrays; see weekly_totals.win_probability.
+    """
+    score_a, proj_a, score_b, proj_b = (np.asarray(x, dtype=float) for x in (score_a, proj_a, score_b, proj_b))
+    # If remaining expected points weren't supplied, derive from proj - score
+    remaining_a = np.maximum(0.0, proj_a - score_a) if remaining_a is None else np.asarray(remaining_a, dtype=float)
+    remaining_b = np.maximum(0.0, proj_b - score_b) if remaining_b is None else np.asarray(remaining_b, dtype=float)
+
+    denom = alpha * np.sqrt(np.maximum(remaining_a + remaining_b, 1e-9))
+    z = (proj_a - proj_b) / denom
+    p_a = np.clip(0.5 * (1.0 + erf(z / np.sqrt(2))), 0.0, 1.0)
+    return p_a, 1.0 - p_a
+
+
+def _history_path(week):
+    return os.path.join(WIN_HISTORY_DIR, f"week_{week}.jsonl")
+
+
+def _chart_path(week):
+    return os.path.join(WIN_HISTORY_DIR, f"week_{week}_chart.json")
+
+
+def record_snapshot(week, matchups, timestamp=None):
+    """Append this tick's points and live projections for every matchup to the week's history."""
+    line = {
+        't': timestamp or time.time(),
+        'matchups': {
+            key: {
+                'team1_id': m['team1']['id'],
+                'team2_id': m['team2']['id'],
+                'team1_points': m['totals']['team1']['points'],
+                'team1_projection': m['totals']['team1']['live_projection'],
+                'team2_points': m['totals']['team2']['points'],
+                'team2_projection': m['totals']['team2']['live_projection'],
+                'win_probability': m['totals']['team1']['win_probability'],
+            }
+            for key, m in matchups.items()
+        }
+    }
+    os.makedirs(WIN_HISTORY_DIR, exist_ok=True)
+    with open(_history_path(week), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(line) + "\n")
+
+
+def load_history(week):
+    """All stored snapshots for a week, oldest first (skips a torn last line)."""
+    snapshots = []
+    try:
+        with open(_history_path(week), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    snapshots.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return snapshots
+
+
+def stored_weeks():
+    if not os.path.isdir(WIN_HISTORY_DIR):
+        return []
+    weeks = []
+    for filename in os.listdir(WIN_HISTORY_DIR):
+        if filename.startswith("week_") and filename.endswith(".jsonl"):
+            weeks.append(int(filename[len("week_"):-len(".jsonl")]))
+    return sorted(weeks)
+
+
+def win_probability_history(weeks, alpha=DEFAULT_ALPHA):
+    """
+    Team 1 / team 2 win probability (%) for every matchup at every stored snapshot of
+    the given weeks, computed in a single vectorized call.
+    Returns {week: {key: {'team1_id', 'team2_id', 'times': [...],
+             'team1': [...], 'team2': [...], 'simulated': [...]}}}.
+    """
+    # Flatten every (week, snapshot, matchup) into one row
+    rows = []
+    for week in weeks:
+        for snapshot in load_history(week):
+            for key, m in snapshot['matchups'].items():
+                rows.append((week, snapshot['t'], key, m))
+    if not rows:
+        return {week: {} for week in weeks}
+
+    values = np.array([[m['team1_points'], m['team1_projection'], m['team2_points'], m['team2_projection']]
+                       for _, _, _, m in rows], dtype=float)
+    p_team1, p_team2 = win_probabilities(values[:, 0], values[:, 1], values[:, 2], values[:, 3], alpha=alpha)
+
+    history = {week: {} for week in weeks}
+    for (week, t, key, m), p1, p2 in zip(rows, (p_team1 * 100).round(1).tolist(), (p_team2 * 100).round(1).tolist()):
+        series = history[week].setdefault(key, {
+            'team1_id': m['team1_id'], 'team2_id': m['team2_id'], 'times': [], 'team1': [], 'team2': [], 'simulated': []
+        })
+        series['times'].append(t)
+        series['team1'].append(p1)
+        series['team2'].append(p2)
+        series['simulated'].append(m.get('win_probability'))
+    return history
+
+
+def write_chart_files(weeks, alpha=DEFAULT_ALPHA):
+    """Write WIN_HISTORY_DIR/week_<n>_chart.json for each week."""
+    os.makedirs(WIN_HISTORY_DIR, exist_ok=True)
+    for week, chart in win_probability_history(weeks, alpha).items():
+        fd, tmp_path = tempfile.mkstemp(dir=WIN_HISTORY_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(chart, f)
+        os.replace(tmp_path, _chart_path(week))
+
+
+if __name__ == "__main__":
+    import sys
+    weeks = [int(arg) for arg in sys.argv[1:]] or stored_weeks()
+    write_chart_files(weeks)
+    print(f"Wrote win probability charts for weeks: {weeks}")
@@ -0,0 +1,127 @@
+# win_simulation.py
+"""
+Monte Carlo win probability for a weekly matchup.
+
+Every rostered player-game that still has points to come is uncertain in three ways:
+  - game-to-game spread, from the player's game-log variance (player_variance).
+    A game that is partly played keeps only the remaining share of the variance:
+    std = cv * sqrt(remaining * per_game_projection);
+  - missed games: a game that hasn't started is skipped with MISSED_GAME_PROBABILITY
+    for the player's injury status (a rest day, a late scratch);
+  - projection error: the player's projection for the rest of the week is off by a
+    factor with std PROJECTION_ERROR_CV. The factor is shared by all of that player's
+    games, so their games are correlated.
+
+Each player's remaining mean and variance follow from these in closed form. Players
+are independent, so a team's remaining points have the summed mean and variance.
+Each team is one gamma draw per simulation with that mean and variance, which is
+right-skewed and never negative, like a box score. A sum of 10+ players is close
+to normal already, so drawing per player would add cost and change little.
+"""
+import numpy as np
+from config import WIN_PROB_SIMULATIONS, MISSED_GAME_PROBABILITY, PROJECTION_ERROR_CV
+from player_variance import get_player_variance
+
+QUANTILES = (5, 25, 50, 75, 95)
+MARGIN_BINS = 20
+
+
+def remaining_games(days):
+    """
+    Yield (name, remaining, per_game, play_probability) for each active player-day in
+    a team's day entries. remaining is what the player is still expected to score that day.
+    """
+    for day in days.values():
+        for player in day.get('players', []):
+            name = player.get('name')
+            if not name or name in ("Empty Slot", "Unknown Player"):
+                continue
+            points = player.get('points', 0.0)
+            # Same rule as the live projection totals: live once scoring has started
+            started = points > 0
+            expected = player.get('live_projection', 0.0) if started else player.get('static_projection', 0.0)
+            remaining = expected - points
+            if remaining > 0:
+                play_probability = 1.0 if started else 1.0 - MISSED_GAME_PROBABILITY.get(
+                    player.get('injury_status'), MISSED_GAME_PROBABILITY[None])
+                yield name, remaining, max(player.get('static_projection', 0.0), remaining), play_probability
+
+
+def player_moments(games, cv, projection_cv=PROJECTION_ERROR_CV):
+    """
+    Mean and variance of one player's remaining points.
+    games: (remaining, per_game, play_probability) per game. Each game scores
+    B * (F * remaining + e): B ~ Bernoulli(play_probability), F the shared projection
+    factor (mean 1, std projection_cv) and e the game's own noise.
+    """
+    mean = 0.0
+    variance = 0.0
+    for remaining, per_game, q in games:
+        mean += q * remaining
+        noise = cv * cv * remaining * per_game
+        variance += q * noise + q * (1.0 - q) * remaining * remaining * (1.0 + projection_cv ** 2)
+    # Covariance the shared factor adds between every pair of games, plus its own variance
+    variance += (projection_cv * mean) ** 2
+    return mean, variance
+
+
+def team_moments(days, variance):
+    """Mean and variance of a team's remaining points (players independent)."""
+    games = {}
+    for name, remaining, per_game, q in remaining_games(days):
+        games.setdefault(name, []).append((remaining, per_game, q))
+    mean = 0.0
+    total_variance = 0.0
+    for name, player_games in games.items():
+        player_mean, player_variance = player_moments(player_games, variance.cv(name))
+        mean += player_mean
+        total_variance += player_variance
+    return mean, total_variance
+
+
+def _draw_remaining(rng, mean, variance, n_sims):
+    """(n_sims,) team remaining-point totals: one gamma draw with this mean and variance."""
+    if mean <= 0:
+        return np.zeros(n_sims, dtype=np.float32)
+    variance = max(variance, 1e-6)
+    draws = rng.standard_gamma(np.float32(mean * mean / variance), size=n_sims, dtype=np.float32)
+    return draws * np.float32(variance / mean)
+
+
+def _summary(values):
+    return {f"p{q}": round(float(v), 1) for q, v in zip(QUANTILES, np.percentile(values, QUANTILES))}
+
+
+def simulate_matchup(team1_points, team1_days, team2_points, team2_days,
+                     n_sims=WIN_PROB_SIMULATIONS, seed=None, variance=None):
+    """
+    Simulate final scores for both teams.
+    variance: a PlayerVariance (defaults to the published fit, see player_variance).
+    Returns {'simulations', 'win_probability': {'team1', 'team2'} (0-1),
+             'team1'/'team2': score quantiles, 'margin': team1 - team2 mean/std/quantiles/histogram}.
+    Ties count half to each team.
+    """
+    rng = np.random.default_rng(seed)
+    variance = variance or get_player_variance()
+
+    team1_final = team1_points + _draw_remaining(rng, *team_moments(team1_days, variance), n_sims)
+    team2_final = team2_points + _draw_remaining(rng, *team_moments(team2_days, variance), n_sims)
+    margin = team1_final - team2_final
+
+    p_team1 = float(np.mean(margin > 0) + 0.5 * np.mean(margin == 0))
+    counts, edges = np.histogram(margin, bins=MARGIN_BINS)
+    return {
+        'simulations': n_sims,
+        'win_probability': {'team1': p_team1, 'team2': 1.0 - p_team1},
+        'team1': _summary(team1_final),
+        'team2': _summary(team2_final),
+        'margin': {
+            'mean': round(float(margin.mean()), 1),
+            'std': round(float(margin.std()), 1),
+            **_summary(margin),
+            'histogram': {
+                'edges': [round(float(e), 1) for e in edges],
+                'counts': counts.tolist()
+            }
+        }
+    }
@@ -1,12 +1,59 @@
 <?php
-// Load the JSON file
-$json_file = 'projections/weekly_matchups.json';
-$json_data = file_get_contents($json_file);
-$matchups = json_decode($json_data, true);
+// Load the published summary (teams and totals only); day rosters live in per-day shards
+$matchups_dir = 'projections/matchups';
+$summary = json_decode(@file_get_contents($matchups_dir . '/summary.json'), true);
 
-if (!$matchups) {
+if (!$summary || !isset($summary['matchups'])) {
     die("Error loading or parsing JSON file");
 }
+$matchups = $summary['matchups'];
+
+// Content hashes of every published file (see backend/publisher.py); used as ETags
+$manifest = json_decode(@file_get_contents($matchups_dir . '/manifest.json'), true) ?: [];
+
+// Build the team arrays generatePlayerTablesHTML expects from the summary and one day shard
+function loadMatchupDay($summary, $matchup_id, $day) {
+    global $matchups_dir;
+    $team1 = $summary['matchups'][$matchup_id]['team1'];
+    $team2 = $summary['matchups'][$matchup_id]['team2'];
+    $team1['days'] = [];
+    $team2['days'] = [];
+
+    // Only plain ids reach the filesystem
+    if (preg_match('/^matchup_\d+$/', $matchup_id) && ctype_digit((string) $day)) {
+        $shard_file = $matchups_dir . '/week_' . (int) $summary['week'] . '/' . $matchup_id . '/' . $day . '.json';
+        $shard = json_decode(@file_get_contents($shard_file), true);
+        if ($shard) {
+            $team1['days'][$day] = $shard['team1'];
+            $team2['days'][$day] = $shard['team2'];
+        }
+    }
+    return [$team1, $team2];
+}
+
+// Path of the publisher's prerendered player tables for a matchup/day (null if the ids aren't plain)
+function prerenderedDayPath($summary, $matchup_id, $day) {
+    global $matchups_dir;
+    if (!preg_match('/^matchup_\d+$/', $matchup_id) || !ctype_digit((string) $day)) {
+        return null;
+    }
+    return $matchups_dir . '/week_' . (int) $summary['week'] . '/' . $matchup_id . '/' . $day . '.html';
+}
+
+// Send the ETag and stop with 304 Not Modified if the client already has this version
+function sendETag($etag) {
+    $etag = '"' . $etag . '"';
+    header('ETag: ' . $etag);
+    header('Cache-Control: no-cache');
+    $if_none_match = isset($_SERVER['HTTP_IF_NONE_MATCH']) ? $_SERVER['HTTP_IF_NONE_MATCH'] : '';
+    foreach (explode(',', $if_none_match) as $candidate) {
+        $candidate = preg_replace('#^W/#', '', trim($candidate));
+        if ($candidate === $etag || $candidate === '*') {
+            http_response_code(304);
+            exit;
+        }
+    }
+}
 
 // Function to format a percentage
 function formatPercentage($value) {
@@ -95,14 +142,8 @@ function getTeamColor($probability) {
     return "#cc0000"; // Dark red for very low probability
 }
 
-// Get scoring periods from the JSON data
-$scoring_periods = [];
-foreach ($matchups as $matchup_id => $matchup) {
-    foreach ($matchup['team1']['days'] as $day => $day_data) {
-        $scoring_periods[$day] = $day_data['date'];
-    }
-    break; // Just need one matchup to get the dates
-}
+// Get scoring periods from the summary
+$scoring_periods = $summary['periods'];
 
 // Find closest scoring period to today (using EST timezone)
 date_default_timezone_set('America/New_York');
@@ -506,17 +547,69 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
     $selected_day = $_GET['day'];
 
     if (isset($matchups[$matchup_id])) {
-        $matchup = $matchups[$matchup_id];
-        $team1 = $matchup['team1'];
-        $team2 = $matchup['team2'];
-
-        $html = generatePlayerTablesHTML($team1, $team2, $selected_day);
+        $prerendered = prerenderedDayPath($summary, $matchup_id, $selected_day);
+        $manifest_key = 'week_' . (int) $summary['week'] . '/' . $matchup_id . '/' . $selected_day . '.html';
+        if ($prerendered && is_file($prerendered) && isset($manifest['files'][$manifest_key])) {
+            // Answer from the manifest before reading the fragment at all
+            sendETag($manifest['files'][$manifest_key]);
+            $html = file_get_contents($prerendered);
+        } else {
+            list($team1, $team2) = loadMatchupDay($summary, $matchup_id, $selected_day);
+            $html = generatePlayerTablesHTML($team1, $team2, $selected_day);
+            sendETag(substr(sha1($html), 0, 16));
+        }
 
         header('Content-Type: application/json');
         echo json_encode(['html' => $html]);
         exit;
     }
 }
+
+// Delta feed: the log entries published after version `since` (see backend/deltas.py)
+if (isset($_GET['deltas']) && isset($_GET['since']) && ctype_digit((string) $_GET['since'])) {
+    $since = (int) $_GET['since'];
+    $week = (int) $summary['week'];
+    $seq = isset($summary['seq']) ? (int) $summary['seq'] : 0;
+    sendETag($week . '-' . $seq . '-' . $since);
+
+    $deltas = [];
+    $reset = $since > $seq;  // Client is ahead of us, i.e. holding another week's data
+    if (!$reset && $since < $seq) {
+        $log = @fopen($matchups_dir . '/week_' . $week . '/deltas.jsonl', 'r');
+        while ($log && ($line = fgets($log)) !== false) {
+            $entry = json_decode($line, true);
+            if ($entry === null) {
+                break;  // Torn last line, still being appended
+            }
+            if ($entry['seq'] <= $since || $entry['seq'] > $seq) {
+                continue;
+            }
+            if (!empty($entry['reset'])) {
+                $reset = true;
+                break;
+            }
+            $deltas[] = $entry;
+        }
+        if ($log) {
+            fclose($log);
+        }
+        // Anything missing from the log means the client can't catch up incrementally
+        $reset = $reset || count($deltas) !== $seq - $since;
+    }
+
+    header('Content-Type: application/json');
+    echo json_encode($reset
+        ? ['week' => $week, 'seq' => $seq, 'reset' => true]
+        : ['week' => $week, 'seq' => $seq, 'deltas' => $deltas]);
+    exit;
+}
+
+// The full page only changes when the published data, the day (closest period), the query or this file does
+if (isset($manifest['version'])) {
+    sendETag(substr(sha1(implode('|', [
+        $manifest['version'], $today, isset($_SERVER['QUERY_STRING']) ? $_SERVER['QUERY_STRING'] : '', filemtime(__FILE__)
+    ])), 0, 16));
+}
 ?>
 
 <!DOCTYPE html>
@@ -1151,7 +1244,7 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
         <div class="matchup-card mb-5">
             <!-- Header and Summary - Always visible and clickable -->
             <div class="matchup-header">
-                Matchup #<?= substr($matchup_id, -1) + 1 ?>
+                Matchup #<?= (int) substr($matchup_id, strlen('matchup_')) + 1 ?>
             </div>
 
             <div class="team-section" id="teamSection<?= $matchup_id ?>">
@@ -1216,7 +1309,15 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
 
                 <!-- Dynamic player tables content -->
                 <div id="playerTables<?= $matchup_id ?>">
-                    <?php echo generatePlayerTablesHTML($team1, $team2, $selected_day); ?>
+                    <?php
+                    $prerendered = prerenderedDayPath($summary, $matchup_id, $selected_day);
+                    if ($prerendered && is_file($prerendered)) {
+                        readfile($prerendered);
+                    } else {
+                        list($day_team1, $day_team2) = loadMatchupDay($summary, $matchup_id, $selected_day);
+                        echo generatePlayerTablesHTML($day_team1, $day_team2, $selected_day);
+                    }
+                    ?>
                 </div>
             </div>
         </div>
@@ -1245,14 +1346,29 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
         }
     }
 
-    // Update matchup day via AJAX
+    // Week of the published data; prerendered day views live under projections/matchups/week_<n>/
+    const publishedWeek = <?= (int) $summary['week'] ?>;
+
+    // Load a day's player tables: the prerendered static file, or the AJAX endpoint if it's missing
+    function fetchDayHTML(matchupId, day) {
+        // no-cache: revalidate with the server's ETag, so a pushed update is never served stale
+        return fetch('projections/matchups/week_' + publishedWeek + '/' + matchupId + '/' + day + '.html', {cache: 'no-cache'})
+            .then(response => {
+                if (response.ok) {
+                    return response.text();
+                }
+                return fetch('?ajax=1&matchupId=' + matchupId + '&day=' + day)
+                    .then(response => response.json())
+                    .then(data => data.html);
+            });
+    }
+
+    // Update matchup day
     function updateMatchupDay(matchupId, day) {
-        // Make AJAX request
-        fetch('?ajax=1&matchupId=' + matchupId + '&day=' + day)
-            .then(response => response.json())
-            .then(data => {
+        fetchDayHTML(matchupId, day)
+            .then(html => {
                 // Update the player tables
-                document.getElementById('playerTables' + matchupId).innerHTML = data.html;
+                document.getElementById('playerTables' + matchupId).innerHTML = html;
 
                 // Store the selected day in session storage
                 sessionStorage.setItem('matchup_' + matchupId + '_day', day);
@@ -1267,6 +1383,85 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
             });
     }
 
+    // Live updates from the push server (backend/push_server.py), if it's running
+    const pushUrl = <?= json_encode(getenv('PUSH_URL') ?: '//' . $_SERVER['SERVER_NAME'] . ':8765/events') ?>;
+
+    // Same thresholds as getTeamColor() above
+    function teamColor(probability) {
+        const colors = [[90, '#0d7a2c'], [80, '#1a9240'], [70, '#28a745'], [60, '#3d9e50'], [55, '#4d9e5a'],
+                        [50, '#5da864'], [45, '#d9941f'], [40, '#e68a00'], [30, '#ff8020'], [20, '#ff6600'],
+                        [10, '#e65500']];
+        for (const [threshold, color] of colors) {
+            if (probability >= threshold) {
+                return color;
+            }
+        }
+        return '#cc0000';
+    }
+
+    function formatNumber(value) {
+        return value.toLocaleString('en-US', {minimumFractionDigits: 1, maximumFractionDigits: 1});
+    }
+
+    // Redraw a matchup's header (points, projections, win probability) from its summary entry
+    function renderMatchupTotals(matchupId, matchup) {
+        const section = document.getElementById('teamSection' + matchupId);
+        if (!section || !matchup) {
+            return;
+        }
+        // Away team (team2) is on the left, so it comes first in the markup
+        const teams = [matchup.totals.team2, matchup.totals.team1];
+        const names = section.querySelectorAll('.team-name');
+        const points = section.querySelectorAll('.team-stats .points');
+        const projections = section.querySelectorAll('.team-stats .projection');
+        const segments = section.querySelectorAll('.progress-segment');
+        teams.forEach((team, i) => {
+            const probability = team.win_probability;
+            names[i].style.color = teamColor(probability);
+            points[i].textContent = String(team.points);
+            projections[i].textContent = 'Projected Total: ' + formatNumber(team.live_projection);
+            segments[i].style.width = Math.min(Math.max(probability, 1), 99) + '%';
+            segments[i].style.backgroundColor = teamColor(probability);
+            segments[i].textContent = probability >= 2 ? formatNumber(probability) + '%' : '';
+        });
+    }
+
+    function connectPush() {
+        if (!pushUrl || !window.EventSource) {
+            return;
+        }
+        const source = new EventSource(pushUrl);
+        let opened = false;
+        source.onopen = () => { opened = true; };
+        // Not running (e.g. subprocess updater): stop retrying and keep the static page
+        source.onerror = () => { if (!opened) source.close(); };
+
+        source.addEventListener('snapshot', event => {
+            const data = JSON.parse(event.data);
+            if (data.week !== publishedWeek) {
+                window.location.reload();
+                return;
+            }
+            for (const matchupId in data.matchups) {
+                renderMatchupTotals(matchupId, data.matchups[matchupId]);
+            }
+        });
+
+        source.addEventListener('matchup', event => {
+            const data = JSON.parse(event.data);
+            renderMatchupTotals(data.matchup_id, data.summary);
+
+            // Reload the shown day's player tables if this tick touched that day
+            const select = document.getElementById('daySelect' + data.matchup_id);
+            const touched = data.ops.some(op => op.path[2] === 'days' && select && String(op.path[3]) === select.value);
+            if (touched) {
+                fetchDayHTML(data.matchup_id, select.value)
+                    .then(html => { document.getElementById('playerTables' + data.matchup_id).innerHTML = html; })
+                    .catch(error => console.error('Error refreshing matchup day:', error));
+            }
+        });
+    }
+
     // Initialize states from session storage on page load
     document.addEventListener('DOMContentLoaded', function() {
         <?php foreach ($matchups as $matchup_id => $matchup): ?>
@@ -1288,6 +1483,8 @@ if (isset($_GET['ajax']) && isset($_GET['matchupId']) && isset($_GET['day'])) {
             updateMatchupDay('<?= $matchup_id ?>', savedDay<?= $matchup_id ?>);
         }
         <?php endforeach; ?>
+
+        connectPush();
     });
 </script>
 </body>